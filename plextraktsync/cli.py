@@ -25,7 +25,10 @@ def wrap(*args, **kwargs):
             cmd = getattr(module, name)
 
             try:
-                cmd(*args, **kwargs)
+                from plextraktsync.util.profile import profile
+
+                with profile(factory.run_config):
+                    cmd(*args, **kwargs)
             except EOFError as e:
                 raise ClickException(f"Program requested terminal, No terminal is connected: {e}")
             except ClickException as e:
@@ -57,6 +60,13 @@ def wrap(*args, **kwargs):
     help="Time in seconds between each collection batch submit to Trakt",
 )
 @click.option("--server", help="Plex Server name from servers.yml", metavar="NAME")
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write trace of phases and HTTP requests in Chrome trace format to FILE",
+    metavar="FILE",
+)
+@click.option("--profile", is_flag=True, help="Profile the command and its threads with cProfile, and write the stats next to the log file")
 @click.pass_context
 def cli(
     ctx,
@@ -65,6 +75,8 @@ def cli(
     no_progressbar: bool,
     batch_delay: int,
     server: str,
+    trace: str,
+    profile: bool,
 ):
     """
     Plex-Trakt-Sync is a two-way-sync between trakt.tv and Plex Media Server
@@ -79,6 +91,8 @@ def cli(
         progressbar=not no_progressbar,
         batch_delay=batch_delay,
         server=server,
+        trace=trace,
+        profile=profile,
     )
 
     if not ctx.invoked_subcommand:
@@ -238,6 +252,14 @@ def plex_login():
     is_flag=True,
     help="Dry run: Do not make changes",
 )
+@click.option(
+    "--incremental",
+    "incremental",
+    type=bool,
+    default=False,
+    is_flag=True,
+    help="Process only Plex items changed since last sync, with periodic full walk",
+)
 @click.option(
     "--no-progress-bar",
     "no_progress_bar",
@@ -246,6 +268,13 @@ def plex_login():
     is_flag=True,
     help="Don't output progress bars",
 )
+@click.option(
+    "--performance-report",
+    "performance_report",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write performance report of the run as JSON to this file",
+    metavar="FILE",
+)
 def sync():
     """
     Perform sync between Plex and Trakt
@@ -259,6 +288,29 @@ def trakt_login():
     """
 
 
+@command()
+@click.option("--unmatched", is_flag=True, help="List only guids that have no match in Trakt")
+@click.option(
+    "--limit",
+    type=int,
+    default=20,
+    show_default=True,
+    help="Limit entries to be printed",
+)
+@click.option("--prune", is_flag=True, help="Delete expired entries")
+@click.option("--clear", is_flag=True, help="Delete all entries")
+@click.option("--expire", is_flag=True, help="Delete entries of given guids")
+@click.argument("guids", nargs=-1)
+def resolve_index():
+    """
+    Inspect and prune index of Plex guids resolved to Trakt items.
+
+    \b
+    $ plextraktsync resolve-index imdb://tt0111161
+    $ plextraktsync resolve-index --expire tmdb://278
+    """
+
+
 @command()
 @click.option(
     "--no-progress-bar",
@@ -392,6 +444,7 @@ def config():
 cli.add_command(inspect)
 cli.add_command(login)
 cli.add_command(plex_login)
+cli.add_command(resolve_index)
 if factory.enable_self_update:
     cli.add_command(self_update)
 cli.add_command(sync)
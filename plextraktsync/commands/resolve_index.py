@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from click import ClickException
+
+from plextraktsync.commands.cache import limit_iterator
+from plextraktsync.factory import factory
+
+if TYPE_CHECKING:
+    from plextraktsync.trakt.TraktResolveIndex import TraktResolveIndex
+
+
+def parse_guid(guid: str):
+    provider, _, id = guid.partition("://")
+    if not provider or not id:
+        raise ClickException(f"Invalid guid: '{guid}', expected format: provider://id")
+
+    return provider, id
+
+
+def format_entry(provider: str, id: str, media_type: str, data: dict | None, updated_at: float):
+    updated = datetime.fromtimestamp(updated_at).isoformat(sep=" ", timespec="seconds")
+    if data is None:
+        return f"{provider}://{id} ({media_type}): no match, updated {updated}"
+
+    item = data.get(media_type) or {}
+    ids = ", ".join(f"{k}={v}" for k, v in item.get("ids", {}).items())
+
+    return f"{provider}://{id} ({media_type}): {item.get('title')} [{ids}], updated {updated}"
+
+
+def print_entries(index: TraktResolveIndex, limit: int, unmatched: bool):
+    print = factory.print
+
+    for _, entry in limit_iterator(index.entries(unmatched=unmatched), limit):
+        print(f"- {format_entry(*entry)}", crop=False, overflow="ignore")
+
+
+def resolve_index(unmatched: bool, limit: int, prune: bool, clear: bool, expire: bool, guids: list[str]):
+    print = factory.print
+    index = factory.resolve_index
+    if index is None:
+        raise ClickException("Resolve index is disabled")
+
+    if clear:
+        print(f"Deleted {index.clear()} entries")
+        return
+
+    if prune:
+        print(f"Deleted {index.prune()} expired entries")
+        return
+
+    if guids:
+        for guid in guids:
+            provider, id = parse_guid(guid)
+            if expire:
+                print(f"Deleted {index.invalidate(provider, id)} entries of {guid}")
+                continue
+
+            entries = list(index.entries(provider=provider, id=id))
+            if not entries:
+                print(f"{guid}: not in index")
+            for entry in entries:
+                print(format_entry(*entry), crop=False, overflow="ignore")
+        return
+
+    stats = index.stats()
+    print(f"Resolve index: {index.path}")
+    print(f"Total rows: {stats['matched']} matched, {stats['unmatched']} unmatched, {stats['expired']} expired\n")
+    print_entries(index, limit, unmatched)
@@ -22,7 +22,9 @@ def sync(
     server: str,
     batch_delay: int,
     dry_run: bool,
+    incremental: bool,
     no_progress_bar: bool,
+    performance_report: str = None,
 ):
     """
     Perform sync between Plex and Trakt
@@ -49,6 +51,14 @@ def sync(
 
     ensure_login()
     wc = factory.walk_config.update(movies=movies, shows=shows, watchlist=watchlist)
+    if incremental:
+        from datetime import timedelta
+
+        from plextraktsync.util.parse_date import parse_date
+
+        interval = factory.config["sync"]["full_walk_interval"]
+        interval = timedelta(seconds=interval) if isinstance(interval, int) else parse_date(interval)
+        wc.update(incremental=True, full_walk_interval=interval)
     w = factory.walker
 
     if ids:
@@ -72,3 +82,13 @@ def sync(
         if dry_run:
             logger.info("Enabled dry-run mode: not making actual changes")
         run_async(runner, walker=w, dry_run=config.dry_run)
+
+    report = factory.performance_report
+    limiter = factory.trakt_rate_limiter
+    if limiter is not None:
+        report.add_wait("rate_limiter", limiter.throttled_time)
+    logger.info("Performance report:")
+    report.print(print=logger.info)
+    if performance_report:
+        report.write(performance_report)
+        logger.info(f"Performance report written to {performance_report}")
@@ -14,6 +14,9 @@ def watch(server: str):
     factory.run_config.update(
         server=server,
     )
+    if factory.metrics is not None:
+        factory.metrics_server.start()
+
     ws = factory.web_socket_listener
     updater = factory.watch_state_updater
 
@@ -33,7 +33,11 @@ class HttpCacheConfig:
     default_policy = {
         "api.trakt.tv/shows/*/seasons?extended=episodes": 28800,
         "api.trakt.tv/shows/*/seasons": DO_NOT_CACHE,
+        # Decides whether stored show episodes can be used
+        "api.trakt.tv/shows/updates/*": DO_NOT_CACHE,
         "api.trakt.tv/sync/collection/shows": "1m",
+        # Decides whether Trakt state snapshot can be used
+        "api.trakt.tv/sync/last_activities": DO_NOT_CACHE,
         "api.trakt.tv/users/*/collection/movies?extended=metadata": "10s",
         "api.trakt.tv/users/*/collection/movies": DO_NOT_CACHE,
         "api.trakt.tv/users/*/collection/shows": "1m",
@@ -14,6 +14,9 @@ class RunConfig:
     progressbar: bool = True
     cache: bool = True
     server: str | None = None
+    # File to write trace of the run to
+    trace: str | None = None
+    profile: bool = False
 
     def update(self, **kwargs):
         for name, value in kwargs.items():
@@ -15,3 +15,24 @@
 Constants in seconds for the margin added to retry-after delay to account for network jitter in rate limiting retries.
 """
 TRAKT_RETRY_AFTER_MARGIN = 0.9
+
+"""
+Constants in seconds for the first and the longest delay between retries of failed API calls.
+"""
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 60.0
+
+"""
+Number of failures in a row after which requests to a host are paused,
+and the pause in seconds.
+"""
+RETRY_CIRCUIT_THRESHOLD = 5
+RETRY_CIRCUIT_RESET = 30.0
+
+"""
+Constants in seconds for the first and the longest pause after a failed flush of the Trakt queue,
+and the number of flushes an update may fail before it's dropped.
+"""
+QUEUE_RETRY_DELAY = 60.0
+QUEUE_RETRY_DELAY_MAX = 600.0
+QUEUE_FLUSH_ATTEMPTS = 3
@@ -3,11 +3,11 @@
 import inspect
 from contextlib import contextmanager
 from datetime import timedelta
-from time import monotonic
+from time import monotonic, perf_counter
 
 from humanize.time import precisedelta
 
-from plextraktsync.factory import logging
+from plextraktsync.factory import factory, logging
 
 default_logger = logging.getLogger(__name__)
 
@@ -15,8 +15,11 @@
 @contextmanager
 def measure_time(message, *args, level=logging.INFO, logger=None, **kwargs):
     start = monotonic()
+    trace_start = perf_counter()
     yield
     delta = monotonic() - start
+    if factory.tracer is not None:
+        factory.tracer.add(message, trace_start, perf_counter() - trace_start)
 
     if inspect.ismethod(logger):
         log = logger
@@ -7,7 +7,7 @@
 from trakt.errors import RateLimitException
 
 from plextraktsync.config import TRAKT_RETRY_AFTER_MARGIN
-from plextraktsync.factory import logging
+from plextraktsync.factory import factory, logging
 
 logger = logging.getLogger(__name__)
 
@@ -29,4 +29,7 @@ def rate_limit(fn, retries=5, *args, **kwargs):
             retry += 1
             logger.warning(f"{e} for {fn.__module__}.{fn.__name__}(), retrying after {seconds} seconds (try: {retry}/{retries})")
             logger.debug(e.details)
-            sleep(seconds + TRAKT_RETRY_AFTER_MARGIN)
+            # The rate limiter has seen the response, and holds the next request
+            if factory.trakt_rate_limiter is None:
+                sleep(seconds + TRAKT_RETRY_AFTER_MARGIN)
+                factory.performance_report.add_wait("rate_limit", seconds + TRAKT_RETRY_AFTER_MARGIN)
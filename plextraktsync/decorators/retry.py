@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from random import uniform
 from time import sleep
+from urllib.parse import urlsplit
 
 from click import ClickException
 from decorator import decorator
@@ -13,17 +15,85 @@
     TraktUnavailable,
 )
 
-from plextraktsync.factory import logging
+from plextraktsync.config import (
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_CIRCUIT_RESET,
+    RETRY_CIRCUIT_THRESHOLD,
+)
+from plextraktsync.factory import factory, logging
+from plextraktsync.util.CircuitBreaker import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+circuit_breaker = CircuitBreaker(threshold=RETRY_CIRCUIT_THRESHOLD, reset_timeout=RETRY_CIRCUIT_RESET)
+
+# Host that failed last for each service, checked before every call to the service
+hosts: dict[str, str] = {}
+
+
+def service(fn):
+    """
+    Service called by the decorated function, functions of a service call the same host
+    """
+    return "plex" if fn.__module__.startswith("plextraktsync.plex.") else "trakt"
+
+
+def backoff(count: int):
+    """
+    Exponential delay with jitter, so that concurrent callers don't retry in sync
+    """
+    return uniform(0.5, 1.0) * min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2**count)
+
+
+def retry_after(e: Exception) -> float:
+    response = getattr(e, "response", None)
+    if response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def failed_host(e: Exception, fn):
+    for attr in ["response", "request"]:
+        url = getattr(getattr(e, attr, None), "url", None)
+        if url:
+            return urlsplit(url).netloc
+
+    return fn.__module__
+
+
+def abort(e: Exception, fn, args, kwargs):
+    logger.error(f"Error: {e}")
+
+    if isinstance(e, BadResponseException):
+        logger.error(f"Details: {e.details}")
+    if isinstance(e, TraktInternalException):
+        logger.error(f"Error message: {e.error_message}")
+
+    logger.error(f"Last call: {fn.__module__}.{fn.__name__}({args[1:]}, {kwargs})")
+    raise ClickException("API didn't respond properly, script will abort now. Please try again later.")
+
 
 @decorator
 def retry(fn, retries=5, *args, **kwargs):
+    name = service(fn)
     count = 0
     while True:
+        host = hosts.get(name)
+        if host is not None:
+            if circuit_breaker.is_down(host):
+                raise ClickException(f"{host} is not responding, script will abort now. Please try again later.")
+            seconds = circuit_breaker.remaining(host)
+            if seconds:
+                logger.info(f"Waiting {seconds:.1f} seconds for {host} to recover before {fn.__module__}.{fn.__name__}()")
+                sleep(seconds)
+                factory.performance_report.add_wait("retry", seconds)
+
         try:
-            return fn(*args, **kwargs)
+            result = fn(*args, **kwargs)
         except (
             BadRequest,
             BadResponseException,
@@ -33,18 +103,22 @@ def retry(fn, retries=5, *args, **kwargs):
             TraktUnavailable,
             TraktInternalException,
         ) as e:
-            if count == retries:
-                logger.error(f"Error: {e}")
-
-                if isinstance(e, BadResponseException):
-                    logger.error(f"Details: {e.details}")
-                if isinstance(e, TraktInternalException):
-                    logger.error(f"Error message: {e.error_message}")
-
-                logger.error(f"Last call: {fn.__module__}.{fn.__name__}({args[1:]}, {kwargs})")
-                raise ClickException("API didn't respond properly, script will abort now. Please try again later.")
+            host = hosts[name] = failed_host(e, fn)
+            circuit_breaker.failure(host)
+            if factory.metrics is not None:
+                factory.metrics.inc("plextraktsync_http_errors_total", host=host)
+            if count == retries or circuit_breaker.is_down(host):
+                abort(e, fn, args, kwargs)
 
-            seconds = 1 + count
+            seconds = max(backoff(count), retry_after(e))
             count += 1
-            logger.warning(f"{e} for {fn.__module__}.{fn.__name__}(), retrying after {seconds} seconds (try: {count}/{retries})")
+            logger.warning(f"{e} for {fn.__module__}.{fn.__name__}(), retrying after {seconds:.1f} seconds (try: {count}/{retries})")
             sleep(seconds)
+            factory.performance_report.add_wait("retry", seconds)
+            continue
+
+        if host is not None:
+            circuit_breaker.success(host)
+            hosts.pop(name, None)
+
+        return result
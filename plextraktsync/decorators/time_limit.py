@@ -3,17 +3,24 @@
 from decorator import decorator
 
 from plextraktsync.config import TRAKT_POST_DELAY
+from plextraktsync.factory import factory
+from plextraktsync.util.PriorityLock import PriorityLock
 from plextraktsync.util.Timer import Timer
 
 timer = Timer(TRAKT_POST_DELAY)
+# Priority calls don't wait behind other waiting calls
+lock = PriorityLock()
 
 
 @decorator
-def time_limit(fn, *args, **kwargs):
+def time_limit(fn, priority=False, *args, **kwargs):
     """
-    Throttles calls not to be called more often than TRAKT_POST_DELAY
+    Throttles calls not to be called more often than TRAKT_POST_DELAY,
+    unless Trakt requests are throttled by the shared rate limiter.
     """
 
-    timer.wait_if_needed()
+    if factory.trakt_rate_limiter is None:
+        with lock(priority=priority):
+            factory.performance_report.add_wait("time_limit", timer.wait_if_needed())
 
     return fn(*args, **kwargs)
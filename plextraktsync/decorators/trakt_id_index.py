@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from decorator import decorator
+
+
+@decorator
+def trakt_id_index(fn, *args, **kwargs):
+    """
+    Add Trakt items returned by the method to id index of the TraktApi instance.
+    """
+    result = fn(*args, **kwargs)
+    args[0].id_index.add_items(result)
+
+    return result
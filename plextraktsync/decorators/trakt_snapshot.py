@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from decorator import decorator
+
+
+@decorator
+def trakt_snapshot(fn, activities: str = "", *args, **kwargs):
+    """
+    Reuse result of the method from Trakt state snapshot while Trakt activities are unchanged.
+
+    The activities are comma separated "sync/last_activities" keys, like "movies.watched_at".
+    The "{0}" in them is replaced with first argument of the method:
+
+        @trakt_snapshot(activities="{0}.rated_at")
+        def get_ratings(self, media_type: str):
+    """
+    self = args[0]
+    snapshot = self.snapshot
+    if snapshot is None:
+        return fn(*args, **kwargs)
+
+    call_args = [str(a) for a in args[1:]]
+    keys = [key.format(*call_args) for key in activities.split(",")]
+    name = ".".join([fn.__name__, *call_args])
+
+    return snapshot.get(name, keys, lambda: fn(*args, **kwargs))
@@ -38,7 +38,45 @@ def print(self):
     def trakt_api(self):
         from plextraktsync.trakt.TraktApi import TraktApi
 
-        return TraktApi()
+        snapshot_dir = None
+        if self.run_config.cache and self.config["performance"]["trakt_state_snapshot"]:
+            from plextraktsync.path import trakt_state_dir
+
+            snapshot_dir = trakt_state_dir
+
+        episode_map_file = None
+        if self.run_config.cache and self.config["performance"]["trakt_episode_map"]:
+            from plextraktsync.path import trakt_episode_map_file
+
+            episode_map_file = trakt_episode_map_file
+
+        return TraktApi(snapshot_dir=snapshot_dir, resolve_index=self.resolve_index, episode_map_file=episode_map_file)
+
+    @cached_property
+    def resolve_index(self):
+        if not self.run_config.cache:
+            return None
+
+        from datetime import timedelta
+
+        from plextraktsync.util.parse_date import parse_date
+
+        def parse_ttl(value):
+            return timedelta(seconds=value) if isinstance(value, int) else parse_date(value)
+
+        config = self.config["performance"]
+        ttl = parse_ttl(config["resolve_index_ttl"])
+        if not ttl:
+            return None
+
+        from plextraktsync.path import resolve_index_file
+        from plextraktsync.trakt.TraktResolveIndex import TraktResolveIndex
+
+        return TraktResolveIndex(
+            resolve_index_file,
+            ttl=ttl,
+            negative_ttl=parse_ttl(config["resolve_index_negative_ttl"]),
+        )
 
     @cached_property
     def plex_api(self):
@@ -47,8 +85,19 @@ def plex_api(self):
         return PlexApi(
             server=self.plex_server,
             config=self.server_config,
+            write_queue=self.plex_write_queue,
         )
 
+    @cached_property
+    def plex_write_queue(self):
+        workers = self.config["performance"]["plex_write_workers"]
+        if not workers:
+            return None
+
+        from plextraktsync.queue.PlexWriteQueue import PlexWriteQueue
+
+        return PlexWriteQueue(workers=workers)
+
     @cached_property
     def media_factory(self):
         from plextraktsync.media.MediaFactory import MediaFactory
@@ -56,7 +105,8 @@ def media_factory(self):
         trakt = self.trakt_api
         plex = self.plex_api
         config = self.server_config
-        mf = MediaFactory(plex, trakt, server_config=config)
+        lazy_episodes = self.config["performance"]["lazy_episodes"]
+        mf = MediaFactory(plex, trakt, server_config=config, lazy_episodes=lazy_episodes)
 
         return mf
 
@@ -134,9 +184,10 @@ def urls_expire_after(self):
 
     @cached_property
     def session(self):
+        from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
         from requests_cache import CachedSession
 
-        return CachedSession(
+        session = CachedSession(
             cache_name=self.config.cache_path,
             # Plex sends "Cache-Control: no-cache" headers to requests we want to cache
             cache_control=False,
@@ -145,6 +196,83 @@ def session(self):
             match_headers=["X-Plex-Container-Start"],
         )
 
+        # Keep a keep-alive connection for each concurrent Plex request
+        pool_size = max(DEFAULT_POOLSIZE, self.config["performance"]["plex_workers"])
+        if pool_size > DEFAULT_POOLSIZE:
+            for prefix in ["http://", "https://"]:
+                session.mount(prefix, HTTPAdapter(pool_maxsize=pool_size))
+
+        limiter = self.trakt_rate_limiter
+        if limiter is not None:
+            from trakt.core import BASE_URL
+
+            from plextraktsync.trakt.TraktRateLimitAdapter import TraktRateLimitAdapter
+
+            session.mount(BASE_URL, TraktRateLimitAdapter(limiter, pool_maxsize=pool_size))
+
+        session.hooks["response"].append(self.performance_report.response_hook)
+        if self.tracer is not None:
+            session.hooks["response"].append(self.tracer.response_hook)
+        if self.metrics is not None:
+            session.hooks["response"].append(self.metrics.response_hook)
+
+        return session
+
+    @cached_property
+    def metrics(self):
+        if not self.config["watch"]["metrics_port"]:
+            return None
+
+        from plextraktsync.util.Metrics import Metrics
+
+        metrics = Metrics()
+
+        def resolve_index():
+            index = self.resolve_index
+            if index is None:
+                return {}
+
+            return {
+                (("result", "hit"),): index.hits,
+                (("result", "miss"),): index.misses,
+            }
+
+        metrics.gauge("plextraktsync_resolve_index_total", resolve_index)
+
+        return metrics
+
+    @cached_property
+    def metrics_server(self):
+        from plextraktsync.util.MetricsServer import MetricsServer
+
+        config = self.config["watch"]
+
+        return MetricsServer(self.metrics, host=config["metrics_host"], port=config["metrics_port"])
+
+    @cached_property
+    def tracer(self):
+        if not self.run_config.trace:
+            return None
+
+        from plextraktsync.util.Tracer import Tracer
+
+        return Tracer()
+
+    @cached_property
+    def performance_report(self):
+        from plextraktsync.util.PerformanceReport import PerformanceReport
+
+        return PerformanceReport(patterns=self.config.http_cache.urls_expire_after.keys())
+
+    @cached_property
+    def trakt_rate_limiter(self):
+        if not self.config["performance"]["trakt_rate_limiter"]:
+            return None
+
+        from plextraktsync.trakt.TraktRateLimiter import TraktRateLimiter
+
+        return TraktRateLimiter()
+
     @cached_property
     def sync(self):
         from plextraktsync.sync.Sync import Sync
@@ -152,7 +280,19 @@ def sync(self):
         plex = self.plex_api
         trakt = self.trakt_api
 
-        return Sync(self.sync_config, plex, trakt)
+        workers = self.config["performance"]["sync_workers"]
+        diff = self.config["performance"]["sync_diff"]
+
+        return Sync(self.sync_config, plex, trakt, workers=workers, diff=diff, timings=self.hook_timings)
+
+    @cached_property
+    def hook_timings(self):
+        from plextraktsync.sync.plugin.HookTimings import HookTimings
+
+        timings = HookTimings(tracer=self.tracer)
+        self.performance_report.add_section("plugins", timings)
+
+        return timings
 
     @cached_property
     def progressbar(self):
@@ -196,10 +336,28 @@ def walker(self):
         trakt = self.trakt_api
         mf = self.media_factory
         pb = self.progressbar
-        w = Walker(plex=plex, trakt=trakt, mf=mf, config=walk_config, progressbar=pb)
+        resolve_workers = self.config["performance"]["resolve_workers"]
+        w = Walker(
+            plex=plex,
+            trakt=trakt,
+            mf=mf,
+            config=walk_config,
+            progressbar=pb,
+            resolve_workers=resolve_workers,
+            watermarks=self.section_watermarks,
+            report=self.performance_report,
+            tracer=self.tracer,
+        )
 
         return w
 
+    @cached_property
+    def section_watermarks(self):
+        from plextraktsync.path import section_watermarks_file
+        from plextraktsync.plan.SectionWatermarks import SectionWatermarks
+
+        return SectionWatermarks(section_watermarks_file)
+
     @cached_property
     def enable_self_update(self):
         from plextraktsync.util.packaging import pipx_installed, program_name
@@ -212,7 +370,7 @@ def enable_self_update(self):
     def web_socket_listener(self):
         from plextraktsync.watch.WebSocketListener import WebSocketListener
 
-        return WebSocketListener(plex=self.plex_server)
+        return WebSocketListener(plex=self.plex_server, metrics=self.metrics)
 
     @cached_property
     def watch_state_updater(self):
@@ -318,18 +476,47 @@ def queue(self):
         from plextraktsync.queue.Queue import Queue
         from plextraktsync.queue.TraktBatchWorker import TraktBatchWorker
         from plextraktsync.queue.TraktMarkWatchedWorker import TraktMarkWatchedWorker
+        from plextraktsync.queue.TraktRatingsWorker import TraktRatingsWorker
         from plextraktsync.queue.TraktScrobbleWorker import TraktScrobbleWorker
 
         workers = [
             TraktBatchWorker(),
             TraktMarkWatchedWorker(),
-            TraktScrobbleWorker(),
+            TraktRatingsWorker(),
         ]
-        task = BackgroundTask(self.batch_delay_timer, *workers)
-        queue = Queue(task)
+        performance = self.config["performance"]
+        journal = self.trakt_queue_journal
+        task = BackgroundTask(
+            self.batch_delay_timer,
+            *workers,
+            flush_size=performance["queue_flush_size"],
+            max_size=performance["queue_max_size"],
+            journal=journal,
+        )
+        # Scrobbles are sent as soon as they are queued
+        priority_task = BackgroundTask(None, TraktScrobbleWorker(), flush_size=1, name="scrobble")
+        queue = Queue(task, maxsize=performance["queue_max_size"], journal=journal, priority_runner=priority_task)
+
+        metrics = self.metrics
+        if metrics is not None:
+            from functools import partial
+
+            metrics.gauge("plextraktsync_queue_depth", queue.depth)
+            for runner in queue.runners:
+                runner.latency.observers.append(partial(metrics.observe, "plextraktsync_queue_wait_seconds", lane=runner.name))
 
         return queue
 
+    @cached_property
+    def trakt_queue_journal(self):
+        if not self.config["performance"]["trakt_queue_journal"]:
+            return None
+
+        from plextraktsync.path import trakt_queue_journal_file
+        from plextraktsync.queue.TraktQueueJournal import TraktQueueJournal
+
+        return TraktQueueJournal(trakt_queue_journal_file)
+
     @cached_property
     def batch_delay_timer(self):
         from plextraktsync.util.Timer import Timer
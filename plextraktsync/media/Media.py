@@ -42,7 +42,12 @@ def __init__(
 
     def __eq__(self, other):
         if isinstance(other, PlaybackEntry):
-            return self.type == other.type and self.trakt_id == other.trakt
+            if self.type != other.type:
+                return False
+            # Compare numbers first, to not look up ids of each episode
+            if self.type == "episode" and (self.season_number, self.episode_number) != (other.data.get("season"), other.data.get("number")):
+                return False
+            return self.trakt_id == other.trakt
 
         return False
 
@@ -167,7 +172,9 @@ def seasons(self):
         if self.media_type != "shows":
             raise RuntimeError(f"seasons: Unsupported media type: {self.media_type} for '{self.title}'")
 
-        return TraktLookup(self.trakt)
+        episode_map = self.trakt_api.episode_map if self.trakt_api else None
+
+        return TraktLookup(self.trakt, episode_map)
 
     @property
     def watched_on_plex(self):
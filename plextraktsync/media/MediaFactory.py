@@ -10,6 +10,7 @@
 from plextraktsync.config.PlexServerConfig import PlexServerConfig
 from plextraktsync.factory import logging
 from plextraktsync.media.Media import Media
+from plextraktsync.trakt.LazyTraktEpisode import LazyTraktEpisode
 
 if TYPE_CHECKING:
     from plextraktsync.plex.guid.PlexGuid import PlexGuid
@@ -26,10 +27,11 @@ class MediaFactory:
 
     logger = logging.getLogger(__name__)
 
-    def __init__(self, plex: PlexApi, trakt: TraktApi, server_config: PlexServerConfig):
+    def __init__(self, plex: PlexApi, trakt: TraktApi, server_config: PlexServerConfig, lazy_episodes: bool = False):
         self.plex = plex
         self.trakt = trakt
         self.server_config = server_config
+        self.lazy_episodes = lazy_episodes
 
     @cached_property
     def ignore_ids(self):
@@ -74,9 +76,10 @@ def resolve_guid(self, guid: PlexGuid, show: Media = None):
 
         try:
             if show:
-                tm = self.trakt.find_episode_guid(guid, show.seasons)
+                tm = self.find_episode(guid, show)
             else:
-                tm = self.trakt.find_by_guid(guid)
+                # Items in already downloaded Trakt data need no search
+                tm = self.trakt.id_index.find_by_guid(guid) or self.trakt.find_by_guid(guid)
         except (TraktException, RequestException) as e:
             self.logger.warning(
                 f"{guid.title_link}: Skipping {guid}: Trakt errors: {e}",
@@ -93,6 +96,14 @@ def resolve_guid(self, guid: PlexGuid, show: Media = None):
 
         return self.make_media(guid.pm, tm)
 
+    def find_episode(self, guid: PlexGuid, show: Media):
+        lookup = show.seasons
+        if self.lazy_episodes and not lookup.is_loaded and guid.pm.season_number is not None and guid.pm.episode_number is not None:
+            # Defer downloading season table of the show until the episode ids are needed
+            return LazyTraktEpisode(guid, lookup, self.trakt)
+
+        return self.trakt.find_episode_guid(guid, lookup)
+
     def resolve_trakt(self, tm: TraktItem) -> Media:
         """Find Plex media from Trakt id using Plex Search and Discover"""
         result = self.plex.search_online(tm.item.title, tm.type)
@@ -14,3 +14,9 @@
 servers_config = p.servers_config
 pytrakt_file = p.pytrakt_file
 env_file = p.env_file
+section_watermarks_file = p.section_watermarks_file
+trakt_state_dir = p.trakt_state_dir
+resolve_index_file = p.resolve_index_file
+trakt_episode_map_file = p.trakt_episode_map_file
+trakt_queue_journal_file = p.trakt_queue_journal_file
+profile_file = p.profile_file
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime
+from os.path import exists
+from typing import TYPE_CHECKING
+
+from plextraktsync.config.ConfigLoader import ConfigLoader
+
+if TYPE_CHECKING:
+    from plextraktsync.plex.PlexLibrarySection import PlexLibrarySection
+
+
+class SectionWatermarks:
+    """
+    Persistent per server and per library section timestamps of last successful walks.
+
+    Stored as json:
+    {
+        server_id: {
+            section_key: {
+                "walked_at": timestamp,
+                "full_walk_at": timestamp,
+            }
+        }
+    }
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.loaded = False
+        self.servers = {}
+
+    def load(self):
+        if self.loaded:
+            return self
+        self.loaded = True
+
+        if exists(self.path):
+            self.servers = ConfigLoader.load(self.path)
+
+        return self
+
+    def save(self):
+        ConfigLoader.write(self.path, self.servers)
+
+    def get(self, server_id: str, section: PlexLibrarySection) -> dict | None:
+        self.load()
+
+        return self.servers.get(server_id, {}).get(str(section.key))
+
+    def walked_at(self, server_id: str, section: PlexLibrarySection) -> datetime | None:
+        return self.timestamp(server_id, section, "walked_at")
+
+    def full_walk_at(self, server_id: str, section: PlexLibrarySection) -> datetime | None:
+        return self.timestamp(server_id, section, "full_walk_at")
+
+    def timestamp(self, server_id: str, section: PlexLibrarySection, name: str) -> datetime | None:
+        watermark = self.get(server_id, section)
+        if not watermark or name not in watermark:
+            return None
+
+        return datetime.fromtimestamp(watermark[name])
+
+    def update(self, server_id: str, section: PlexLibrarySection, walked_at: datetime, full_walk: bool):
+        self.load()
+
+        watermark = self.servers.setdefault(server_id, {}).setdefault(str(section.key), {})
+        watermark["walked_at"] = walked_at.timestamp()
+        if full_walk:
+            watermark["full_walk_at"] = walked_at.timestamp()
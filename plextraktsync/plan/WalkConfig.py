@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import timedelta
 
 
 @dataclass
@@ -8,18 +12,25 @@ class WalkConfig:
     walk_movies = True
     walk_shows = True
     walk_watchlist = True
+    incremental = False
+    # Maximum time between full walks in incremental mode
+    full_walk_interval: timedelta | None = None
     library: list[str] = field(default_factory=list)
     show: list[str] = field(default_factory=list)
     movie: list[str] = field(default_factory=list)
     id: list[str] = field(default_factory=list)
 
-    def update(self, movies=None, shows=None, watchlist=None):
+    def update(self, movies=None, shows=None, watchlist=None, incremental=None, full_walk_interval=None):
         if movies is not None:
             self.walk_movies = movies
         if shows is not None:
             self.walk_shows = shows
         if watchlist is not None:
             self.walk_watchlist = watchlist
+        if incremental is not None:
+            self.incremental = incremental
+        if full_walk_interval is not None:
+            self.full_walk_interval = full_walk_interval
 
         return self
 
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from functools import cached_property
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from functools import cached_property, partial
+from threading import Event, Lock
+from time import monotonic, perf_counter
 from typing import TYPE_CHECKING
 
+from requests import RequestException
+from trakt.errors import TraktException
+
 from plextraktsync.decorators.measure_time import measure_time
 from plextraktsync.factory import logging
 from plextraktsync.mixin.SetWindowTitle import SetWindowTitle
@@ -12,18 +20,25 @@
 from plextraktsync.trakt.TraktItem import TraktItem
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, AsyncIterable, Generator, Iterable
-    from typing import Any
+    from collections.abc import AsyncGenerator, AsyncIterable, Callable, Generator, Iterable
+    from typing import Any, TypeAlias
 
     from plexapi.video import Episode
 
     from plextraktsync.media.Media import Media
     from plextraktsync.media.MediaFactory import MediaFactory
+    from plextraktsync.plan.SectionWatermarks import SectionWatermarks
     from plextraktsync.plan.WalkConfig import WalkConfig
     from plextraktsync.plex.PlexApi import PlexApi
     from plextraktsync.plex.PlexLibrarySection import PlexLibrarySection
+    from plextraktsync.plex.PlexSectionPager import PlexSectionPager
     from plextraktsync.plex.PlexWatchList import PlexWatchList
     from plextraktsync.trakt.TraktWatchlist import TraktWatchList
+    from plextraktsync.util.PerformanceReport import PerformanceReport
+    from plextraktsync.util.Tracer import Tracer
+
+    # Wraps iterable of Plex items to yield (item, media) tuples
+    Resolver: TypeAlias = Callable[[AsyncIterable[PlexLibraryItem] | Iterable[PlexLibraryItem]], AsyncIterable[tuple[PlexLibraryItem, Media | None]]]
 
 
 class Walker(SetWindowTitle):
@@ -33,6 +48,9 @@ class Walker(SetWindowTitle):
 
     logger = logging.getLogger(__name__)
 
+    # Overlap for incremental walks to allow clock differences between Plex server and us
+    WATERMARK_MARGIN = timedelta(minutes=10)
+
     def __init__(
         self,
         plex: PlexApi,
@@ -40,24 +58,101 @@ def __init__(
         mf: MediaFactory,
         config: WalkConfig,
         progressbar=None,
+        resolve_workers: int = 1,
+        watermarks: SectionWatermarks = None,
+        report: PerformanceReport = None,
+        tracer: Tracer = None,
     ):
         self._progressbar = progressbar
         self.plex = plex
         self.trakt = trakt
         self.mf = mf
         self.config = config
+        self.resolve_workers = resolve_workers
+        self.watermarks = watermarks
+        self.report = report
+        self.tracer = tracer
+        self.started_at = datetime.now()
 
     @cached_property
     def plan(self):
         from plextraktsync.plan.WalkPlanner import WalkPlanner
 
-        return WalkPlanner(self.plex, self.config).plan()
+        with measure_time("Planned library walk", level=logging.DEBUG):
+            return WalkPlanner(self.plex, self.config).plan()
+
+    @cached_property
+    def executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        return ThreadPoolExecutor(max_workers=self.resolve_workers, thread_name_prefix="MediaResolver")
+
+    def close(self):
+        """
+        Stop resolver threads
+        """
+        if "executor" in self.__dict__:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            del self.executor
 
     @property
     def is_partial(self):
-        return self.config.is_partial
+        return self.config.is_partial or self.is_incremental
+
+    @property
+    def sections(self) -> list[PlexLibrarySection]:
+        return self.plan.movie_sections + self.plan.show_sections
+
+    @cached_property
+    def server_id(self):
+        return self.plex.server.machineIdentifier
+
+    @cached_property
+    def is_incremental(self):
+        """
+        Incremental walk includes only items changed since the last walk of each section.
+        Full walk is done if any section has not been walked before or full_walk_interval has passed.
+        """
+        if not self.config.incremental or not self.watermarks or not self.sections:
+            return False
+
+        interval = self.config.full_walk_interval
+        for section in self.sections:
+            full_walk_at = self.watermarks.full_walk_at(self.server_id, section)
+            if full_walk_at is None:
+                self.logger.info(f"No previous full walk of {section.title_link}, doing full walk", extra={"markup": True})
+                return False
+            if interval and self.started_at - full_walk_at > interval:
+                self.logger.info(f"Last full walk of {section.title_link} was at {full_walk_at}, doing full walk", extra={"markup": True})
+                return False
+
+        return True
+
+    def changed_since(self, section: PlexLibrarySection) -> datetime | None:
+        if not self.is_incremental:
+            return None
+
+        return self.watermarks.walked_at(self.server_id, section) - self.WATERMARK_MARGIN
+
+    def update_watermarks(self):
+        """
+        Store walk time of the sections, to be called after successful sync.
+        """
+        if not self.watermarks or not self.sections:
+            return
+
+        for section in self.sections:
+            self.watermarks.update(self.server_id, section, self.started_at, full_walk=not self.is_incremental)
+        self.watermarks.save()
 
     def print_plan(self, print):
+        if self.is_incremental:
+            for section in self.sections:
+                print(
+                    f"Incremental walk of {section.title_link}: items changed since {self.changed_since(section)}",
+                    extra={"markup": True},
+                )
+
         if self.plan.movie_sections:
             print(
                 f"Sync Movie sections: {[x.title_link for x in self.plan.movie_sections]}",
@@ -79,27 +174,101 @@ def print_plan(self, print):
         if self.plan.episodes:
             print(f"Sync Episodes: {[x.title for x in self.plan.episodes]}")
 
-    async def get_plex_movies(self) -> Generator[PlexLibraryItem, Any, None]:
+    async def get_plex_movies(self, resolve: Resolver = None) -> AsyncGenerator[PlexLibraryItem, Any, None]:
         """
-        Iterate over movie sections unless specific movie is requested
+        Iterate over movie sections unless specific movie is requested.
+        With resolve, the items are passed through it inside the progress bar.
         """
         if self.plan.movies:
-            movies = self.media_from_items("movie", self.plan.movies)
+            movies = self.media_from_items("movie", self.plan.movies, resolve)
         elif self.plan.movie_sections:
-            movies = self.media_from_sections(self.plan.movie_sections)
+            movies = self.media_from_sections(self.plan.movie_sections, changed_only=True, resolve=resolve)
         else:
             return
 
         async for m in movies:
             yield m
 
-    async def find_movies(self) -> Generator[Media, Any, None]:
-        async for plex in self.get_plex_movies():
-            movie = self.mf.resolve_any(plex)
+    async def find_movies(self) -> AsyncGenerator[Media, Any, None]:
+        async for _, movie in self.get_plex_movies(self.resolve_items):
             if not movie:
                 continue
             yield movie
 
+    async def resolve_items(
+        self, items: AsyncIterable[PlexLibraryItem] | Iterable[PlexLibraryItem], resolve: Callable[[PlexLibraryItem], Media | None] = None
+    ) -> AsyncGenerator[tuple[PlexLibraryItem, Media | None], Any, None]:
+        """
+        Resolve Plex items to Media using resolve, MediaFactory.resolve_any by default.
+
+        Up to resolve_workers items are resolved concurrently in a thread pool,
+        the results are yielded in the same order as the items came in.
+        """
+        resolve = resolve or self.mf.resolve_any
+        if not hasattr(items, "__anext__"):
+            items = self.aiterate(items)
+        if self.resolve_workers <= 1:
+            async for pm in items:
+                yield pm, resolve(pm)
+            return
+
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        async for pm in items:
+            pending.append((pm, loop.run_in_executor(self.executor, resolve, pm)))
+            if len(pending) < self.resolve_workers:
+                continue
+            pm, future = pending.popleft()
+            yield pm, await future
+
+        while pending:
+            pm, future = pending.popleft()
+            yield pm, await future
+
+    def episode_resolver(self, plex_shows: dict[int, PlexLibraryItem], show_cache: dict[int, Media | None]):
+        """
+        Return function to resolve episodes with their show.
+
+        The first episode of each show is resolved before the other episodes of the show,
+        so that the show and its seasons table are fetched once
+        when episodes are resolved concurrently.
+        """
+        lock = Lock()
+        first_resolved: dict[int, Event] = {}
+
+        def resolve(ep: PlexLibraryItem):
+            ep.show = plex_shows[ep.show_id]
+            with lock:
+                resolved = first_resolved.get(ep.show_id)
+                first = resolved is None
+                if first:
+                    resolved = first_resolved[ep.show_id] = Event()
+
+            if not first:
+                resolved.wait()
+                return self.mf.resolve_any(ep, show_cache.get(ep.show_id))
+
+            try:
+                return self.resolve_first_episode(ep, show_cache)
+            finally:
+                resolved.set()
+
+        return resolve
+
+    def resolve_first_episode(self, ep: PlexLibraryItem, show_cache: dict[int, Media | None]):
+        show = show_cache.get(ep.show_id)
+        m = self.mf.resolve_any(ep, show)
+        if m and show is None:
+            # Show was not matched, use the show of the episode
+            show = show_cache[ep.show_id] = m.show
+        if show is not None and self.resolve_workers > 1 and not self.mf.lazy_episodes:
+            try:
+                show.seasons.load()
+            except (TraktException, RequestException) as e:
+                self.logger.warning(f"{show}: Unable to fetch seasons: {e}")
+
+        return m
+
     async def get_plex_shows(self) -> AsyncGenerator[PlexLibraryItem, Any, None]:
         if self.plan.shows:
             it = self.media_from_items("show", self.plan.shows)
@@ -123,24 +292,35 @@ async def find_episodes(self):
             plex_shows[show.key] = show
         self.logger.info(f"Preloaded shows data ({len(plex_shows)} shows)")
 
+        shows = plex_shows.values()
+        changed = None
+        if self.is_incremental:
+            # Few episodes are expected to change, match only their shows
+            changed = [ep async for ep in self.episodes_from_sections(self.plan.show_sections)]
+            show_ids = {ep.show_id for ep in changed}
+            shows = [ps for ps in shows if ps.key in show_ids]
+
         # Preload matches for shows
         show_cache: dict[int, Media] = {}
         self.logger.info("Preload shows matches")
-        it = self.progressbar(plex_shows.items(), desc="Processing show matches")
-        async for show_id, ps in it:
-            show_cache[show_id] = self.mf.resolve_any(ps)
+        it = self.progressbar(self.resolve_items(shows), total=len(shows), desc="Processing show matches")
+        async for ps, show in it:
+            show_cache[ps.key] = show
         self.logger.info(f"Preloaded shows matches ({len(show_cache)} shows)")
 
-        async for ep in self.episodes_from_sections(self.plan.show_sections):
-            show_id = ep.show_id
-            ep.show = plex_shows[show_id]
-            show = show_cache.get(show_id)
-            m = self.mf.resolve_any(ep, show)
+        resolve = partial(self.resolve_items, resolve=self.episode_resolver(plex_shows, show_cache))
+        if changed is None:
+            episodes = self.episodes_from_sections(self.plan.show_sections, resolve)
+        else:
+            episodes = self.progressbar(resolve(changed), total=len(changed), desc="Processing changed episodes")
+
+        async for ep, m in episodes:
             if not m:
                 continue
+            show = show_cache.get(ep.show_id)
             if show:
                 m.show = show
-            show_cache[show_id] = m.show
+            show_cache[ep.show_id] = m.show
             yield m
 
     async def walk_shows(self, shows: set[Media], title="Processing Shows"):
@@ -153,42 +333,58 @@ async def get_plex_episodes(self, episodes: list[Episode]) -> Generator[Media, A
         it = self.progressbar(episodes, desc="Processing episodes")
         async for pe in it:
             guid = PlexGuid(pe.grandparentGuid, "show")
-            show = self.mf.resolve_guid(guid)
+            show = await self.trakt.aio.run(self.mf.resolve_guid, guid)
             if not show:
                 continue
-            me = self.mf.resolve_any(PlexLibraryItem(pe, plex=self.plex), show)
+            me = await self.trakt.aio.run(self.mf.resolve_any, PlexLibraryItem(pe, plex=self.plex), show)
             if not me:
                 continue
 
             me.show = show
             yield me
 
-    async def media_from_sections(self, sections: list[PlexLibrarySection]) -> AsyncGenerator[PlexLibraryItem, Any, None]:
+    async def media_from_sections(
+        self, sections: list[PlexLibrarySection], changed_only=False, resolve: Resolver = None
+    ) -> AsyncGenerator[PlexLibraryItem, Any, None]:
         for section in sections:
             with measure_time(f"{section.title_link} processed", extra={"markup": True}):
                 self.set_window_title(f"Processing {section.title}")
-                it = self.progressbar(
-                    section.pager(),
+                it = self.section_items(
+                    section.pager(since=self.changed_since(section) if changed_only else None),
                     desc=f"Processing {section.title_link}",
+                    resolve=resolve,
                 )
                 async for m in it:
                     yield m
 
-    async def episodes_from_sections(self, sections: list[PlexLibrarySection]) -> Generator[PlexLibraryItem, Any, None]:
+    async def episodes_from_sections(
+        self, sections: list[PlexLibrarySection], resolve: Resolver = None
+    ) -> AsyncGenerator[PlexLibraryItem, Any, None]:
         for section in sections:
             with measure_time(f"{section.title_link} processed", extra={"markup": True}):
                 self.set_window_title(f"Processing {section.title}")
-                it = self.progressbar(
-                    section.pager("episode"),
+                it = self.section_items(
+                    section.pager("episode", since=self.changed_since(section)),
                     desc=f"Processing {section.title_link}",
+                    resolve=resolve,
                 )
                 async for m in it:
                     yield m
 
-    async def media_from_items(self, libtype: str, items: list) -> AsyncGenerator[PlexLibraryItem, Any, None]:
-        it = self.progressbar(items, desc=f"Processing {libtype}s")
-        async for m in it:
-            yield PlexLibraryItem(m, plex=self.plex)
+    def section_items(self, pager: PlexSectionPager, desc: str, resolve: Resolver = None):
+        items = pager if pager.aio is None else aiter(pager)
+        if resolve:
+            # Progress counts resolved items, not the items queued for resolving
+            items = resolve(items)
+
+        return self.progressbar(items, total=len(pager), desc=desc)
+
+    async def media_from_items(self, libtype: str, items: list, resolve: Resolver = None) -> AsyncGenerator[PlexLibraryItem, Any, None]:
+        it = (PlexLibraryItem(m, plex=self.plex) for m in items)
+        if resolve:
+            it = resolve(it)
+        async for m in self.progressbar(it, total=len(items), desc=f"Processing {libtype}s"):
+            yield m
 
     async def episode_from_show(self, show: Media) -> Generator[Media, Any, None]:
         for pe in show.plex.episodes():
@@ -199,12 +395,49 @@ async def episode_from_show(self, show: Media) -> Generator[Media, Any, None]:
             me.show = show
             yield me
 
+    @staticmethod
+    async def aiterate(items: Iterable):
+        for m in items:
+            yield m
+
+    @staticmethod
+    async def batches(items: AsyncIterable, size: int) -> AsyncGenerator[list, Any, None]:
+        """
+        Collect items to lists of up to size items
+        """
+        batch = []
+        async for m in items:
+            batch.append(m)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     async def progressbar(self, iterable: AsyncIterable | Iterable, **kwargs):
+        desc = kwargs.get("desc", "Processing")
+        start = monotonic()
+        trace_start = perf_counter()
+        items = 0
+        try:
+            async for m in self.iterate(iterable, **kwargs):
+                items += 1
+                yield m
+        finally:
+            if self.report:
+                self.report.add_phase(desc, items, monotonic() - start)
+            if self.tracer:
+                self.tracer.add(desc, trace_start, perf_counter() - trace_start, items=items)
+
+    async def iterate(self, iterable: AsyncIterable | Iterable, **kwargs):
         if self._progressbar:
             pb = self._progressbar(iterable, **kwargs)
             with pb as it:
                 async for m in it:
                     yield m
+        elif hasattr(iterable, "__anext__"):
+            async for m in iterable:
+                yield m
         else:
             for m in iterable:
                 yield m
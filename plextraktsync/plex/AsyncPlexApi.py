@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from plextraktsync.plex.PlexApi import PlexApi
+    from plextraktsync.plex.PlexId import PlexId
+    from plextraktsync.plex.PlexLibraryItem import PlexLibraryItem
+    from plextraktsync.plex.PlexLibrarySection import PlexLibrarySection
+
+
+class AsyncPlexApi:
+    """
+    Awaitable variants of PlexApi methods.
+
+    plexapi requests are blocking, these are run in a thread pool,
+    so that the event loop can have several Plex requests in flight.
+    The requests share the keep-alive connection pool of the http session.
+    """
+
+    def __init__(self, plex: PlexApi, workers: int = 4):
+        self.plex = plex
+        self.workers = workers
+
+    @cached_property
+    def executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="PlexApi")
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def fetch_item(self, key: int | str | PlexId) -> PlexLibraryItem | None:
+        return await self.run(self.plex.fetch_item, key)
+
+    async def fetch_items(self, keys: list[int | str | PlexId]) -> list[PlexLibraryItem | None]:
+        """
+        Fetch metadata of several items concurrently, results are in the order of keys
+        """
+        return await asyncio.gather(*(self.fetch_item(key) for key in keys))
+
+    async def search(self, section: PlexLibrarySection, **kwargs):
+        return await self.run(section.search, **kwargs)
+
+    async def ratings(self, section: PlexLibrarySection, media_type: str):
+        from plextraktsync.plex.PlexRatings import PlexRatings
+
+        return await self.run(PlexRatings.ratings, section, media_type)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from functools import cache, cached_property
+from functools import cache, cached_property, partial
 from typing import TYPE_CHECKING
 
 import plexapi
@@ -17,12 +17,15 @@
 from plextraktsync.plex.PlexLibrarySection import PlexLibrarySection
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from plexapi.media import MediaPart, SubtitleStream
     from plexapi.server import PlexServer
     from plexapi.video import Movie, Show
 
     from plextraktsync.config.PlexServerConfig import PlexServerConfig
     from plextraktsync.plex.types import PlexMedia
+    from plextraktsync.queue.PlexWriteQueue import PlexWriteQueue
 
 
 class PlexApi:
@@ -36,9 +39,11 @@ def __init__(
         self,
         server: PlexServer,
         config: PlexServerConfig,
+        write_queue: PlexWriteQueue = None,
     ):
         self.server = server
         self.config = config
+        self.write_queue = write_queue
 
     def __str__(self):
         return f"<PlexApi:{self.server._baseurl}>"
@@ -183,9 +188,14 @@ def ratings(self):
 
         return PlexRatings(self)
 
-    @retry()
+    @cached_property
+    def aio(self):
+        from plextraktsync.plex.AsyncPlexApi import AsyncPlexApi
+
+        return AsyncPlexApi(self, workers=max(1, factory.config["performance"]["plex_workers"]))
+
     def rate(self, m: PlexMedia, rating: int | float | None):
-        m.rate(rating)
+        self.write(m, "rating", m.rate, rating)
 
     @flatten_list
     def history(self, m, device=False, account=False):
@@ -202,13 +212,31 @@ def history(self, m, device=False, account=False):
                 h.account = self.system_account(h.accountID)
             yield h
 
-    @retry()
     def mark_watched(self, m):
-        m.markPlayed()
+        self.write(m, "watched", m.markPlayed)
 
-    @retry()
     def mark_unwatched(self, m):
-        m.markUnplayed()
+        self.write(m, "watched", m.markUnplayed)
+
+    def update_progress(self, m, progress: int):
+        self.write(m, "progress", m.updateProgress, progress)
+
+    def write(self, m: PlexMedia, kind: str, fn: Callable, *args):
+        """
+        Run Plex update now, or add it to the write queue if it's enabled.
+        """
+        if self.write_queue is None:
+            return self.write_now(fn, *args)
+
+        self.write_queue.add((m.ratingKey, kind), partial(self.write_now, fn, *args), f"{fn.__name__} {m.title}")
+
+    @retry()
+    def write_now(self, fn: Callable, *args):
+        fn(*args)
+
+    def flush_writes(self):
+        if self.write_queue is not None:
+            self.write_queue.flush()
 
     def has_sessions(self):
         try:
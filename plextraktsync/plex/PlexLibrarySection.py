@@ -8,6 +8,7 @@
 from plextraktsync.rich.RichMarkup import RichMarkup
 
 if TYPE_CHECKING:
+    from datetime import datetime
     from typing import Literal
 
     from plexapi.library import MovieSection, ShowSection
@@ -21,10 +22,33 @@ def __init__(self, section: ShowSection | MovieSection, plex: PlexApi = None):
         self.section = section
         self.plex = plex
 
-    def pager(self, libtype: Literal["episode"] = None):
+    def pager(self, libtype: Literal["episode"] = None, since: datetime = None):
+        """
+        Create pager for section items.
+        If since is given, only items added, updated, viewed or rated after it are included.
+        """
+        from plextraktsync.factory import factory
         from plextraktsync.plex.PlexSectionPager import PlexSectionPager
 
-        return PlexSectionPager(section=self.section, plex=self.plex, libtype=libtype)
+        read_ahead = factory.config["performance"]["plex_read_ahead"]
+        filters = None
+        if since is not None:
+            filters = {
+                "or": [
+                    {"updatedAt>>": since},
+                    {"addedAt>>": since},
+                    {"lastViewedAt>>": since},
+                    {"lastRatedAt>>": since},
+                ]
+            }
+
+        aio = self.plex.aio if factory.config["performance"]["plex_workers"] else None
+
+        return PlexSectionPager(section=self.section, plex=self.plex, libtype=libtype, read_ahead=read_ahead, filters=filters, aio=aio)
+
+    @property
+    def key(self):
+        return self.section.key
 
     @property
     def type(self):
@@ -1,22 +1,47 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from functools import cached_property
+from queue import Full, Queue
+from threading import Event, Thread
+from time import monotonic
 from typing import TYPE_CHECKING
 
+from plexapi.utils import cast
+
 from plextraktsync.decorators.retry import retry
 from plextraktsync.plex.PlexLibraryItem import PlexLibraryItem
 
 if TYPE_CHECKING:
     from plexapi.library import MovieSection, ShowSection
 
+    from plextraktsync.plex.AsyncPlexApi import AsyncPlexApi
     from plextraktsync.plex.PlexApi import PlexApi
 
 
 class PlexSectionPager:
-    def __init__(self, section: ShowSection | MovieSection, plex: PlexApi, libtype: str = None):
+    # Limits for the adaptive page size in read-ahead mode
+    MIN_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 1000
+    # Page size is adjusted so that fetching a page takes about this many seconds
+    TARGET_PAGE_TIME = 2.0
+
+    def __init__(
+        self,
+        section: ShowSection | MovieSection,
+        plex: PlexApi,
+        libtype: str = None,
+        read_ahead: int = 0,
+        filters: dict = None,
+        aio: AsyncPlexApi = None,
+    ):
         self.section = section
         self.plex = plex
         self.libtype = libtype if libtype is not None else section.TYPE
+        self.read_ahead = read_ahead
+        self.filters = filters
+        self.aio = aio
 
     def __len__(self):
         return self.total_size
@@ -24,7 +49,18 @@ def __len__(self):
     @cached_property
     @retry
     def total_size(self):
-        return self.section.totalViewSize(libtype=self.libtype, includeCollections=False)
+        if not self.filters:
+            return self.section.totalViewSize(libtype=self.libtype, includeCollections=False)
+
+        # totalViewSize() does not support filters, query the container size of the filtered search
+        key = self.section._buildSearchKey(libtype=self.libtype, filters=self.filters)
+        data = self.section._server.query(f"{key}&X-Plex-Container-Start=0&X-Plex-Container-Size=0")
+        total_size = cast(int, data.attrib.get("totalSize"))
+        if not isinstance(total_size, int):
+            # Size of the whole section is an upper bound, paging stops at the first empty page
+            return self.section.totalViewSize(libtype=self.libtype, includeCollections=False)
+
+        return total_size
 
     @retry()
     def fetch_items(self, start: int, size: int):
@@ -33,9 +69,56 @@ def fetch_items(self, start: int, size: int):
             container_start=start,
             container_size=size,
             maxresults=size,
+            filters=self.filters,
         )
 
     def __iter__(self):
+        pages = self.pages_read_ahead() if self.read_ahead > 0 else self.pages()
+        for items in pages:
+            for ep in items:
+                yield PlexLibraryItem(ep, plex=self.plex)
+
+    async def __aiter__(self):
+        async for items in self.apages():
+            for ep in items:
+                yield PlexLibraryItem(ep, plex=self.plex)
+
+    async def apages(self):
+        """
+        Fetch pages concurrently, keeping up to aio.workers requests in flight.
+        Pages are yielded in order.
+        """
+        from plexapi import X_PLEX_CONTAINER_SIZE
+
+        if self.aio is None:
+            for items in self.pages():
+                yield items
+            return
+
+        aio = self.aio
+        size = X_PLEX_CONTAINER_SIZE
+        max_items = await aio.run(getattr, self, "total_size")
+        starts = iter(range(0, max_items, size))
+        pending = deque()
+
+        def fetch_next():
+            start = next(starts, None)
+            if start is not None:
+                pending.append(asyncio.ensure_future(aio.run(self.fetch_items, start=start, size=size)))
+
+        for _ in range(aio.workers):
+            fetch_next()
+        try:
+            while pending:
+                items = await pending.popleft()
+                fetch_next()
+                if len(items):
+                    yield items
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def pages(self):
         from plexapi import X_PLEX_CONTAINER_SIZE
 
         max_items = self.total_size
@@ -48,9 +131,82 @@ def __iter__(self):
             if not len(items):
                 break
 
-            for ep in items:
-                yield PlexLibraryItem(ep, plex=self.plex)
+            yield items
+
+            start += size
+            if start > max_items:
+                break
+
+    def adaptive_pages(self):
+        """
+        Fetch pages with page size adjusted to the time it took to fetch previous page.
+        Fast responses (low latency, small payload) grow the page, slow ones shrink it.
+        """
+        from plexapi import X_PLEX_CONTAINER_SIZE
+
+        max_items = self.total_size
+        start = 0
+        size = min(max(X_PLEX_CONTAINER_SIZE, self.MIN_PAGE_SIZE), self.MAX_PAGE_SIZE)
+
+        while True:
+            fetch_start = monotonic()
+            items = self.fetch_items(start=start, size=size)
+            elapsed = monotonic() - fetch_start
+
+            if not len(items):
+                break
+
+            yield items
 
             start += size
             if start > max_items:
                 break
+
+            size = self.next_page_size(size, elapsed)
+
+    def next_page_size(self, size: int, elapsed: float):
+        if elapsed < self.TARGET_PAGE_TIME / 2:
+            size = min(size * 2, self.MAX_PAGE_SIZE)
+        elif elapsed > self.TARGET_PAGE_TIME * 2:
+            size = max(size // 2, self.MIN_PAGE_SIZE)
+
+        return size
+
+    def pages_read_ahead(self):
+        """
+        Fetch up to read_ahead pages in background thread while the current page is processed.
+        """
+        buffer = Queue(maxsize=self.read_ahead)
+        stopped = Event()
+
+        def put(message):
+            while not stopped.is_set():
+                try:
+                    buffer.put(message, timeout=1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                for items in self.adaptive_pages():
+                    if not put(("page", items)):
+                        return
+            except BaseException as e:
+                put(("error", e))
+            else:
+                put(("end", None))
+
+        thread = Thread(target=producer, daemon=True, name=f"PlexSectionPager-{self.section.title}")
+        thread.start()
+        try:
+            while True:
+                kind, data = buffer.get()
+                if kind == "end":
+                    break
+                if kind == "error":
+                    raise data
+                yield data
+        finally:
+            stopped.set()
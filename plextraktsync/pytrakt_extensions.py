@@ -1,8 +1,38 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from math import nan
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from trakt.core import get, post
 from trakt.pagination import paginate
 from trakt.utils import airs_date
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@get
+def last_activities():
+    data = yield "sync/last_activities"
+    yield data
+
+
+@post
+def add_ratings(items: dict):
+    """
+    Add ratings of several items: {"movies": [{"ids": ..., "rating": ..., "rated_at": ...}], ...}
+    """
+    result = yield "sync/ratings", items
+    yield result
+
+
+def updated_show_ids(start_date: str):
+    return paginate(f"shows/updates/id/{start_date}", limit=100)
+
 
 def allwatched():
     return AllShowsProgress(paginate("sync/watched/shows", extended="progress"))
@@ -105,38 +135,196 @@ def get_completed(self, season, episode):
         return self.seasons[season].get_completed(episode, reset_at)
 
 
+def parse_timestamp(value: str | None) -> float:
+    """
+    Parse Trakt timestamp to seconds, with the same result as airs_date().
+    Return nan for missing value.
+    """
+    if value is None:
+        return nan
+    if len(value) == 24 and value.endswith(".000Z"):
+        # Fast path for usual "2015-02-01T05:30:00.000Z"
+        return datetime.fromisoformat(value[:19]).timestamp()
+
+    return airs_date(value).timestamp()
+
+
+class CompactShowProgress:
+    """
+    Progress of single show, with episodes stored in sorted arrays
+    of packed (season, episode) keys, completed flags and last_watched_at timestamps.
+    Timestamps are parsed once, when the show is built.
+    """
+
+    __slots__ = ("trakt", "slug", "reset_at", "reset_ts", "completed", "seasons", "keys", "flags", "watched_at")
+
+    # Multiplier of season number in packed keys
+    SEASON_KEY = 1 << 20
+
+    def __init__(self, trakt=None, slug=None, reset_at=None, seasons=None):
+        self.trakt = trakt
+        self.slug = slug
+        self.reset_at = airs_date(reset_at)
+        self.reset_ts = self.reset_at.timestamp() if self.reset_at else None
+        # season number => season completed
+        self.seasons = {}
+
+        episodes = {}
+        for season in seasons or []:
+            number = season.get("number", 0)
+            season_episodes = season.get("episodes") or []
+            self.seasons[number] = season.get("completed", False) == len(season_episodes)
+            for episode in season_episodes:
+                completed = episode.get("completed", False) or (episode.get("plays") or 0) > 0
+                watched_at = parse_timestamp(episode.get("last_watched_at"))
+                episodes[self.key(number, episode.get("number", 0))] = (completed, watched_at)
+
+        self.completed = all(self.seasons.values()) if self.seasons else False
+        self.keys = array("q", sorted(episodes))
+        self.flags = array("b", (episodes[k][0] for k in self.keys))
+        self.watched_at = array("d", (episodes[k][1] for k in self.keys))
+
+    @classmethod
+    def key(cls, season: int, episode: int):
+        return season * cls.SEASON_KEY + episode
+
+    def index(self, season: int, episode: int):
+        key = self.key(season, episode)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+
+        return None
+
+    def has_episode(self, season: int, episode: int):
+        return season in self.seasons and self.index(season, episode) is not None
+
+    def get_completed(self, season: int, episode: int):
+        if self.completed:
+            return True
+        season_completed = self.seasons.get(season)
+        if season_completed is None:
+            return False
+        if season_completed:
+            return True
+        i = self.index(season, episode)
+        if i is None:
+            return False
+        if self.reset_ts and self.reset_ts > self.watched_at[i]:
+            return False
+        return bool(self.flags[i])
+
+    def completed_of(self, keys: Iterable[int]) -> set[int]:
+        """
+        Return packed keys of given episodes that are completed, same as get_completed for each
+        """
+        keys = set(keys)
+        if self.completed:
+            return keys
+        seasons = {season for season, completed in self.seasons.items() if completed}
+        reset_ts = self.reset_ts
+        completed = {
+            key
+            for key, flag, watched_at in zip(self.keys, self.flags, self.watched_at, strict=True)
+            if flag and not (reset_ts and reset_ts > watched_at)
+        }
+
+        return {key for key in keys if key in completed or key // self.SEASON_KEY in seasons}
+
+    def collected_of(self, keys: Iterable[int]) -> set[int]:
+        """
+        Return packed keys of given episodes that are present, same as has_episode for each
+        """
+        return set(keys).intersection(self.keys)
+
+    def add(self, season: int, episode: int):
+        if season not in self.seasons:
+            self.seasons[season] = False
+
+        i = self.index(season, episode)
+        if i is None:
+            key = self.key(season, episode)
+            i = bisect_left(self.keys, key)
+            self.keys.insert(i, key)
+            self.flags.insert(i, True)
+            self.watched_at.insert(i, nan)
+        else:
+            self.flags[i] = True
+            self.watched_at[i] = nan
+
+
 class AllShowsProgress:
+    """
+    Watched or collected progress of all shows.
+
+    Shows are kept as tuples of raw fields until first lookup,
+    and are then converted to CompactShowProgress.
+    Lookups and updates hold a lock, as sync items are processed in several threads.
+    """
+
     def __init__(self, shows=None):
-        self.shows = {}
-        shows = shows or []
-        for show in shows:
-            prog = ShowProgress(**show)
-            self.shows[prog.trakt] = prog
+        self.lock = Lock()
+        self._shows = {}
+        for show in shows or []:
+            ids = show["show"]["ids"] if show.get("show") else {}
+            self._shows[ids.get("trakt")] = (ids.get("slug"), show.get("reset_at"), show.get("seasons"))
+
+    def __len__(self):
+        return len(self._shows)
+
+    def __getstate__(self):
+        # Stored in TraktStateSnapshot, without the lock
+        return {"_shows": self._shows}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = Lock()
+
+    @property
+    def shows(self):
+        """
+        Progress of all shows by trakt id, builds progress of every show.
+        """
+        return {trakt_id: self.get(trakt_id) for trakt_id in list(self._shows)}
+
+    def get(self, trakt_id) -> CompactShowProgress | None:
+        with self.lock:
+            return self._get(trakt_id)
+
+    def _get(self, trakt_id) -> CompactShowProgress | None:
+        show = self._shows.get(trakt_id)
+        if isinstance(show, tuple):
+            show = self._shows[trakt_id] = CompactShowProgress(trakt_id, *show)
+
+        return show
 
     def get_completed(self, trakt_id, season, episode):
-        if trakt_id not in self.shows:
-            return False
-        else:
-            return self.shows[trakt_id].get_completed(season, episode)
+        with self.lock:
+            show = self._get(trakt_id)
+            if show is None:
+                return False
+
+            return show.get_completed(season, episode)
 
     def is_collected(self, trakt_id, season, episode):
-        if trakt_id not in self.shows or season not in self.shows[trakt_id].seasons:
-            return False
-        return episode in self.shows[trakt_id].seasons[season].episodes
+        with self.lock:
+            show = self._get(trakt_id)
+            if show is None:
+                return False
+
+            return show.has_episode(season, episode)
 
     def reset_at(self, trakt_id):
-        if trakt_id not in self.shows:
+        show = self.get(trakt_id)
+        if show is None:
             return None
-        else:
-            return airs_date(self.shows[trakt_id].reset_at)
+
+        return show.reset_at
 
     def add(self, trakt_id, season, episode):
-        episode_prog = {"number": episode, "completed": True}
-        season_prog = {"number": season, "episodes": [episode_prog]}
-        if trakt_id in self.shows:
-            if season in self.shows[trakt_id].seasons:
-                self.shows[trakt_id].seasons[season].episodes[episode] = EpisodeProgress(**episode_prog)
-            else:
-                self.shows[trakt_id].seasons[season] = SeasonProgress(**season_prog)
-        else:
-            self.shows[trakt_id] = ShowProgress(seasons=[season_prog])
+        with self.lock:
+            show = self._get(trakt_id)
+            if show is None:
+                show = self._shows[trakt_id] = CompactShowProgress(trakt_id)
+
+            show.add(season, episode)
@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from dataclasses import dataclass, field
 from queue import Empty
+from threading import Event
+from time import monotonic, sleep
 from typing import TYPE_CHECKING
 
+from plextraktsync.config import QUEUE_FLUSH_ATTEMPTS, QUEUE_RETRY_DELAY, QUEUE_RETRY_DELAY_MAX
 from plextraktsync.factory import logging
+from plextraktsync.queue.QueueLatency import QueueLatency
 
 if TYPE_CHECKING:
-    from queue import SimpleQueue
+    from queue import Queue
     from typing import Any
 
+    from plextraktsync.queue.TraktQueueJournal import TraktQueueJournal
     from plextraktsync.util.Timer import Timer
 
 
+@dataclass
+class Flush:
+    """
+    Request to send the queued items now, "done" is set when the flush is finished
+    """
+
+    done: Event = field(default_factory=Event)
+    sent: bool = False
+
+
 class BackgroundTask:
     """
     Class to read events from the queue and invoke them at tasks to flush them at an interval set by the timer
@@ -20,10 +36,58 @@ class BackgroundTask:
 
     logger = logging.getLogger(__name__)
 
-    def __init__(self, timer: Timer = None, *tasks):
+    def __init__(
+        self,
+        timer: Timer = None,
+        *tasks,
+        flush_size: int = 0,
+        max_size: int = 0,
+        journal: TraktQueueJournal = None,
+        name: str = "bulk",
+    ):
+        self.name = name
         self.queues = defaultdict(list)
+        # Time when the items in queues were added
+        self.queued_at = defaultdict(list)
+        self.latency = QueueLatency()
         self.timer = timer
         self.tasks = tasks
+        self.journal = journal
+        # Sequence number of the last journal entry moved to queues
+        self.journal_seq = 0
+        self.compacted_seq = 0
+        # Flush queues when this many items were added to one of them, without waiting for the timer
+        self.flush_size = flush_size
+        # Number of items left in each queue by the last flush
+        self.flushed_size = defaultdict(int)
+        # Stop taking items from the incoming queue while this many items wait to be sent
+        self.max_size = max_size
+        # Failed flushes of items left in queues, by id of the item
+        self.attempts: dict[int, int] = {}
+        self.failed_flushes = 0
+        # Number of items dropped after failed flushes
+        self.dropped = 0
+        # Time before which queues are not flushed again after a failed flush
+        self.retry_at = 0.0
+        # Set when the queue is closed, to take the remaining items even when full
+        self.stopping = False
+        # Number of items per queue, replaced by this thread after each change for other threads to read
+        self.depth: dict[str, int] = {}
+
+    def update_depth(self):
+        self.depth = {name: len(items) for name, items in self.queues.items()}
+
+    @property
+    def size(self):
+        return sum(len(items) for items in self.queues.values())
+
+    @property
+    def is_full(self):
+        return self.max_size and self.size >= self.max_size
+
+    @property
+    def backoff_remaining(self):
+        return max(0.0, self.retry_at - monotonic())
 
     def check_timer(self):
         if not self.timer:
@@ -36,30 +100,126 @@ def check_timer(self):
         self.timed_events()
         self.timer.update()
 
-    def timed_events(self):
+    def timed_events(self, force=False):
+        if not force and self.backoff_remaining:
+            return
+
         for task in self.tasks:
             try:
                 task(self.queues)
             except Exception as e:
                 self.logger.error(f"Got exception while working on {task}: {e}")
 
-    def process_message(self, message: (str, Any)):
-        (queue, data) = message
+        now = monotonic()
+        for queue, times in self.queued_at.items():
+            # Items of failed tasks and chunks are still in the queues,
+            # count the oldest times as the submitted ones
+            submitted = len(times) - len(self.queues[queue])
+            for queued_at in times[:submitted]:
+                self.latency.add(now - queued_at)
+            del times[:submitted]
+
+        self.count_failures()
+        for queue, items in self.queues.items():
+            self.flushed_size[queue] = len(items)
+
+        if self.journal and self.journal_seq != self.compacted_seq:
+            # Items of failed tasks are still in the queues, keep them
+            self.journal.compact(self.queues, self.journal_seq)
+            self.compacted_seq = self.journal_seq
+
+        self.update_depth()
+
+    def count_failures(self):
+        """
+        Count failed flushes of the items left in queues.
+        Pause flushing after a failed flush, and drop items that failed too many times.
+        """
+        attempts = {}
+        for queue, items in self.queues.items():
+            dropped = []
+            for item in items:
+                count = self.attempts.get(id(item), 0) + 1
+                if count >= QUEUE_FLUSH_ATTEMPTS:
+                    dropped.append(item)
+                else:
+                    attempts[id(item)] = count
+            if dropped:
+                self.logger.error(f"Dropping {len(dropped)} {queue} updates that failed {QUEUE_FLUSH_ATTEMPTS} times")
+                self.dropped += len(dropped)
+                self.logger.debug(f"Dropped {queue} updates: {dropped}")
+                dropped_ids = {id(item) for item in dropped}
+                items[:] = [item for item in items if id(item) not in dropped_ids]
+                del self.queued_at[queue][: len(dropped)]
+        self.attempts = attempts
+
+        if not attempts:
+            self.failed_flushes = 0
+            self.retry_at = 0.0
+            return
+
+        delay = min(QUEUE_RETRY_DELAY_MAX, QUEUE_RETRY_DELAY * 2**self.failed_flushes)
+        self.failed_flushes += 1
+        self.retry_at = monotonic() + delay
+        self.logger.warning(f"{len(attempts)} Trakt updates were not sent, trying again in {delay:.0f} seconds")
+
+    def process_message(self, message: (str, Any, int | None, float)):
+        (queue, data, *rest) = message
+        seq, queued_at = (rest + [None, None])[:2]
         self.queues[queue].append(data)
+        self.queued_at[queue].append(queued_at or monotonic())
+        if seq is not None:
+            self.journal_seq = seq
+        # Items left by a failed flush don't count, they are sent after the pause
+        added = len(self.queues[queue]) - self.flushed_size[queue]
+        if (self.flush_size and added >= self.flush_size) or self.is_full:
+            self.logger.debug(f"Queue {queue} has {added} new items, run timed events now")
+            self.timed_events()
+            if self.timer:
+                self.timer.update()
+        else:
+            self.update_depth()
+
+    def flush(self, request: Flush):
+        """
+        Send queued items now, and report whether all items queued so far were sent.
+        """
+        self.timed_events(force=True)
+        if self.timer:
+            self.timer.update()
+        request.sent = not self.size and not self.dropped
+        request.done.set()
 
     def shutdown(self):
         """
         The shutdown handler: run timed events now.
         """
-        self.logger.debug("Shutdown, run timed events now")
+        self.logger.debug(f"Shutdown {self.name} lane, run timed events now")
+        self.timed_events(force=True)
+        if self.latency.count:
+            self.logger.debug(f"Queue {self.name} lane: {self.latency}")
+
+    def wait_for_room(self):
+        remaining = self.backoff_remaining
+        if remaining:
+            sleep(min(1.0, remaining))
+            return
+
         self.timed_events()
+        if self.timer:
+            self.timer.update()
 
-    def __call__(self, queue: SimpleQueue):
+    def __call__(self, queue: Queue):
         """
         Process events from the queue and invoke timed events.
         """
 
         while True:
+            if self.is_full and not self.stopping:
+                # Adding to the queue blocks until queued items are sent
+                self.wait_for_room()
+                continue
+
             try:
                 message = queue.get(timeout=1)
             except Empty:
@@ -68,6 +228,9 @@ def __call__(self, queue: SimpleQueue):
                 if message is None:
                     self.shutdown()
                     break
-                self.process_message(message)
+                if isinstance(message, Flush):
+                    self.flush(message)
+                else:
+                    self.process_message(message)
 
             self.check_timer()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class ChunkedWorker:
+    """
+    Mixin for queue workers to submit items in chunks of bounded size.
+
+    A failed chunk doesn't prevent submitting the other chunks,
+    its items are kept in the queue to be submitted on next flush.
+    """
+
+    # Maximum number of items submitted in one request
+    CHUNK_SIZE = 500
+    # Number of chunks submitted concurrently, requests are still spaced by rate and time limits
+    CONCURRENCY = 2
+
+    logger = logging.getLogger(__name__)
+
+    def submit_chunks(self, submit: Callable[[list], None], items: list):
+        """
+        Submit items in chunks, and remove submitted items from the list.
+
+        Items of failed chunks are left in the list,
+        and the first error is raised after the other chunks are submitted.
+        """
+        chunks = [items[i : i + self.CHUNK_SIZE] for i in range(0, len(items), self.CHUNK_SIZE)]
+        if len(chunks) <= 1:
+            for chunk in chunks:
+                submit(chunk)
+            items.clear()
+            return
+
+        self.logger.debug(f"Submitting {len(items)} items in {len(chunks)} chunks")
+        failed = []
+        error = None
+        with ThreadPoolExecutor(max_workers=self.CONCURRENCY, thread_name_prefix=type(self).__name__) as executor:
+            futures = [executor.submit(submit, chunk) for chunk in chunks]
+            for i, (chunk, future) in enumerate(zip(chunks, futures, strict=True), start=1):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Got exception while submitting chunk {i}/{len(chunks)} ({len(chunk)} items): {e}")
+                    failed.extend(chunk)
+                    error = error or e
+
+        items[:] = failed
+        if error is not None:
+            raise error
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import atexit
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from concurrent.futures import Future
+
+
+class PlexWriteQueue:
+    """
+    Queue of Plex updates (watched state, ratings, progress) run in a bounded thread pool.
+
+    Updates are keyed by item and kind of update,
+    an update queued for a key that is still waiting replaces the waiting one.
+    Updates of the same key run one at a time, in the order they were queued.
+    Failures don't abort the sync, they are reported when the queue is flushed.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self.lock = Lock()
+        self.pending: dict[Hashable, tuple[Callable, str]] = {}
+        # Keys of updates being run
+        self.running: set[Hashable] = set()
+        # Futures not yet completed
+        self.futures: set[Future] = set()
+        self.failures: list[tuple[str, Exception]] = []
+        self.coalesced = 0
+        atexit.register(self.close)
+
+    @cached_property
+    def executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="PlexWrite")
+
+    def add(self, key: Hashable, fn: Callable, title: str):
+        with self.lock:
+            queued = key in self.pending
+            self.pending[key] = (fn, title)
+            if queued:
+                self.coalesced += 1
+                return
+            if key in self.running:
+                # Submitted when the running update of the key completes
+                return
+
+        self.submit(key)
+
+    def submit(self, key: Hashable):
+        future = self.executor.submit(self.run, key)
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self.done)
+
+    def done(self, future: Future):
+        with self.lock:
+            self.futures.discard(future)
+
+    def run(self, key: Hashable):
+        with self.lock:
+            fn, title = self.pending.pop(key)
+            self.running.add(key)
+
+        try:
+            fn()
+        except Exception as e:
+            self.logger.debug(f"Plex update failed: {title}: {e}")
+            with self.lock:
+                self.failures.append((title, e))
+        finally:
+            with self.lock:
+                self.running.discard(key)
+                queued = key in self.pending
+            if queued:
+                self.submit(key)
+
+    def flush(self):
+        """
+        Wait for queued updates to complete, and report failed ones.
+        """
+        while True:
+            with self.lock:
+                futures = list(self.futures)
+            if not futures:
+                break
+            wait(futures)
+        if self.coalesced:
+            self.logger.debug(f"Skipped {self.coalesced} Plex updates replaced by later ones")
+            self.coalesced = 0
+
+        with self.lock:
+            failures, self.failures = self.failures, []
+        if not failures:
+            return
+        self.logger.error(f"{len(failures)} Plex updates failed:")
+        for title, e in failures:
+            self.logger.error(f"  {title}: {e}")
+
+    def close(self):
+        self.flush()
+        if "executor" in self.__dict__:
+            self.executor.shutdown(wait=True)
@@ -1,18 +1,54 @@
 from __future__ import annotations
 
 import atexit
-from queue import SimpleQueue
+from queue import Queue as BoundedQueue
+from threading import Lock
+from time import monotonic
 from typing import TYPE_CHECKING
 
+from plextraktsync.factory import logging
+
 if TYPE_CHECKING:
     from typing import Any
 
+    from plextraktsync.queue.BackgroundTask import BackgroundTask
+    from plextraktsync.queue.TraktQueueJournal import TraktQueueJournal
+
 
 class Queue:
-    def __init__(self, runner):
-        self.queue = SimpleQueue()
-        self.daemon = self.start_daemon(runner)
+    # Queues sent by the priority lane, not waiting behind bulk updates
+    PRIORITY_QUEUES = (
+        "scrobble_update",
+        "scrobble_stop",
+    )
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, runner: BackgroundTask, maxsize: int = 0, journal: TraktQueueJournal = None, priority_runner: BackgroundTask = None):
+        # With maxsize, adding to queue blocks while the queue is full
+        self.queue = BoundedQueue(maxsize=maxsize)
+        self.journal = journal
+        # Journal sequence numbers must reach the queue in order
+        self.lock = Lock()
+        self.runners = [runner]
+        self.daemon = self.start_daemon(runner, self.queue)
+        self.priority_queue = None
+        self.priority_daemon = None
+        if priority_runner:
+            self.priority_queue = BoundedQueue()
+            self.priority_daemon = self.start_daemon(priority_runner, self.priority_queue, name="PriorityTask")
+            self.runners.append(priority_runner)
         atexit.register(self.close)
+        if journal:
+            self.replay(journal)
+
+    def replay(self, journal: TraktQueueJournal):
+        entries = journal.replay()
+        if not entries:
+            return
+
+        self.logger.info(f"Queueing {len(entries)} Trakt updates left over from previous run")
+        for seq, queue, data in entries:
+            self.queue.put((queue, data, seq, monotonic()))
 
     def add_to_collection(self, data):
         self.add_queue("add_to_collection", data)
@@ -29,6 +65,9 @@ def remove_from_watchlist(self, data):
     def add_to_history(self, data):
         self.add_queue("add_to_history", data)
 
+    def add_to_ratings(self, data):
+        self.add_queue("add_to_ratings", data)
+
     def scrobble_update(self, data):
         self.add_queue("scrobble_update", data)
 
@@ -39,12 +78,59 @@ def add_queue(self, queue: str, data: Any):
         """
         Add "data" to "queue". Returns immediately
         """
-        self.queue.put((queue, data))
+        if self.priority_queue is not None and queue in self.PRIORITY_QUEUES:
+            self.priority_queue.put((queue, data, None, monotonic()))
+            return
 
-    def start_daemon(self, runner):
+        if not self.journal:
+            self.queue.put((queue, data, None, monotonic()))
+            return
+
+        with self.lock:
+            seq = self.journal.append(queue, data)
+            self.queue.put((queue, data, seq, monotonic()))
+
+    def flush(self) -> bool:
+        """
+        Send the queued updates now, and wait until they are sent.
+        Returns False if some updates could not be sent.
+        """
+        from plextraktsync.queue.BackgroundTask import Flush
+
+        request = Flush()
+        self.queue.put(request)
+        request.done.wait()
+
+        return request.sent
+
+    @property
+    def latency(self):
+        """
+        Queue wait time of submitted items per lane
+        """
+        return {runner.name: runner.latency for runner in self.runners}
+
+    def depth(self):
+        """
+        Number of items waiting per queue name, "incoming" for items not yet sorted to queues.
+        Safe to call from other threads, the runners publish their depths.
+        """
+        incoming = 0
+        for queue in [self.queue, self.priority_queue]:
+            if queue is not None:
+                incoming += queue.qsize()
+        depth = {(("queue", "incoming"),): incoming}
+        for runner in self.runners:
+            for name, count in runner.depth.items():
+                depth[(("queue", name),)] = count
+
+        return depth
+
+    @staticmethod
+    def start_daemon(runner, queue: BoundedQueue, name="BackgroundTask"):
         from threading import Thread
 
-        daemon = Thread(target=runner, args=(self.queue,), daemon=True, name="BackgroundTask")
+        daemon = Thread(target=runner, args=(queue,), daemon=True, name=name)
         daemon.start()
 
         return daemon
@@ -54,7 +140,15 @@ def close(self):
         Close the queue.
         Terminate child thread and stop accepting items to queue.
         """
+        for runner in self.runners:
+            runner.stopping = True
+        if self.priority_daemon is not None and self.priority_daemon.is_alive():
+            self.priority_queue.put(None)
+            self.priority_daemon.join()
         if self.daemon.is_alive():
             self.queue.put(None)
             self.daemon.join()
         self.queue = None
+        self.priority_queue = None
+        if self.journal:
+            self.journal.close()
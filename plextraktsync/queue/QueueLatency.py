@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from threading import Lock
+
+
+class QueueLatency:
+    """
+    Time items waited in a queue lane before they were submitted
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Callbacks called with each wait time
+        self.observers = []
+
+    def __str__(self):
+        return f"{self.count} items, average wait {self.average:.3f}s, max wait {self.max:.3f}s"
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+        for observer in self.observers:
+            observer(seconds)
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from functools import partial
 
 import trakt.sync
 
@@ -9,10 +10,11 @@
 from plextraktsync.decorators.retry import retry
 from plextraktsync.decorators.time_limit import time_limit
 from plextraktsync.factory import logging
+from plextraktsync.queue.ChunkedWorker import ChunkedWorker
 from plextraktsync.util.remove_empty_values import remove_empty_values
 
 
-class TraktBatchWorker:
+class TraktBatchWorker(ChunkedWorker):
     # Queues this Worker can handle
     QUEUES = (
         "add_to_collection",
@@ -23,12 +25,18 @@ class TraktBatchWorker:
     logger = logging.getLogger(__name__)
 
     def __call__(self, queues):
+        error = None
         for name in self.QUEUES:
             items = queues[name]
             if not len(items):
                 continue
-            self.submit(name, items)
-            queues[name].clear()
+            try:
+                self.submit_chunks(partial(self.submit, name), items)
+            except Exception as e:
+                # Submit other queues, failed items are kept in the queue
+                error = error or e
+        if error is not None:
+            raise error
 
     def submit(self, name, items):
         method = getattr(self, name)
@@ -8,10 +8,11 @@
 from plextraktsync.decorators.retry import retry
 from plextraktsync.decorators.time_limit import time_limit
 from plextraktsync.factory import logging
+from plextraktsync.queue.ChunkedWorker import ChunkedWorker
 from plextraktsync.util.remove_empty_values import remove_empty_values
 
 
-class TraktMarkWatchedWorker:
+class TraktMarkWatchedWorker(ChunkedWorker):
     # Queue this Worker can handle
     QUEUE = "add_to_history"
     logger = logging.getLogger(__name__)
@@ -20,8 +21,7 @@ def __call__(self, queues):
         items = queues[self.QUEUE]
         if not len(items):
             return
-        self.submit(items)
-        queues[self.QUEUE].clear()
+        self.submit_chunks(self.submit, items)
 
     def submit(self, items):
         items = self.normalize(items)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from trakt.utils import timestamp
+
+from plextraktsync.factory import logging
+from plextraktsync.trakt.PartialTraktMedia import PartialTraktMedia
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class TraktQueueJournal:
+    """
+    Append-only journal of Trakt updates added to the background queue.
+
+    Each queued update is written to the journal before it's queued.
+    After the queue is flushed, the journal is compacted to updates not yet submitted.
+    Updates left in the journal by an interrupted run are queued again on the next run.
+    """
+
+    # Queues of persistent changes, scrobbles are not worth replaying
+    QUEUES = (
+        "add_to_collection",
+        "remove_from_collection",
+        "add_to_watchlist",
+        "remove_from_watchlist",
+        "add_to_history",
+        "add_to_ratings",
+    )
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = Lock()
+        self.seq = 0
+        self._fh = None
+
+    @property
+    def fh(self):
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+
+        return self._fh
+
+    def close(self):
+        with self.lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def append(self, queue: str, data: Any) -> int | None:
+        """
+        Write update to journal, returns sequence number of the entry
+        """
+        if queue not in self.QUEUES:
+            return None
+
+        with self.lock:
+            self.seq += 1
+            self.write(self.fh, self.seq, queue, data)
+            self.fh.flush()
+
+            return self.seq
+
+    def read(self):
+        """
+        Return (seq, queue, data) entries from the journal
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        entries = []
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be partially written when the process was killed
+                    self.logger.warning(f"Skipping corrupt entry in {self.path}")
+                    continue
+                entries.append((entry["seq"], entry["queue"], self.deserialize(entry["queue"], entry["data"])))
+
+        return entries
+
+    def replay(self):
+        """
+        Return entries left over from previous run, continuing sequence numbers after them
+        """
+        entries = self.read()
+        with self.lock:
+            self.seq = max((seq for seq, _, _ in entries), default=0)
+
+        return entries
+
+    def compact(self, pending: dict[str, list], seq: int):
+        """
+        Rewrite the journal with updates still pending in the queues,
+        and updates with sequence number after seq, which were not yet processed.
+        """
+        with self.lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            entries = [entry for entry in self.read() if entry[0] > seq]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                for queue in self.QUEUES:
+                    for data in pending.get(queue, []):
+                        self.write(fh, seq, queue, data)
+                for entry in entries:
+                    self.write(fh, *entry)
+            os.replace(tmp_path, self.path)
+
+    def write(self, fh, seq: int, queue: str, data: Any):
+        fh.write(json.dumps({"seq": seq, "queue": queue, "data": self.serialize(data)}, default=self.default))
+        fh.write("\n")
+
+    @staticmethod
+    def serialize(data: Any):
+        if is_dataclass(data):
+            return asdict(data)
+
+        return data
+
+    @staticmethod
+    def deserialize(queue: str, data: Any):
+        if queue in ["add_to_history", "add_to_ratings"]:
+            return PartialTraktMedia(**data)
+
+        # Batch queues hold (media_type, item) tuples
+        return tuple(data)
+
+    @staticmethod
+    def default(value: Any):
+        if isinstance(value, datetime):
+            return timestamp(value)
+
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
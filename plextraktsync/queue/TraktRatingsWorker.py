@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from plextraktsync.decorators.rate_limit import rate_limit
+from plextraktsync.decorators.retry import retry
+from plextraktsync.decorators.time_limit import time_limit
+from plextraktsync.factory import logging
+from plextraktsync.pytrakt_extensions import add_ratings
+from plextraktsync.queue.ChunkedWorker import ChunkedWorker
+from plextraktsync.util.remove_empty_values import remove_empty_values
+
+
+class TraktRatingsWorker(ChunkedWorker):
+    # Queue this Worker can handle
+    QUEUE = "add_to_ratings"
+    logger = logging.getLogger(__name__)
+
+    def __call__(self, queues):
+        items = queues[self.QUEUE]
+        if not len(items):
+            return
+        self.submit_chunks(self.submit, items)
+
+    def submit(self, items):
+        items = self.normalize(items)
+        self.logger.debug(f"Submit add_to_ratings: {items}")
+        result = self.add_to_ratings(items)
+        result = remove_empty_values(result.copy())
+        if result:
+            self.logger.debug(f"Submitted add_to_ratings: {result}")
+
+    @rate_limit()
+    @time_limit()
+    @retry()
+    def add_to_ratings(self, items: dict):
+        return add_ratings(items)
+
+    @staticmethod
+    def normalize(items: list):
+        result = defaultdict(list)
+        for m in items:
+            result[m.media_type].append(
+                {
+                    "ids": m.ids["ids"],
+                    "rating": m.rating,
+                    "rated_at": m.rated_at,
+                }
+            )
+
+        return result
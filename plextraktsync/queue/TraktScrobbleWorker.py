@@ -42,7 +42,7 @@ def submit(self, name, items):
             self.logger.debug(f"Submitted {name}: {results}")
 
     @rate_limit()
-    @time_limit()
+    @time_limit(priority=True)
     @retry()
     def scrobble(self, scrobbler: Scrobbler, name: str, progress: float):
         method = getattr(scrobbler, name)
@@ -4,35 +4,58 @@
 
 from plextraktsync.factory import logging
 from plextraktsync.plugin import hookimpl
+from plextraktsync.pytrakt_extensions import CompactShowProgress
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound
 
 if TYPE_CHECKING:
-    from .plugin.SyncPluginInterface import Media, SyncConfig
+    from plextraktsync.trakt.TraktApi import TraktApi
+
+    from .plugin.SyncPluginInterface import Media, Sync, SyncConfig
 
 
 class AddCollectionPlugin:
     logger = logging.getLogger(__name__)
 
+    def __init__(self, trakt: TraktApi):
+        self.trakt = trakt
+
     @staticmethod
     def enabled(config: SyncConfig):
         return config.plex_to_trakt["collection"]
 
     @classmethod
-    def factory(cls, sync):
-        return cls()
+    def factory(cls, sync: Sync):
+        return cls(sync.trakt)
 
     @hookimpl
-    async def walk_movie(self, movie: Media, dry_run: bool):
-        await self.sync_collection(movie, dry_run=dry_run)
+    async def walk_movies_batch(self, movies: list[Media], dry_run: bool):
+        missing = {m.trakt_id for m in movies} - await self.trakt.aio.movie_collection_set()
+        for m in movies:
+            if m.trakt_id in missing:
+                await self.sync_collection(m, dry_run=dry_run)
 
     @hookimpl
-    async def walk_episode(self, episode: Media, dry_run: bool):
-        await self.sync_collection(episode, dry_run=dry_run)
+    async def walk_episodes_batch(self, episodes: list[Media], dry_run: bool):
+        shows: dict[int, dict[int, list[Media]]] = {}
+        for m in episodes:
+            key = CompactShowProgress.key(m.season_number, m.episode_number)
+            shows.setdefault(m.show_trakt_id, {}).setdefault(key, []).append(m)
+
+        collected_shows = await self.trakt.aio.collected_shows()
+        for show_id, items in shows.items():
+            progress = collected_shows.get(show_id)
+            collected = progress.collected_of(items) if progress else set()
+            for key, media in items.items():
+                if key in collected:
+                    continue
+                for m in media:
+                    await self.sync_collection(m, dry_run=dry_run)
 
     async def sync_collection(self, m: Media, dry_run: bool):
-        if m.is_collected:
-            return
-
         self.logger.info(f"Adding to Trakt collection: {m.title_link}", extra={"markup": True})
 
         if not dry_run:
-            m.add_to_collection()
+            try:
+                await self.trakt.aio.add_to_collection(m.trakt, m.plex)
+            except EpisodeNotFound as e:
+                self.logger.warning(f"{m.title_link}: Skipping: {e}", extra={"markup": True})
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from plextraktsync.factory import logging
 from plextraktsync.media.Media import Media
 from plextraktsync.plugin import hookimpl
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound
 
 if TYPE_CHECKING:
     from plextraktsync.trakt.TraktApi import TraktApi
@@ -40,18 +42,24 @@ def init(self, pm: SyncPluginManager, is_partial: bool):
 
     @hookimpl
     async def fini(self, dry_run: bool):
-        self.clear_collected(self.trakt.movie_collection, self.movie_trakt_ids, dry_run=dry_run)
-        self.clear_collected(self.trakt.episodes_collection, self.episode_trakt_ids, dry_run=dry_run)
+        aio = self.trakt.aio
+        movie_collection, episodes_collection = await asyncio.gather(aio.movie_collection(), aio.episodes_collection())
+        await self.clear_collected(movie_collection, self.movie_trakt_ids, dry_run=dry_run)
+        await self.clear_collected(episodes_collection, self.episode_trakt_ids, dry_run=dry_run)
 
     @hookimpl
-    async def walk_movie(self, movie: Media):
-        self.movie_trakt_ids.add(movie.trakt_id)
+    async def walk_movies_batch(self, movies: list[Media]):
+        self.movie_trakt_ids.update(m.trakt_id for m in movies)
 
     @hookimpl
-    async def walk_episode(self, episode: Media):
-        self.episode_trakt_ids.add(episode.trakt_id)
-
-    def clear_collected(self, existing_items: Iterable[TraktMedia], keep_ids: set[int], dry_run):
+    async def walk_episodes_batch(self, episodes: list[Media]):
+        for episode in episodes:
+            try:
+                self.episode_trakt_ids.add(episode.trakt_id)
+            except EpisodeNotFound as e:
+                self.logger.warning(f"{episode.title_link}: Skipping: {e}", extra={"markup": True})
+
+    async def clear_collected(self, existing_items: Iterable[TraktMedia], keep_ids: set[int], dry_run):
         from plextraktsync.trakt.trakt_set import trakt_set
 
         existing_ids = trakt_set(existing_items)
@@ -62,4 +70,4 @@ def clear_collected(self, existing_items: Iterable[TraktMedia], keep_ids: set[in
         for i, tm in enumerate(delete_items, start=1):
             self.logger.info(f"Remove from Trakt collection ({i}/{n}): {tm}")
             if not dry_run:
-                self.trakt.remove_from_collection(tm)
+                await self.trakt.aio.remove_from_collection(tm)
@@ -1,25 +1,43 @@
 from __future__ import annotations
 
-from functools import cached_property
+from functools import cached_property, partial
 from typing import TYPE_CHECKING
 
+from plextraktsync.decorators.measure_time import measure_time
 from plextraktsync.factory import logging
+from plextraktsync.sync.SyncDiff import SyncDiff
+from plextraktsync.sync.SyncItemWindow import SyncItemWindow
 from plextraktsync.trakt.TraktUserListCollection import TraktUserListCollection
 
 if TYPE_CHECKING:
     from plextraktsync.config.SyncConfig import SyncConfig
     from plextraktsync.plan.Walker import Walker
     from plextraktsync.plex.PlexApi import PlexApi
+    from plextraktsync.sync.plugin.HookTimings import HookTimings
     from plextraktsync.trakt.TraktApi import TraktApi
 
 
 class Sync:
     logger = logging.getLogger(__name__)
 
-    def __init__(self, config: SyncConfig, plex: PlexApi, trakt: TraktApi):
+    # Number of items passed to plugins at once
+    BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        config: SyncConfig,
+        plex: PlexApi,
+        trakt: TraktApi,
+        workers: int = 1,
+        diff: bool = False,
+        timings: HookTimings = None,
+    ):
         self.config = config
         self.plex = plex
         self.trakt = trakt
+        self.workers = workers
+        self.diff = diff
+        self.timings = timings
         self.walker = None
 
     @cached_property
@@ -33,11 +51,57 @@ def trakt_lists(self):
     def pm(self):
         from .plugin import SyncPluginManager
 
-        pm = SyncPluginManager()
+        pm = SyncPluginManager(timings=self.timings)
         pm.register_plugins(self)
 
         return pm
 
+    @property
+    def trakt_preload(self):
+        """
+        Names of TraktApi properties needed by a full library walk
+        """
+        config = self.config
+        names = []
+        if config.plex_to_trakt["collection"]:
+            names += ["movie_collection_set", "collected_shows"]
+        if config.sync_watched_status:
+            names += ["watched_movies", "watched_shows"]
+        if config.sync_playback_status:
+            names += ["watch_progress"]
+
+        return names
+
+    @property
+    def plex_ratings_preload(self):
+        """
+        Sections and media types of Plex ratings needed by library walk of the sections in the plan
+        """
+        if not self.config.sync_ratings:
+            return []
+
+        media_types = {
+            "movie": ["movies"],
+            "show": ["shows", "episodes"],
+        }
+
+        return [(section, media_type) for section in self.walker.sections for media_type in media_types.get(section.type, [])]
+
+    async def preload(self):
+        """
+        Fetch Trakt and Plex data needed by full library walk concurrently
+        """
+        import asyncio
+
+        aio = self.trakt.aio
+        # Shared state of the requests is loaded before running them concurrently
+        await aio.prepare()
+        tasks = [aio.preload(self.trakt_preload)]
+        if self.config.sync_ratings:
+            tasks += [aio.ratings(media_type) for media_type in ["movies", "shows", "episodes"]]
+        tasks += [self.plex.aio.ratings(section, media_type) for section, media_type in self.plex_ratings_preload]
+        await asyncio.gather(*tasks)
+
     async def sync(self, walker: Walker, dry_run=False):
         self.walker = walker
         is_partial = walker.is_partial
@@ -45,11 +109,38 @@ async def sync(self, walker: Walker, dry_run=False):
         pm = self.pm
         pm.hook.init(sync=self, pm=pm, is_partial=is_partial, dry_run=dry_run)
 
+        if self.config.need_library_walk and not is_partial:
+            with measure_time("Preloaded Trakt and Plex data", level=logging.DEBUG):
+                await self.preload()
+
         if self.config.need_library_walk:
-            async for movie in walker.find_movies():
-                await pm.ahook.walk_movie(movie=movie, dry_run=dry_run)
+            diff = SyncDiff(self.config, self.trakt) if self.diff else None
+            window = SyncItemWindow(self.workers)
+            try:
+                async for movies in walker.batches(walker.find_movies(), self.BATCH_SIZE):
+                    if diff:
+                        diff.add_items(movies)
+                    await window.submit(partial(pm.walk_movies, movies, dry_run=dry_run))
 
-            async for episode in walker.find_episodes():
-                await pm.ahook.walk_episode(episode=episode, dry_run=dry_run)
+                async for episodes in walker.batches(walker.find_episodes(), self.BATCH_SIZE):
+                    if diff:
+                        diff.add_items(episodes)
+                    await window.submit(partial(pm.walk_episodes, episodes, dry_run=dry_run))
+
+                await window.drain()
+            finally:
+                window.close()
+                walker.close()
+
+            if diff:
+                await diff.plan().apply(self.plex.aio, diff.ratings, dry_run=dry_run)
 
         await pm.ahook.fini(walker=walker, dry_run=dry_run)
+        self.plex.flush_writes()
+
+        if self.config.need_library_walk and not dry_run:
+            # Items of the walk are walked again next time, unless their updates reached Trakt
+            if self.trakt.queue.flush():
+                walker.update_watermarks()
+            else:
+                self.logger.warning("Not all updates were sent to Trakt, not storing walk time of the sections")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from plextraktsync.pytrakt_extensions import CompactShowProgress
+from plextraktsync.sync.SyncPlan import SyncPlan
+
+if TYPE_CHECKING:
+    from plextraktsync.config.SyncConfig import SyncConfig
+    from plextraktsync.media.Media import Media
+    from plextraktsync.trakt.TraktApi import TraktApi
+
+
+class SyncDiff:
+    """
+    Two phase sync of watched status, collection and ratings.
+
+    Items found by the library walk are recorded by their Trakt keys:
+    trakt id for movies, packed (season, episode) keys per show for episodes.
+    After the walk, the differences to Trakt state are computed
+    with set operations per show, producing a SyncPlan.
+    """
+
+    # Plugins whose work is done by SyncDiff
+    PLUGINS = ["AddCollectionPlugin", "SyncRatingsPlugin", "SyncWatchedPlugin"]
+
+    def __init__(self, config: SyncConfig, trakt: TraktApi):
+        self.config = config
+        self.trakt = trakt
+        # trakt id => items
+        self.movies: dict[int, list[Media]] = {}
+        # show trakt id => packed episode key => items
+        self.episodes: dict[int, dict[int, list[Media]]] = {}
+        # show trakt id => show
+        self.shows: dict[int, Media] = {}
+
+    @cached_property
+    def ratings(self):
+        from plextraktsync.sync.SyncRatingsPlugin import SyncRatingsPlugin
+
+        return SyncRatingsPlugin(self.config)
+
+    def add_items(self, items: list[Media]):
+        for m in items:
+            self.add(m)
+
+    def add(self, m: Media):
+        if m.is_movie:
+            self.movies.setdefault(m.trakt_id, []).append(m)
+        elif m.is_episode:
+            show_id = m.show_trakt_id
+            key = CompactShowProgress.key(m.season_number, m.episode_number)
+            self.episodes.setdefault(show_id, {}).setdefault(key, []).append(m)
+            if m.show and show_id not in self.shows:
+                self.shows[show_id] = m.show
+
+    def plan(self) -> SyncPlan:
+        plan = SyncPlan()
+        if self.config.sync_watched_status:
+            self.diff_watched(plan)
+        if self.config.plex_to_trakt["collection"]:
+            self.diff_collection(plan)
+        if self.config.sync_ratings:
+            self.diff_ratings(plan)
+
+        return plan
+
+    def diff_watched(self, plan: SyncPlan):
+        trakt_watched = self.movies.keys() & self.trakt.watched_movies
+        self.diff_watched_items(plan, self.movies, trakt_watched)
+
+        watched_shows = self.trakt.watched_shows
+        for show_id, episodes in self.episodes.items():
+            progress = watched_shows.get(show_id)
+            trakt_watched = progress.completed_of(episodes) if progress else set()
+            self.diff_watched_items(plan, episodes, trakt_watched)
+
+    def diff_watched_items(self, plan: SyncPlan, items: dict[int, list[Media]], trakt_watched: set[int]):
+        plex_to_trakt = self.config.plex_to_trakt["watched_status"]
+        trakt_to_plex = self.config.trakt_to_plex["watched_status"]
+        reset_show = False
+
+        for key, media in items.items():
+            if key in trakt_watched:
+                if trakt_to_plex:
+                    plan.watched_plex.extend(m for m in media if not m.watched_on_plex)
+                continue
+
+            m = next((m for m in media if m.watched_on_plex), None)
+            if m is None or not plex_to_trakt:
+                continue
+
+            if m.is_episode and m.watched_before_reset:
+                # Items are episodes of one show, reset is done for the whole show
+                if not reset_show:
+                    reset_show = True
+                    plan.reset_shows.append(m)
+            else:
+                # Marking one of the duplicates is enough for Trakt
+                plan.watched_trakt.append(m)
+
+    def diff_collection(self, plan: SyncPlan):
+        missing = self.movies.keys() - self.trakt.movie_collection_set
+        plan.collection.extend(m for key in missing for m in self.movies[key])
+
+        collected_shows = self.trakt.collected_shows
+        for show_id, episodes in self.episodes.items():
+            progress = collected_shows.get(show_id)
+            collected = progress.collected_of(episodes) if progress else set()
+            plan.collection.extend(m for key in episodes.keys() - collected for m in episodes[key])
+
+    def diff_ratings(self, plan: SyncPlan):
+        items = [m for media in self.movies.values() for m in media]
+        items += [m for episodes in self.episodes.values() for media in episodes.values() for m in media]
+        items += self.shows.values()
+        for m in items:
+            rate = self.ratings.rate_target(m)
+            if rate is not None:
+                plan.ratings.append((m, rate))
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from threading import local
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+class SyncItemWindow:
+    """
+    Run walk hooks of up to "workers" items concurrently.
+
+    Hooks of one item are run in a single worker thread,
+    so plugins see the item in plugin order, as in sequential sync.
+    Blocking calls done by plugins (Plex updates) of different items overlap.
+    Results are awaited in the order the items were submitted,
+    so the first error stops the sync as it would without the window.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.pending = deque()
+        self.local = local()
+        # Event loops of worker threads, closed with the window
+        self.loops = []
+
+    @cached_property
+    def executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="SyncItem")
+
+    def run_coroutine(self, fn: Callable[[], Coroutine]):
+        # Each worker thread keeps its own event loop to run the hooks in
+        loop = getattr(self.local, "loop", None)
+        if loop is None:
+            loop = self.local.loop = asyncio.new_event_loop()
+            self.loops.append(loop)
+
+        return loop.run_until_complete(fn())
+
+    async def submit(self, fn: Callable[[], Coroutine]):
+        """
+        Queue fn() to be run, waiting for the oldest item when the window is full.
+        """
+        if self.workers <= 1:
+            return await fn()
+
+        loop = asyncio.get_running_loop()
+        self.pending.append(loop.run_in_executor(self.executor, self.run_coroutine, fn))
+        if len(self.pending) >= self.workers:
+            await self.pending.popleft()
+
+    async def drain(self):
+        """
+        Wait for all submitted items to complete.
+        """
+        while self.pending:
+            await self.pending.popleft()
+
+    def close(self):
+        """
+        Cancel items not yet started, used when sync is aborted.
+        Stop worker threads and close their event loops.
+        """
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        if "executor" in self.__dict__:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            del self.executor
+        for loop in self.loops:
+            loop.close()
+        self.loops.clear()
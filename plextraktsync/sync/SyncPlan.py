@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from plextraktsync.media.Media import Media
+    from plextraktsync.plex.AsyncPlexApi import AsyncPlexApi
+    from plextraktsync.sync.SyncRatingsPlugin import SyncRatingsPlugin
+
+
+class SyncPlan:
+    """
+    Changes computed by SyncDiff, applied after the library walk.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    # Number of Plex updates scheduled at once
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self.watched_trakt: list[Media] = []
+        self.watched_plex: list[Media] = []
+        self.reset_shows: list[Media] = []
+        self.collection: list[Media] = []
+        self.ratings: list[tuple[Media, str]] = []
+
+    def __len__(self):
+        return len(self.watched_trakt) + len(self.watched_plex) + len(self.reset_shows) + len(self.collection) + len(self.ratings)
+
+    def __str__(self):
+        return (
+            f"{len(self.watched_trakt)} watched on Trakt, "
+            f"{len(self.watched_plex)} watched on Plex, "
+            f"{len(self.reset_shows)} shows reset on Plex, "
+            f"{len(self.collection)} added to Trakt collection, "
+            f"{len(self.ratings)} ratings"
+        )
+
+    async def apply(self, aio: AsyncPlexApi, ratings: SyncRatingsPlugin, dry_run: bool):
+        self.logger.info(f"Sync plan: {self}")
+
+        # Trakt updates are queued to be sent in batches by the background queue
+        for m in self.watched_trakt:
+            self.logger.info(f"Marking as watched in Trakt: {m.title_link}", extra={"markup": True})
+            if not dry_run:
+                self.update_trakt(m, m.mark_watched_trakt)
+
+        for m in self.collection:
+            self.logger.info(f"Adding to Trakt collection: {m.title_link}", extra={"markup": True})
+            if not dry_run:
+                self.update_trakt(m, m.add_to_collection)
+
+        # Plex updates are requests of their own, run them concurrently
+        def reset_show(m: Media):
+            self.logger.info(f"Show '{m.plex.item.grandparentTitle}' has been reset in trakt at {m.show_reset_at}.")
+            self.logger.info(f"Marking '{m.plex.item.grandparentTitle}' as unwatched in Plex.")
+            if not dry_run:
+                m.reset_show()
+
+        def mark_watched_plex(m: Media):
+            self.logger.info(f"Marking as watched in Plex: {m.title_link}", extra={"markup": True})
+            if not dry_run:
+                m.mark_watched_plex()
+
+        await self.run_batched(aio, reset_show, self.reset_shows)
+        await self.run_batched(aio, mark_watched_plex, self.watched_plex)
+        await self.run_batched(aio, lambda item: ratings.rate(*item, dry_run=dry_run), self.ratings)
+
+    def update_trakt(self, m: Media, fn: Callable):
+        try:
+            fn()
+        except EpisodeNotFound as e:
+            self.logger.warning(f"{m.title_link}: Skipping: {e}", extra={"markup": True})
+
+    async def run_batched(self, aio: AsyncPlexApi, fn: Callable, items: list):
+        for i in range(0, len(items), self.BATCH_SIZE):
+            await asyncio.gather(*(aio.run(fn, item) for item in items[i : i + self.BATCH_SIZE]))
@@ -47,8 +47,16 @@ async def walk_episode(self, episode: Media, dry_run: bool):
             self.shows.add(episode.show)
 
     async def sync_ratings(self, m: Media, dry_run: bool):
+        rate = self.rate_target(m)
+        if rate is not None:
+            self.rate(m, rate, dry_run=dry_run)
+
+    def rate_target(self, m: Media):
+        """
+        Return where the rating of m needs to be updated: "trakt", "plex" or None
+        """
         if m.plex_rating == m.trakt_rating:
-            return
+            return None
 
         has_trakt = m.trakt_rating is not None
         has_plex = m.plex_rating is not None
@@ -75,6 +83,9 @@ async def sync_ratings(self, m: Media, dry_run: bool):
             elif self.trakt_to_plex and has_trakt:
                 rate = "plex"
 
+        return rate
+
+    def rate(self, m: Media, rate: str, dry_run: bool):
         if rate == "trakt":
             self.logger.info(
                 f"Rating {m.title_link} with {m.plex_rating} on Trakt (was {m.trakt_rating})",
@@ -61,9 +61,9 @@ async def fini(self, dry_run: bool):
                 )
 
     @hookimpl
-    async def walk_movie(self, movie: Media):
-        self.trakt_lists.add_to_lists(movie)
+    async def walk_movies_batch(self, movies: list[Media]):
+        self.trakt_lists.add_items_to_lists(movies)
 
     @hookimpl
-    async def walk_episode(self, episode: Media):
-        self.trakt_lists.add_to_lists(episode)
+    async def walk_episodes_batch(self, episodes: list[Media]):
+        self.trakt_lists.add_items_to_lists(episodes)
@@ -8,6 +8,7 @@
 from plextraktsync.plugin import hookimpl
 
 if TYPE_CHECKING:
+    from plextraktsync.plex.PlexApi import PlexApi
     from plextraktsync.trakt.TraktApi import TraktApi
 
     from .plugin.SyncPluginInterface import Sync, SyncConfig
@@ -16,7 +17,8 @@
 class WatchProgressPlugin:
     logger = logging.getLogger(__name__)
 
-    def __init__(self, trakt: TraktApi):
+    def __init__(self, plex: PlexApi, trakt: TraktApi):
+        self.plex = plex
         self.trakt = trakt
 
     @staticmethod
@@ -25,7 +27,7 @@ def enabled(config: SyncConfig):
 
     @classmethod
     def factory(cls, sync: Sync):
-        return cls(sync.trakt)
+        return cls(sync.plex, sync.trakt)
 
     @hookimpl
     async def walk_movie(self, movie: Media, dry_run: bool):
@@ -36,7 +38,8 @@ async def walk_episode(self, episode: Media, dry_run: bool):
         await self.sync_progress(episode, dry_run=dry_run)
 
     async def sync_progress(self, m: Media, dry_run=False):
-        p = self.trakt.watch_progress.match(m)
+        watch_progress = await self.trakt.aio.watch_progress()
+        p = watch_progress.match(m)
         if not p:
             return
         progress = m.plex.progress_millis(p.progress)
@@ -57,11 +60,11 @@ async def sync_progress(self, m: Media, dry_run=False):
                 extra={"markup": True},
             )
             if not dry_run:
-                m.plex.item.markWatched()
+                self.plex.mark_watched(m.plex.item)
         else:
             self.logger.info(
                 f"{m.title_link}: Set watch progress to {p.progress:.02F}%: {view_offset} -> {progress_offset}",
                 extra={"markup": True},
             )
             if not dry_run:
-                m.plex.item.updateProgress(progress)
+                self.plex.update_progress(m.plex.item, progress)
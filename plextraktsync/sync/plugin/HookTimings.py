@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import inspect
+from bisect import bisect_left
+from collections import defaultdict
+from functools import wraps
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import apluggy as pluggy
+
+    from plextraktsync.util.Tracer import Tracer
+
+
+class HookStats:
+    """
+    Call count, total and histogram of times of a hook, in fixed memory
+    """
+
+    # Upper bounds of histogram buckets, growing by 2^(1/8) (about 9%) from 1 microsecond to over an hour
+    BUCKETS = [1e-6 * 2 ** (i / 8) for i in range(256)]
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max = 0.0
+        self.counts = [0] * len(self.BUCKETS)
+
+    def add(self, seconds: float):
+        self.calls += 1
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+        self.counts[min(bisect_left(self.BUCKETS, seconds), len(self.BUCKETS) - 1)] += 1
+
+    def percentile(self, percent: int):
+        """
+        Return upper bound of the bucket holding the percentile, at most the max time
+        """
+        rank = max(1, -(-self.calls * percent // 100))
+        total = 0
+        for bound, count in zip(self.BUCKETS, self.counts, strict=True):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+
+class HookTimings:
+    """
+    Wall time and call counts of each hook of each sync plugin
+    """
+
+    PERCENTILES = (50, 95, 99)
+    # Hooks called per item, too many to trace each call
+    UNTRACED_HOOKS = ("walk_movie", "walk_episode")
+
+    def __init__(self, tracer: Tracer = None):
+        self.tracer = tracer
+        self.lock = Lock()
+        self.stats: dict[tuple[str, str], HookStats] = defaultdict(HookStats)
+
+    def instrument(self, pm: pluggy.PluginManager, plugin):
+        """
+        Wrap hook implementations of registered plugin to record their time
+        """
+        name = type(plugin).__name__
+        for caller in pm.get_hookcallers(plugin):
+            for impl in caller.get_hookimpls():
+                if impl.plugin is plugin:
+                    impl.function = self.wrap(impl.function, name, caller.name)
+
+    def wrap(self, fn: Callable, plugin: str, hook: str):
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def timed(*args, **kwargs):
+                start = monotonic()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.record(plugin, hook, monotonic() - start)
+
+        else:
+
+            @wraps(fn)
+            def timed(*args, **kwargs):
+                start = monotonic()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(plugin, hook, monotonic() - start)
+
+        return timed
+
+    def record(self, plugin: str, hook: str, seconds: float):
+        with self.lock:
+            self.stats[(plugin, hook)].add(seconds)
+        if self.tracer is not None and hook not in self.UNTRACED_HOOKS:
+            self.tracer.add(f"{plugin}.{hook}", perf_counter() - seconds, seconds, cat="plugin")
+
+    def serialize(self):
+        result = defaultdict(dict)
+        with self.lock:
+            for (plugin, hook), stats in self.stats.items():
+                result[plugin][hook] = {
+                    "calls": stats.calls,
+                    "seconds": stats.seconds,
+                    **{f"p{p}": stats.percentile(p) for p in self.PERCENTILES},
+                }
+
+        return dict(result)
+
+    def print(self, print: Callable[[str], None]):
+        rows = [(plugin, hook, stats) for plugin, hooks in self.serialize().items() for hook, stats in hooks.items()]
+        for plugin, hook, stats in sorted(rows, key=lambda row: row[2]["seconds"], reverse=True):
+            percentiles = ", ".join(f"p{p} {stats[f'p{p}'] * 1000:.1f}ms" for p in self.PERCENTILES)
+            print(f"  {plugin}.{hook}: {stats['calls']} calls in {stats['seconds']:.2f}s ({percentiles})")
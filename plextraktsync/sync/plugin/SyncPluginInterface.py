@@ -30,3 +30,13 @@ async def walk_movie(self, movie: Media, dry_run: bool):
     @hookspec
     async def walk_episode(self, episode: Media, dry_run: bool):
         """Hook called walk a episode media object"""
+
+    @hookspec
+    async def walk_movies_batch(self, movies: list[Media], dry_run: bool):
+        """Hook called to walk a batch of movie media objects.
+        Plugins implementing it don't get walk_movie calls."""
+
+    @hookspec
+    async def walk_episodes_batch(self, episodes: list[Media], dry_run: bool):
+        """Hook called to walk a batch of episode media objects.
+        Plugins implementing it don't get walk_episode calls."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from functools import cached_property
 from typing import TYPE_CHECKING
 
@@ -7,14 +8,20 @@
 
 from plextraktsync.decorators.measure_time import measure_time
 from plextraktsync.factory import logging
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound
 
 if TYPE_CHECKING:
+    from plextraktsync.media.Media import Media
+    from plextraktsync.sync.plugin.HookTimings import HookTimings
     from plextraktsync.sync.Sync import Sync
 
 
 class SyncPluginManager:
     logger = logging.getLogger(__name__)
 
+    def __init__(self, timings: HookTimings = None):
+        self.timings = timings
+
     @cached_property
     def pm(self):
         from .SyncPluginInterface import SyncPluginInterface
@@ -56,13 +63,42 @@ def plugins(self):
         yield WatchListPlugin
         yield WatchProgressPlugin
 
+    async def walk_movies(self, movies: list[Media], dry_run: bool):
+        await self.walk_batch("movie", movies, dry_run=dry_run)
+
+    async def walk_episodes(self, episodes: list[Media], dry_run: bool):
+        await self.walk_batch("episode", episodes, dry_run=dry_run)
+
+    async def walk_batch(self, name: str, items: list[Media], dry_run: bool):
+        """
+        Call walk_<name>s_batch hook with all items,
+        and walk_<name> hook per item for plugins not implementing the batch hook.
+        """
+        batch_hook = getattr(self.hook, f"walk_{name}s_batch")
+        await asyncio.gather(*batch_hook(**{f"{name}s": items}, dry_run=dry_run))
+
+        batch_plugins = [impl.plugin for impl in batch_hook.get_hookimpls()]
+        item_hook = self.pm.subset_hook_caller(f"walk_{name}", remove_plugins=batch_plugins)
+        for m in items:
+            try:
+                await asyncio.gather(*item_hook(**{name: m}, dry_run=dry_run))
+            except EpisodeNotFound as e:
+                self.logger.warning(f"{m.title_link}: Skipping: {e}", extra={"markup": True})
+
     def register_plugins(self, sync: Sync):
+        from ..SyncDiff import SyncDiff
+
         for plugin in self.plugins:
             enabled = plugin.enabled(sync.config)
             if not enabled:
                 continue
+            if sync.diff and plugin.__name__ in SyncDiff.PLUGINS:
+                self.logger.info(f"Sync plugin '{plugin.__name__}' replaced by sync diff")
+                continue
             self.logger.info(f"Enable sync plugin '{plugin.__name__}'")
             with measure_time(f"Created '{plugin.__name__}' plugin", logger=self.logger.debug):
                 p = plugin.factory(sync)
             with measure_time(f"Registered '{plugin.__name__}' plugin", logger=self.logger.debug):
                 self.pm.register(p)
+            if self.timings is not None:
+                self.timings.instrument(self.pm, p)
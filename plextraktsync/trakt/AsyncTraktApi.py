@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import datetime
+    from collections.abc import Callable
+
+    from plextraktsync.plex.guid.PlexGuid import PlexGuid
+    from plextraktsync.plex.PlexLibraryItem import PlexLibraryItem
+    from plextraktsync.trakt.TraktApi import TraktApi
+    from plextraktsync.trakt.types import TraktMedia
+
+
+class AsyncTraktApi:
+    """
+    Awaitable variants of TraktApi methods.
+
+    Trakt requests are made with blocking pytrakt calls,
+    these are run in a thread pool, so that the event loop can overlap them.
+    The calls go through the same TraktApi methods,
+    so their rate limit, time limit and retry decorators apply unchanged.
+
+    Updates are added to the background queue like with TraktApi,
+    awaiting them keeps the event loop running while the queue is full.
+    """
+
+    def __init__(self, trakt: TraktApi, workers: int = 4):
+        self.trakt = trakt
+        self.workers = workers
+
+    @cached_property
+    def executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="TraktApi")
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def get(self, name: str):
+        """
+        Return value of TraktApi property, fetching it if needed
+        """
+        return await self.run(getattr, self.trakt, name)
+
+    async def prepare(self):
+        """
+        Load TraktApi properties shared by other requests,
+        so that concurrent requests don't initialize them more than once
+        """
+        for name in ["me", "snapshot", "ratings"]:
+            await self.get(name)
+
+    async def preload(self, names: list[str]):
+        """
+        Fetch TraktApi properties concurrently
+        """
+        await self.prepare()
+        await asyncio.gather(*(self.get(name) for name in names))
+
+    async def me(self):
+        return await self.get("me")
+
+    async def movie_collection(self):
+        return await self.get("movie_collection")
+
+    async def movie_collection_set(self):
+        return await self.get("movie_collection_set")
+
+    async def episodes_collection(self):
+        return await self.get("episodes_collection")
+
+    async def collected_shows(self):
+        return await self.get("collected_shows")
+
+    async def watched_movies(self):
+        return await self.get("watched_movies")
+
+    async def watched_shows(self):
+        return await self.get("watched_shows")
+
+    async def watch_progress(self):
+        return await self.get("watch_progress")
+
+    async def ratings(self, media_type: str):
+        return await self.run(self.trakt.ratings.__getitem__, media_type)
+
+    async def get_ratings(self, media_type: str):
+        return await self.run(self.trakt.get_ratings, media_type)
+
+    async def search_by_id(self, media_id: str, id_type: str, media_type: str):
+        return await self.run(self.trakt.search_by_id, media_id, id_type, media_type)
+
+    async def find_by_guid(self, guid: PlexGuid):
+        return await self.run(self.trakt.find_by_guid, guid)
+
+    async def rate(self, m: TraktMedia, rating: int, rate_date: datetime.datetime | str = None):
+        return await self.run(self.trakt.rate, m, rating, rate_date)
+
+    async def add_to_collection(self, m: TraktMedia, pm: PlexLibraryItem):
+        return await self.run(self.trakt.add_to_collection, m, pm)
+
+    async def remove_from_collection(self, m: TraktMedia):
+        return await self.run(self.trakt.remove_from_collection, m)
+
+    async def mark_watched(self, m: TraktMedia, time: datetime.datetime, show_trakt_id=None):
+        return await self.run(self.trakt.mark_watched, m, time, show_trakt_id)
+
+    async def add_to_watchlist(self, m: TraktMedia):
+        return await self.run(self.trakt.add_to_watchlist, m)
+
+    async def remove_from_watchlist(self, m: TraktMedia):
+        return await self.run(self.trakt.remove_from_watchlist, m)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from trakt.tv import TVEpisode
+
+    from plextraktsync.plex.guid.PlexGuid import PlexGuid
+    from plextraktsync.trakt.TraktApi import TraktApi
+    from plextraktsync.trakt.TraktLookup import TraktLookup
+
+
+class EpisodeNotFound(LookupError):
+    pass
+
+
+class LazyTraktEpisode:
+    """
+    Trakt episode identified by trakt id of the show and season, episode numbers of Plex episode.
+
+    These are enough to check watched and collected status of the episode.
+    The episode is found from the season table of the show (TraktLookup)
+    only when other properties, like the episode ids, are accessed.
+    """
+
+    media_type = "episodes"
+
+    def __init__(self, guid: PlexGuid, lookup: TraktLookup, trakt: TraktApi):
+        self.guid = guid
+        self.lookup = lookup
+        self.trakt_api = trakt
+        self.show = lookup.tm.title
+        self.show_id = lookup.tm.trakt
+        self.season = guid.pm.season_number
+        self.number = guid.pm.episode_number
+        self._episode = None
+
+    def __str__(self):
+        return f"<LazyTraktEpisode>: {self.show} S{self.season:02}E{self.number:02}"
+
+    @property
+    def is_resolved(self):
+        return self._episode is not None
+
+    @property
+    def episode(self) -> TVEpisode:
+        if self._episode is None:
+            te = self.trakt_api.find_episode_guid(self.guid, self.lookup)
+            if te is None:
+                raise EpisodeNotFound(f"{self.guid} episode not found on Trakt")
+            self._episode = te
+
+        return self._episode
+
+    def __getattr__(self, name):
+        # Avoid resolving for private and special attributes (copy, pickle)
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.episode, name)
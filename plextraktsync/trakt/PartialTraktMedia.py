@@ -14,6 +14,8 @@ class PartialTraktMedia:
     ids: Any
     media_type: str
     watched_at: str = None
+    rating: int = None
+    rated_at: str = None
 
     @classmethod
     def create(cls, m: TraktMedia, **extra):
@@ -9,21 +9,28 @@
 import trakt.sync
 import trakt.users
 from click import ClickException
+from requests import RequestException
 from trakt.errors import (
     ForbiddenException,
     NotFoundException,
     OAuthException,
     OAuthRefreshException,
+    TraktException,
 )
+from trakt.utils import timestamp
 
 from plextraktsync import pytrakt_extensions
 from plextraktsync.decorators.flatten import flatten_list
 from plextraktsync.decorators.rate_limit import rate_limit
 from plextraktsync.decorators.retry import retry
 from plextraktsync.decorators.time_limit import time_limit
+from plextraktsync.decorators.trakt_id_index import trakt_id_index
+from plextraktsync.decorators.trakt_snapshot import trakt_snapshot
 from plextraktsync.factory import factory, logging
 from plextraktsync.path import pytrakt_file
+from plextraktsync.trakt.LazyTraktEpisode import LazyTraktEpisode
 from plextraktsync.trakt.PartialTraktMedia import PartialTraktMedia
+from plextraktsync.trakt.TraktIdIndex import TraktIdIndex
 from plextraktsync.trakt.TraktItem import TraktItem
 from plextraktsync.trakt.TraktLookup import TraktLookup
 from plextraktsync.trakt.TraktRatingCollection import TraktRatingCollection
@@ -36,6 +43,10 @@
 
     from plextraktsync.plex.guid.PlexGuid import PlexGuid
     from plextraktsync.plex.PlexLibraryItem import PlexLibraryItem
+    from plextraktsync.trakt.AsyncTraktApi import AsyncTraktApi
+    from plextraktsync.trakt.TraktEpisodeMap import TraktEpisodeMap
+    from plextraktsync.trakt.TraktResolveIndex import TraktResolveIndex
+    from plextraktsync.trakt.TraktStateSnapshot import TraktStateSnapshot
     from plextraktsync.trakt.types import TraktLikedList, TraktMedia
 
 
@@ -46,9 +57,12 @@ class TraktApi:
 
     logger = logging.getLogger(__name__)
 
-    def __init__(self):
+    def __init__(self, snapshot_dir: str = None, resolve_index: TraktResolveIndex = None, episode_map_file: str = None):
         trakt.core.CONFIG_PATH = pytrakt_file
         trakt.core.session = factory.session
+        self.snapshot_dir = snapshot_dir
+        self.resolve_index = resolve_index
+        self.episode_map_file = episode_map_file
 
     @staticmethod
     def device_auth(client_id: str, client_secret: str):
@@ -93,22 +107,80 @@ def get_personal_list(username: str, listname: str):
     @cached_property
     @rate_limit()
     @retry()
+    def last_activities(self):
+        return pytrakt_extensions.last_activities()
+
+    @cached_property
+    def snapshot(self) -> TraktStateSnapshot | None:
+        if not self.snapshot_dir:
+            return None
+
+        from os.path import join
+
+        from plextraktsync.trakt.TraktStateSnapshot import TraktStateSnapshot
+
+        return TraktStateSnapshot(join(self.snapshot_dir, self.me.username), self.last_activities)
+
+    @cached_property
+    def aio(self) -> AsyncTraktApi:
+        from plextraktsync.trakt.AsyncTraktApi import AsyncTraktApi
+
+        return AsyncTraktApi(self, workers=factory.config["performance"]["trakt_workers"])
+
+    @cached_property
+    def episode_map(self) -> TraktEpisodeMap | None:
+        if not self.episode_map_file:
+            return None
+
+        from plextraktsync.trakt.TraktEpisodeMap import TraktEpisodeMap
+
+        episode_map = TraktEpisodeMap(self.episode_map_file, factory.session.cache)
+        try:
+            episode_map.refresh(self.updated_show_ids)
+        except (TraktException, RequestException) as e:
+            self.logger.warning(f"Unable to check updated Trakt shows, not using stored show episodes: {e}")
+            return None
+
+        return episode_map
+
+    @rate_limit()
+    @retry()
+    def updated_show_ids(self, since: datetime.datetime) -> list[int]:
+        return pytrakt_extensions.updated_show_ids(since.strftime("%Y-%m-%dT%H:00:00Z"))
+
+    @cached_property
+    def id_index(self):
+        return TraktIdIndex()
+
+    @cached_property
     def watched_movies(self):
-        return set(map(lambda m: m.trakt, self.me.watched_movies))
+        return set(map(lambda m: m.trakt, self.get_watched_movies()))
+
+    @trakt_id_index
+    @trakt_snapshot(activities="movies.watched_at")
+    @rate_limit()
+    @retry()
+    def get_watched_movies(self):
+        return self.me.watched_movies
 
     @cached_property
+    @trakt_snapshot(activities="movies.paused_at,episodes.paused_at")
     @rate_limit()
     @retry()
     def watch_progress(self):
         return WatchProgress(trakt.sync.get_playback())
 
     @cached_property
+    @trakt_id_index
+    @trakt_snapshot(activities="movies.collected_at")
     @rate_limit()
     @retry()
     def movie_collection(self):
         return self.me.movie_collection
 
     @cached_property
+    @trakt_id_index
+    @trakt_snapshot(activities="episodes.collected_at")
     @rate_limit()
     @retry()
     def show_collection(self):
@@ -138,24 +210,28 @@ def movie_collection_set(self):
         return set(map(lambda m: m.trakt, self.movie_collection))
 
     @cached_property
+    @trakt_snapshot(activities="episodes.watched_at,shows.hidden_at")
     @rate_limit()
     @retry()
     def watched_shows(self):
         return pytrakt_extensions.allwatched()
 
     @cached_property
+    @trakt_snapshot(activities="episodes.collected_at")
     @rate_limit()
     @retry()
     def collected_shows(self):
         return pytrakt_extensions.allcollected()
 
     @property
+    @trakt_id_index
     @rate_limit()
     @retry()
     def watchlist_movies(self):
         return self.me.watchlist_movies
 
     @property
+    @trakt_id_index
     @rate_limit()
     @retry()
     def watchlist_shows(self):
@@ -175,8 +251,13 @@ def rating(self, m) -> Rating | None:
         if m.media_type not in ["movies", "shows", "episodes"]:
             raise ValueError(f"rating: Unsupported media type: {m.media_type} for '{m.title}'")
 
+        if isinstance(m, LazyTraktEpisode) and not m.is_resolved:
+            return self.ratings.episode_by_number(m.show_id, m.season, m.number)
+
         return self.ratings[m.media_type].get(m.trakt, None)
 
+    @trakt_id_index
+    @trakt_snapshot(activities="{0}.rated_at")
     @rate_limit()
     @retry()
     def get_ratings(self, media_type: str):
@@ -185,11 +266,15 @@ def get_ratings(self, media_type: str):
         except NotFoundException as e:
             raise ClickException(f"Unable to fetch ratings: {e}")
 
-    @rate_limit()
-    @time_limit()
-    @retry()
-    def rate(self, m: TraktMedia, rating: int, rate_date: datetime.datetime = None):
-        m.rate(rating, rate_date)
+    def rate(self, m: TraktMedia, rating: int, rate_date: datetime.datetime | str = None):
+        if rate_date is None:
+            rate_date = datetime.datetime.now(tz=datetime.timezone.utc)
+        if isinstance(rate_date, datetime.datetime):
+            rate_date = timestamp(rate_date)
+
+        # Add a partial object to conserve memory
+        partial = PartialTraktMedia.create(m, rating=rating, rated_at=rate_date)
+        self.queue.add_to_ratings(partial)
 
     @rate_limit()
     @time_limit()
@@ -250,7 +335,7 @@ def find_by_episode_guid(self, guid: PlexGuid):
         if not ts:
             return None
 
-        lookup = TraktLookup(ts)
+        lookup = TraktLookup(ts, self.episode_map)
         te = self.find_episode_guid(guid, lookup)
         if not te:
             return None
@@ -310,6 +395,19 @@ def search_by_id(self, media_id: str, id_type: str, media_type: str) -> TVShow |
 
             return None
 
+        if self.resolve_index is None:
+            return self.search_trakt_by_id(media_id, id_type, media_type)
+
+        found, m = self.resolve_index.get(id_type, media_id, media_type)
+        if found:
+            return m
+
+        m = self.search_trakt_by_id(media_id, id_type, media_type)
+        self.resolve_index.set(id_type, media_id, media_type, m)
+
+        return m
+
+    def search_trakt_by_id(self, media_id: str, id_type: str, media_type: str) -> TVShow | Movie | None:
         search = trakt.sync.search_by_id(media_id, id_type=id_type, media_type=media_type)
         if not search:
             return None
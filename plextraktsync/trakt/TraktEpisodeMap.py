@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from requests_cache import BaseCache
+    from trakt.tv import TVEpisode, TVShow
+
+
+class TraktEpisodeMap:
+    """
+    Persistent store of episodes of Trakt shows:
+    show trakt id => [(season, number, title, trakt, tvdb, tmdb, imdb), ...]
+
+    Shows are invalidated when Trakt reports them updated:
+    - https://trakt.docs.apiary.io/#reference/shows/updated-ids/get-recently-updated-show-trakt-ids
+
+    Cached http responses of show seasons are expired before storing a show,
+    otherwise a stale response would be stored again after the show was invalidated.
+    """
+
+    # Increase when the format of stored data changes
+    VERSION = 1
+
+    # Trakt allows to query updates up to 30 days back
+    MAX_UPDATES_AGE = timedelta(days=30)
+
+    PROVIDERS = ["trakt", "tvdb", "tmdb", "imdb"]
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, path: str, http_cache: BaseCache = None):
+        self.path = path
+        self.http_cache = http_cache
+        self.lock = Lock()
+        self._db = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = self.connect()
+
+        return self._db
+
+    def connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.VERSION:
+            db.execute("DROP TABLE IF EXISTS show_episodes")
+            db.execute("DROP TABLE IF EXISTS meta")
+            db.execute(f"PRAGMA user_version = {self.VERSION:d}")
+        db.execute("CREATE TABLE IF NOT EXISTS show_episodes (show_id INTEGER PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        db.commit()
+
+        return db
+
+    def close(self):
+        with self.lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @property
+    def checked_at(self) -> datetime | None:
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE name='checked_at'").fetchone()
+        if row is None:
+            return None
+
+        return datetime.fromisoformat(row[0])
+
+    @checked_at.setter
+    def checked_at(self, value: datetime):
+        with self.lock:
+            self.db.execute("REPLACE INTO meta (name, value) VALUES ('checked_at', ?)", (value.isoformat(),))
+            self.db.commit()
+
+    def refresh(self, updated_since: Callable[[datetime], list[int]]):
+        """
+        Invalidate shows updated in Trakt since the previous refresh.
+        """
+        now = datetime.now(timezone.utc)
+        checked_at = self.checked_at
+        if checked_at is None or now - checked_at > self.MAX_UPDATES_AGE:
+            count = self.clear()
+        else:
+            # Trakt start_date is accurate to the hour
+            count = self.invalidate(updated_since(checked_at - timedelta(hours=1)))
+        self.checked_at = now
+        self.logger.debug(f"Invalidated {count} shows in Trakt episode map")
+
+    def get(self, tm: TVShow) -> dict[int, dict[int, TVEpisode]] | None:
+        """
+        Return table of episodes accessible via table[season][episode]
+        """
+        if tm.trakt is None:
+            return None
+
+        with self.lock:
+            row = self.db.execute("SELECT data FROM show_episodes WHERE show_id=?", (tm.trakt,)).fetchone()
+        if row is None:
+            return None
+
+        return self.build(tm, json.loads(row[0]))
+
+    def expire(self, tm: TVShow):
+        """
+        Expire cached http response of show seasons, so they are fetched fresh from Trakt
+        """
+        if self.http_cache is None or tm.trakt is None:
+            return
+
+        from trakt.core import BASE_URL
+
+        self.http_cache.delete(urls=[f"{BASE_URL}shows/{tm.trakt}/seasons?extended=episodes"])
+
+    def set(self, tm: TVShow, table: dict[int, dict[int, TVEpisode]]):
+        if tm.trakt is None:
+            return
+
+        data = json.dumps(self.serialize(table), separators=(",", ":"))
+        with self.lock:
+            self.db.execute(
+                "REPLACE INTO show_episodes (show_id, data, updated_at) VALUES (?, ?, ?)",
+                (tm.trakt, data, time()),
+            )
+            self.db.commit()
+
+    def invalidate(self, show_ids: list[int]):
+        with self.lock:
+            count = self.db.executemany("DELETE FROM show_episodes WHERE show_id=?", ((show_id,) for show_id in show_ids)).rowcount
+            self.db.commit()
+
+        return count
+
+    def clear(self):
+        with self.lock:
+            count = self.db.execute("DELETE FROM show_episodes").rowcount
+            self.db.commit()
+
+        return count
+
+    @classmethod
+    def serialize(cls, table: dict[int, dict[int, TVEpisode]]):
+        return [
+            [season, number, te.title, *(getattr(te, provider, None) for provider in cls.PROVIDERS)]
+            for season, episodes in table.items()
+            for number, te in episodes.items()
+        ]
+
+    @classmethod
+    def build(cls, tm: TVShow, rows: list[list]):
+        from trakt.tv import TVEpisode
+
+        table = {}
+        for season, number, title, *ids in rows:
+            ids = {provider: id for provider, id in zip(cls.PROVIDERS, ids, strict=True) if id is not None}
+            table.setdefault(season, {})[number] = TVEpisode(tm.title, season, number, title=title, ids=ids)
+
+        return table
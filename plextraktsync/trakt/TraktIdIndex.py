@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from trakt.users import ListEntry
+
+from plextraktsync.trakt.TraktResolveIndex import TraktResolveIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from plextraktsync.plex.guid.PlexGuid import PlexGuid
+
+
+class TraktIdIndex:
+    """
+    In-memory reverse index of external ids of Trakt items seen in downloaded Trakt data
+    (collection, watched, ratings, watchlist, lists).
+
+    Maps (provider, id, media_type) to the item in the format of Trakt search result,
+    so guids of these items can be resolved without searching Trakt.
+    """
+
+    PROVIDERS = ["imdb", "tmdb", "tvdb"]
+
+    def __init__(self):
+        self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, provider: str, id: str, media_type: str):
+        data = self.index.get((provider, str(id), media_type))
+        if data is None:
+            return None
+
+        return TraktResolveIndex.build(data)
+
+    def find_by_guid(self, guid: PlexGuid):
+        if guid.is_episode:
+            return None
+
+        return self.get(guid.provider, guid.id, guid.type)
+
+    def add_items(self, items: Iterable):
+        """
+        Add Trakt media objects, ListEntry objects or raw api items
+        with "movie", "show" or "episode" keys.
+        """
+        for item in items:
+            if isinstance(item, dict):
+                self.add_data(item)
+            elif isinstance(item, ListEntry):
+                self.add_list_entry(item)
+            elif getattr(item, "media_type", None) in ["movies", "shows", "episodes"]:
+                self.add_data(TraktResolveIndex.serialize(item))
+
+        return items
+
+    def add_list_entry(self, le: ListEntry):
+        if le.type in ["movie", "show"]:
+            self.add_data({le.type: le.data})
+        elif le.type == "episode":
+            data = le.data.copy()
+            show = data.pop("show")
+            self.add_data({"show": show, "episode": data})
+
+    def add_data(self, data: dict):
+        if "movie" in data:
+            self.add("movie", data["movie"]["ids"], {"movie": data["movie"]})
+        if "show" in data:
+            self.add("show", data["show"]["ids"], {"show": data["show"]})
+        if "episode" in data and "show" in data:
+            self.add("episode", data["episode"]["ids"], {"show": data["show"], "episode": data["episode"]})
+
+    def add(self, media_type: str, ids: dict, data: dict):
+        for provider in self.PROVIDERS:
+            id = ids.get(provider)
+            if id is not None:
+                self.index[(provider, str(id), media_type)] = data
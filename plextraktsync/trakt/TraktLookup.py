@@ -12,6 +12,7 @@
     from trakt.tv import TVEpisode, TVShow
 
     from plextraktsync.plex.guid.PlexGuid import PlexGuid
+    from plextraktsync.trakt.TraktEpisodeMap import TraktEpisodeMap
 
 
 class TraktLookup:
@@ -21,11 +22,22 @@ class TraktLookup:
 
     logger = logging.getLogger(__name__)
 
-    def __init__(self, tm: TVShow):
+    def __init__(self, tm: TVShow, episode_map: TraktEpisodeMap = None):
         self.provider_table = {}
         self.tm = tm
+        self.episode_map = episode_map
         self.same_order = True
 
+    @property
+    def is_loaded(self):
+        return "table" in self.__dict__
+
+    def load(self):
+        """
+        Fetch the lookup table now, instead of on first lookup
+        """
+        return self.table
+
     @cached_property
     @retry()
     def table(self):
@@ -35,12 +47,22 @@ def table(self):
         - https://github.com/moogar0880/PyTrakt/pull/185
         """
 
+        if self.episode_map is not None:
+            seasons = self.episode_map.get(self.tm)
+            if seasons is not None:
+                return seasons
+            self.episode_map.expire(self.tm)
+
         seasons = {}
         for season in self.tm.seasons:
             episodes = {}
             for episode in season.episodes:
                 episodes[episode.number] = episode
             seasons[season.season] = episodes
+
+        if self.episode_map is not None:
+            self.episode_map.set(self.tm, seasons)
+
         return seasons
 
     def _reverse_lookup(self, provider):
@@ -52,7 +74,7 @@ def _reverse_lookup(self, provider):
         table = {}
         for season in self.table:
             for te in self.table[season].values():
-                table[str(te.ids.get(provider))] = te
+                table[str(getattr(te, provider, None))] = te
         self.provider_table[provider] = table
         self.logger.debug(f"{self.tm.title}: lookup table build with '{provider}' ids")
 
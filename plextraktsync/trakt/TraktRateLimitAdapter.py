@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from requests import PreparedRequest
+
+    from plextraktsync.trakt.TraktRateLimiter import TraktRateLimiter
+
+
+class TraktRateLimitAdapter(HTTPAdapter):
+    """
+    Transport adapter passing requests through the rate limiter.
+
+    Responses served from the requests cache don't reach the adapter,
+    so they don't use the budget.
+    """
+
+    def __init__(self, limiter: TraktRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request: PreparedRequest, **kwargs):
+        self.limiter.acquire(request.method, request.url)
+        response = super().send(request, **kwargs)
+        self.limiter.update(request.method, response)
+
+        return response
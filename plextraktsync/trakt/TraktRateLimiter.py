@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from plextraktsync.config import TRAKT_POST_DELAY, TRAKT_RETRY_AFTER_MARGIN
+from plextraktsync.factory import logging
+from plextraktsync.util.PriorityLock import PriorityLock
+from plextraktsync.util.TokenBucket import TokenBucket
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class TraktRateLimiter:
+    """
+    Rate limiter shared by all requests made to Trakt API.
+
+    GET and POST (also PUT, DELETE) requests have separate budgets.
+    Scrobbles share the POST budget, but they are served before waiting bulk updates.
+    The budgets are adjusted from X-Ratelimit and Retry-After response headers:
+    - https://trakt.docs.apiary.io/#introduction/rate-limiting
+    """
+
+    # AUTHED_API_GET_LIMIT
+    GET_LIMIT = (1000, 300)
+    # AUTHED_API_POST_LIMIT, with a margin for network jitter
+    POST_LIMIT = (1, TRAKT_POST_DELAY)
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, get_limit: tuple[int, float] = None, post_limit: tuple[int, float] = None, **kwargs):
+        self.buckets = {
+            "GET": TokenBucket(*(get_limit or self.GET_LIMIT), **kwargs),
+            "POST": TokenBucket(*(post_limit or self.POST_LIMIT), **kwargs),
+        }
+        self.post_lock = PriorityLock()
+
+    def bucket(self, method: str) -> TokenBucket:
+        if method.upper() in ("GET", "HEAD", "OPTIONS"):
+            return self.buckets["GET"]
+
+        return self.buckets["POST"]
+
+    def acquire(self, method: str, url: str = ""):
+        bucket = self.bucket(method)
+        if bucket is self.buckets["GET"]:
+            wait = bucket.acquire()
+        else:
+            with self.post_lock(priority="/scrobble/" in url):
+                wait = bucket.acquire()
+        if wait:
+            self.logger.debug(f"Throttled {method} request for {wait:.3f} seconds")
+
+        return wait
+
+    def update(self, method: str, response: Response):
+        """
+        Update budget of the request from response headers
+        """
+        bucket = self.bucket(method)
+        limits = self.parse_header(response.headers.get("X-Ratelimit"))
+        if limits:
+            bucket.update(limit=limits.get("limit"), period=limits.get("period"), remaining=limits.get("remaining"))
+            if limits.get("remaining") == 0 and limits.get("until"):
+                bucket.block(self.seconds_until(limits["until"]))
+
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After", 1))
+            self.logger.debug(f"Trakt rate limit exceeded for {method} requests, waiting {retry_after} seconds")
+            bucket.block(retry_after + TRAKT_RETRY_AFTER_MARGIN)
+
+    @property
+    def throttled_time(self):
+        return sum(bucket.throttled_time for bucket in self.buckets.values())
+
+    @property
+    def stats(self):
+        return {
+            name: {
+                "throttled_time": bucket.throttled_time,
+                "throttled_count": bucket.throttled_count,
+            }
+            for name, bucket in self.buckets.items()
+        }
+
+    @staticmethod
+    def parse_header(value: str | None) -> dict | None:
+        if not value:
+            return None
+        try:
+            limits = json.loads(value)
+        except ValueError:
+            return None
+
+        return limits if isinstance(limits, dict) else None
+
+    @staticmethod
+    def seconds_until(until: str):
+        try:
+            until = datetime.fromisoformat(until.replace("Z", "+00:00"))
+        except ValueError:
+            return 0.0
+
+        return max(0.0, (until - datetime.now(timezone.utc)).total_seconds())
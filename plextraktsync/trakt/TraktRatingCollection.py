@@ -20,6 +20,8 @@ class TraktRatingCollection(dict):
     def __init__(self, trakt: TraktApi):
         super().__init__()
         self.trakt = trakt
+        # (show trakt_id, season, number) => rating
+        self.episode_numbers = {}
 
     def __missing__(self, media_type: str):
         self[media_type] = ratings = self.ratings(media_type)
@@ -30,4 +32,14 @@ def __missing__(self, media_type: str):
     def ratings(self, media_type: str):
         index = media_type.rstrip("s")
         for r in self.trakt.get_ratings(media_type):
-            yield r[index]["ids"]["trakt"], Rating.create(r["rating"], r["rated_at"])
+            rating = Rating.create(r["rating"], r["rated_at"])
+            if index == "episode":
+                episode = r["episode"]
+                self.episode_numbers[(r["show"]["ids"]["trakt"], episode["season"], episode["number"])] = rating
+            yield r[index]["ids"]["trakt"], rating
+
+    def episode_by_number(self, show_id: int, season: int, number: int):
+        if "episodes" not in self:
+            self.__missing__("episodes")
+
+        return self.episode_numbers.get((show_id, season, number))
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import timedelta
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from trakt.movies import Movie
+    from trakt.tv import TVEpisode, TVShow
+
+
+class TraktResolveIndex:
+    """
+    Persistent index of Trakt "search/{provider}/{id}?type={media_type}" results.
+
+    Found items are stored with their Trakt ids and reused for "ttl",
+    guids not found in Trakt are stored as unmatched and reused for "negative_ttl".
+    Results are also memoized in memory for the duration of the run.
+
+    - https://trakt.docs.apiary.io/#reference/search/id-lookup/get-id-lookup-results
+    """
+
+    # Increase when the format of stored data changes
+    VERSION = 1
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, path: str, ttl: timedelta, negative_ttl: timedelta):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memo = {}
+        self.lock = Lock()
+        self._db = None
+        # Lookups found and not found from the index
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = self.connect()
+
+        return self._db
+
+    def connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.VERSION:
+            db.execute("DROP TABLE IF EXISTS resolve_index")
+            db.execute(f"PRAGMA user_version = {self.VERSION:d}")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS resolve_index ("
+            " provider TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " media_type TEXT NOT NULL,"
+            " data TEXT,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (provider, id, media_type)"
+            ")"
+        )
+        db.commit()
+
+        return db
+
+    def close(self):
+        with self.lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get(self, provider: str, id: str, media_type: str):
+        """
+        Return tuple (found, item), item is None for guids not found in Trakt.
+        """
+        found, item = self.lookup(provider, id, media_type)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return found, item
+
+    def lookup(self, provider: str, id: str, media_type: str):
+        key = (provider, str(id), media_type)
+        if key in self.memo:
+            return True, self.memo[key]
+
+        with self.lock:
+            row = self.db.execute(
+                "SELECT data, updated_at FROM resolve_index WHERE provider=? AND id=? AND media_type=?",
+                key,
+            ).fetchone()
+        if row is None:
+            return False, None
+
+        data, updated_at = row
+        ttl = self.ttl if data is not None else self.negative_ttl
+        if updated_at + ttl.total_seconds() < time():
+            return False, None
+
+        try:
+            item = self.build(json.loads(data)) if data is not None else None
+        except Exception as e:
+            self.logger.debug(f"Unable to build {provider}/{media_type}/{id} from resolve index: {e}")
+            return False, None
+
+        self.memo[key] = item
+
+        return True, item
+
+    def set(self, provider: str, id: str, media_type: str, item: Movie | TVShow | TVEpisode | None):
+        key = (provider, str(id), media_type)
+        data = json.dumps(self.serialize(item)) if item is not None else None
+        self.memo[key] = item
+
+        with self.lock:
+            self.db.execute(
+                "REPLACE INTO resolve_index (provider, id, media_type, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, data, time()),
+            )
+            self.db.commit()
+
+    def invalidate(self, provider: str, id: str, media_type: str = None):
+        """
+        Remove entries of the guid, for all media types if media_type is not given.
+        """
+        query = "DELETE FROM resolve_index WHERE provider=? AND id=?"
+        params = [provider, str(id)]
+        if media_type is not None:
+            query += " AND media_type=?"
+            params.append(media_type)
+
+        for key in [k for k in self.memo if k[0:2] == (provider, str(id)) and media_type in (None, k[2])]:
+            del self.memo[key]
+
+        with self.lock:
+            count = self.db.execute(query, params).rowcount
+            self.db.commit()
+
+        return count
+
+    def prune(self):
+        """
+        Remove expired entries.
+        """
+        now = time()
+        self.memo.clear()
+        with self.lock:
+            count = self.db.execute(
+                "DELETE FROM resolve_index WHERE (data IS NOT NULL AND updated_at < ?) OR (data IS NULL AND updated_at < ?)",
+                (now - self.ttl.total_seconds(), now - self.negative_ttl.total_seconds()),
+            ).rowcount
+            self.db.commit()
+
+        return count
+
+    def clear(self):
+        self.memo.clear()
+        with self.lock:
+            count = self.db.execute("DELETE FROM resolve_index").rowcount
+            self.db.commit()
+
+        return count
+
+    def stats(self):
+        now = time()
+        with self.lock:
+            matched, unmatched, expired = self.db.execute(
+                "SELECT"
+                " COALESCE(SUM(data IS NOT NULL), 0),"
+                " COALESCE(SUM(data IS NULL), 0),"
+                " COALESCE(SUM((data IS NOT NULL AND updated_at < ?) OR (data IS NULL AND updated_at < ?)), 0)"
+                " FROM resolve_index",
+                (now - self.ttl.total_seconds(), now - self.negative_ttl.total_seconds()),
+            ).fetchone()
+
+        return {
+            "matched": matched,
+            "unmatched": unmatched,
+            "expired": expired,
+        }
+
+    def entries(self, provider: str = None, id: str = None, unmatched: bool = False) -> Generator[tuple, None, None]:
+        """
+        Yield tuples (provider, id, media_type, data, updated_at), newest first.
+        """
+        query = "SELECT provider, id, media_type, data, updated_at FROM resolve_index WHERE 1=1"
+        params = []
+        if provider is not None:
+            query += " AND provider=?"
+            params.append(provider)
+        if id is not None:
+            query += " AND id=?"
+            params.append(str(id))
+        if unmatched:
+            query += " AND data IS NULL"
+        query += " ORDER BY updated_at DESC"
+
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+
+        for provider, id, media_type, data, updated_at in rows:
+            yield provider, id, media_type, json.loads(data) if data is not None else None, updated_at
+
+    @staticmethod
+    def serialize(m: Movie | TVShow | TVEpisode):
+        """
+        Serialize the item into the format of Trakt search result.
+        """
+        if m.media_type == "movies":
+            return {"movie": {"title": m.title, "year": m.year, **m.ids}}
+        if m.media_type == "shows":
+            return {"show": {"title": m.title, "year": m.year, **m.ids}}
+        if m.media_type == "episodes":
+            return {
+                "show": {"title": m.show, "ids": {"trakt": getattr(m, "show_id", None)}},
+                "episode": {"title": m.title, "season": m.season, "number": m.number, **m.ids},
+            }
+
+        raise ValueError(f"Unsupported media type: {m.media_type}")
+
+    @staticmethod
+    def build(data: dict):
+        """
+        Build the item from the Trakt search result, the same way as trakt.sync.search_by_id does.
+        """
+        if "episode" in data:
+            from trakt.tv import TVEpisode
+
+            show = data["show"]
+            return TVEpisode(show.get("title", None), show_id=show["ids"].get("trakt"), **data["episode"])
+        if "movie" in data:
+            from trakt.movies import Movie
+
+            return Movie(**data["movie"])
+        if "show" in data:
+            from trakt.tv import TVShow
+
+            return TVShow(**data["show"])
+
+        raise ValueError(f"Unsupported data: {data}")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pickle
+from os import makedirs, replace
+from os.path import exists, join
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+
+class TraktStateSnapshot:
+    """
+    Persistent snapshot of Trakt user state (watched, collected, ratings, playback).
+
+    Each entry is stored along with the "sync/last_activities" timestamps it depends on,
+    and is reused as long as these timestamps are unchanged.
+
+    - https://trakt.docs.apiary.io/#reference/sync/last-activities/get-last-activity
+    """
+
+    # Increase when the format of stored data changes
+    VERSION = 2
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, path: str, last_activities: dict):
+        self.path = path
+        self.last_activities = last_activities
+
+    @property
+    def version(self):
+        from plextraktsync import __version__
+
+        return f"{self.VERSION}/{__version__}"
+
+    def activities(self, keys: list[str]):
+        """
+        Return timestamps for keys like "movies.watched_at"
+        """
+        result = {}
+        for key in keys:
+            section, name = key.split(".", 1)
+            result[key] = self.last_activities.get(section, {}).get(name)
+
+        return result
+
+    def get(self, name: str, keys: list[str], loader: Callable[[], Any]):
+        activities = self.activities(keys)
+        filename = join(self.path, f"{name}.pickle")
+
+        if None not in activities.values():
+            found, data = self.load(filename, activities)
+            if found:
+                self.logger.debug(f"Using Trakt state snapshot for {name}: {activities}")
+                return data
+
+        data = loader()
+        if None not in activities.values():
+            self.save(filename, activities, data)
+
+        return data
+
+    def load(self, filename: str, activities: dict):
+        if not exists(filename):
+            return False, None
+
+        try:
+            with open(filename, "rb") as fh:
+                header, data = pickle.load(fh)
+        except Exception as e:
+            self.logger.debug(f"Unable to load {filename}: {e}")
+            return False, None
+
+        if header != {"version": self.version, "activities": activities}:
+            return False, None
+
+        return True, data
+
+    def save(self, filename: str, activities: dict, data):
+        header = {"version": self.version, "activities": activities}
+        tmp_filename = f"{filename}.tmp"
+        try:
+            makedirs(self.path, exist_ok=True)
+            with open(tmp_filename, "wb") as fh:
+                pickle.dump((header, data), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            replace(tmp_filename, filename)
+        except Exception as e:
+            self.logger.debug(f"Unable to save {filename}: {e}")
@@ -106,11 +106,13 @@ def load_items(self):
             # For user's personal lists, use the user's personal list endpoint
             user_list = trakt.get_personal_list(username, self.name)
             self.logger.info(f"Downloaded private personal Trakt list '{user_list.name}' ({len(user_list)} items)")
+            trakt.id_index.add_items(user_list._items)
             return user_list.description, self.build_dict_from_raw_items(user_list._items)
         elif not self.is_private:
             # For public lists and official lists, use the public list endpoint
             pl = PublicList.load(self.trakt_id)
             self.logger.info(f"Downloaded Trakt list '{pl.name}' ({len(pl)} items): {pl.share_link}")
+            trakt.id_index.add_items(pl)
             return pl.description, self.build_dict(pl)
         else:
             self.logger.warning(f"Trakt list '{self.name}' is a private list of '{self.username}' and cannot be accessed. You can unlike it.")
@@ -136,7 +138,15 @@ def plex_list(self):
 
         return self.plex_lists[self.name]
 
+    @cached_property
+    def media_types(self):
+        return {media_type for media_type, _ in self.items}
+
     def add(self, m: Media):
+        if m.media_type not in self.media_types:
+            # Avoid looking up ids for types not in this list
+            return
+
         rank = self.items.get((m.media_type, m.trakt_id))
         if rank is None:
             # Item is not in this trakt list
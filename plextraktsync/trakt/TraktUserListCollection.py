@@ -4,6 +4,7 @@
 from typing import TYPE_CHECKING
 
 from plextraktsync.factory import logging
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound
 from plextraktsync.trakt.TraktUserList import TraktUserList
 
 if TYPE_CHECKING:
@@ -23,13 +24,16 @@ def __init__(self, keep_watched: bool, trakt_lists_overrides: dict):
     def is_empty(self):
         return not len(self)
 
-    def add_to_lists(self, m: Media):
+    def add_items_to_lists(self, items: list[Media]):
         # Skip movie editions
         # https://support.plex.tv/articles/multiple-editions/#:~:text=Do%20Multiple%20Editions%20work%20with%20watch%20state%20syncing%3F
-        if m.plex.edition_title is not None:
-            return
+        items = [m for m in items if m.plex.edition_title is None]
         for tl in self:
-            tl.add(m)
+            for m in items:
+                try:
+                    tl.add(m)
+                except EpisodeNotFound as e:
+                    self.logger.warning(f"{m.title_link}: Skipping: {e}", extra={"markup": True})
 
     def load_lists(self, liked_lists: list[TraktLikedList]):
         for liked_list in liked_lists:
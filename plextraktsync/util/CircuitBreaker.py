@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+
+from plextraktsync.factory import logging
+
+
+class CircuitBreaker:
+    """
+    Track consecutive failures per host.
+
+    After {threshold} failures in a row, each within {reset_timeout} seconds
+    of the previous one, the circuit opens,
+    and calls to the host should pause for {reset_timeout} seconds.
+    A call made after the pause either closes the circuit on success,
+    or opens it again on failure. After {max_trips} openings in a row,
+    the host is considered down and calls should fail fast.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30, max_trips: int = 3, clock=monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.max_trips = max_trips
+        self.clock = clock
+        self.lock = Lock()
+        self.failures: dict[str, int] = {}
+        self.trips: dict[str, int] = {}
+        self.opened_until: dict[str, float] = {}
+        self.failed_at: dict[str, float] = {}
+
+    def remaining(self, key: str) -> float:
+        """
+        Return seconds until the circuit of the host may be tried again
+        """
+        with self.lock:
+            return max(0.0, self.opened_until.get(key, 0.0) - self.clock())
+
+    def is_down(self, key: str) -> bool:
+        with self.lock:
+            return self.trips.get(key, 0) >= self.max_trips
+
+    def success(self, key: str):
+        with self.lock:
+            if self.trips.pop(key, 0):
+                self.logger.info(f"{key} is responding again")
+            self.failures.pop(key, None)
+            self.opened_until.pop(key, None)
+            self.failed_at.pop(key, None)
+
+    def failure(self, key: str):
+        with self.lock:
+            now = self.clock()
+            if not self.trips.get(key) and now - self.failed_at.get(key, now) > self.reset_timeout:
+                # Failures far apart are not an outage
+                self.failures[key] = 0
+            self.failed_at[key] = now
+            failures = self.failures[key] = self.failures.get(key, 0) + 1
+            if failures < self.threshold or self.opened_until.get(key, 0.0) > now:
+                return
+
+            trips = self.trips[key] = self.trips.get(key, 0) + 1
+            self.opened_until[key] = now + self.reset_timeout
+            self.logger.warning(
+                f"{key} failed {failures} times in a row, pausing requests for {self.reset_timeout} seconds (trip: {trips}/{self.max_trips})"
+            )
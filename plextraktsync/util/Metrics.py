@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from requests import Response
+
+
+class Metrics:
+    """
+    Counters, histograms and gauges rendered in Prometheus text format:
+    - https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+    """
+
+    METRICS = {
+        "plextraktsync_events_total": ("counter", "Websocket events received, per event type"),
+        "plextraktsync_event_handling_seconds": ("histogram", "Time spent handling websocket events, per event type"),
+        "plextraktsync_queue_wait_seconds": ("histogram", "Time items waited in Trakt queue before they were sent, per lane"),
+        "plextraktsync_queue_depth": ("gauge", "Items waiting in Trakt queue, per queue name"),
+        "plextraktsync_http_requests_total": ("counter", "HTTP responses, per host and status code class"),
+        "plextraktsync_http_errors_total": ("counter", "Failed Trakt and Plex API calls, per host"),
+        "plextraktsync_websocket_reconnects_total": ("counter", "Reconnects to Plex websocket"),
+        "plextraktsync_resolve_index_total": ("counter", "Lookups of Trakt matches from resolve index, per result"),
+    }
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self):
+        self.lock = Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.callbacks: dict[str, Callable[[], dict[tuple, float]]] = {}
+
+    @staticmethod
+    def key(name: str, labels: dict):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        with self.lock:
+            self.counters[self.key(name, labels)] += amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = {"buckets": [0] * len(self.BUCKETS), "sum": 0.0, "count": 0}
+            histogram = self.histograms[key]
+            for i, le in enumerate(self.BUCKETS):
+                if value <= le:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def gauge(self, name: str, callback: Callable[[], dict[tuple, float]]):
+        """
+        Register callback returning values of metric when rendered: {(("label", "value"), ...): value}
+        """
+        self.callbacks[name] = callback
+
+    def response_hook(self, response: Response, *args, **kwargs):
+        """
+        Hook for requests session, counts responses not served from cache
+        """
+        if not getattr(response, "from_cache", False):
+            from urllib.parse import urlsplit
+
+            host = urlsplit(response.url).netloc
+            self.inc("plextraktsync_http_requests_total", host=host, status=f"{response.status_code // 100}xx")
+
+        return response
+
+    def samples(self):
+        with self.lock:
+            samples = defaultdict(list)
+            for (name, labels), value in self.counters.items():
+                samples[name].append((name, labels, value))
+            for (name, labels), histogram in self.histograms.items():
+                for le, count in zip(self.BUCKETS, histogram["buckets"], strict=True):
+                    samples[name].append((f"{name}_bucket", labels + (("le", str(le)),), count))
+                samples[name].append((f"{name}_bucket", labels + (("le", "+Inf"),), histogram["count"]))
+                samples[name].append((f"{name}_sum", labels, histogram["sum"]))
+                samples[name].append((f"{name}_count", labels, histogram["count"]))
+
+        for name, callback in self.callbacks.items():
+            for labels, value in callback().items():
+                samples[name].append((name, tuple(labels), value))
+
+        return samples
+
+    def render(self):
+        samples = self.samples()
+        lines = []
+        for name, (type, help) in self.METRICS.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            for sample, labels, value in samples.get(name, []):
+                lines.append(f"{sample}{self.format_labels(labels)} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def format_labels(labels: tuple):
+        if not labels:
+            return ""
+
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
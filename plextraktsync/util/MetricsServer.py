@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from functools import cached_property
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import logging
+
+if TYPE_CHECKING:
+    from plextraktsync.util.Metrics import Metrics
+
+
+class MetricsServer:
+    """
+    Serve metrics for Prometheus at http://host:port/metrics
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9100):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+
+    @cached_property
+    def server(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ThreadingHTTPServer((self.host, self.port), Handler)
+
+    def start(self):
+        server = self.server
+        host, port = server.server_address[:2]
+        self.logger.info(f"Serving metrics at http://{host}:{port}/metrics")
+        Thread(target=server.serve_forever, daemon=True, name="MetricsServer").start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -21,6 +21,12 @@ def __init__(self):
         self.servers_config = join(self.config_dir, "servers.yml")
         self.pytrakt_file = join(self.config_dir, ".pytrakt.json")
         self.env_file = join(self.config_dir, ".env")
+        self.section_watermarks_file = join(self.cache_dir, "section_watermarks.json")
+        self.trakt_state_dir = join(self.cache_dir, "trakt_state")
+        self.resolve_index_file = join(self.cache_dir, "trakt_resolve_index.sqlite")
+        self.trakt_episode_map_file = join(self.cache_dir, "trakt_episode_map.sqlite")
+        self.trakt_queue_journal_file = join(self.cache_dir, "trakt_queue_journal.jsonl")
+        self.profile_file = join(self.log_dir, "plextraktsync.prof")
 
     @cached_property
     def config_dir(self):
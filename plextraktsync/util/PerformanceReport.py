@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from fnmatch import fnmatch
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from requests import Response
+
+
+class PerformanceReport:
+    """
+    Collect where the time of a run was spent:
+    - HTTP requests per url pattern of http cache config, with cache hits and misses
+    - Time spent waiting in rate limit, retry and time limit
+    - Items per second of walker phases
+    - Sections added by other components
+    """
+
+    # Number of url patterns printed, all of them are written to json
+    PRINT_PATTERNS = 15
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.lock = Lock()
+        self.patterns = list(patterns)
+        self.started = monotonic()
+        self.requests = defaultdict(lambda: {"count": 0, "hits": 0, "stale": 0, "misses": 0, "seconds": 0.0, "bytes": 0})
+        self.waits = defaultdict(float)
+        self.phases = defaultdict(lambda: {"items": 0, "seconds": 0.0})
+        self.sections = {}
+
+    def pattern(self, url: str):
+        for pattern in self.patterns:
+            if self.url_match(url, pattern):
+                return pattern
+
+        return urlsplit(url).netloc
+
+    @staticmethod
+    def url_match(url: str, pattern: str):
+        """
+        Match url to glob pattern like requests_cache urls_expire_after does:
+        - https://requests-cache.readthedocs.io/en/main/user_guide/expiration.html#url-patterns
+        """
+        url = url.split("://")[-1]
+        pattern = pattern.split("://")[-1].rstrip("*") + "**"
+
+        return fnmatch(url, pattern)
+
+    def response_hook(self, response: Response, *args, **kwargs):
+        """
+        Hook for requests session, called for cached and new responses
+        """
+        pattern = self.pattern(response.url)
+        from_cache = getattr(response, "from_cache", False)
+        if from_cache:
+            stale = response.is_expired or getattr(response, "revalidated", False)
+            size = 0
+        else:
+            stale = False
+            size = self.response_size(response, kwargs.get("stream", False))
+
+        with self.lock:
+            stats = self.requests[pattern]
+            stats["count"] += 1
+            if not from_cache:
+                stats["misses"] += 1
+                stats["seconds"] += response.elapsed.total_seconds()
+                stats["bytes"] += size
+            elif stale:
+                stats["stale"] += 1
+            else:
+                stats["hits"] += 1
+
+        return response
+
+    @staticmethod
+    def response_size(response: Response, stream: bool):
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit():
+            return int(length)
+        if stream:
+            return 0
+
+        return len(response.content or b"")
+
+    def add_section(self, name: str, section):
+        """
+        Add report section, an object with serialize() and print(print) methods
+        """
+        self.sections[name] = section
+
+    def add_wait(self, name: str, seconds: float):
+        with self.lock:
+            self.waits[name] += seconds
+
+    def add_phase(self, name: str, items: int, seconds: float):
+        with self.lock:
+            phase = self.phases[name]
+            phase["items"] += items
+            phase["seconds"] += seconds
+
+    def serialize(self):
+        with self.lock:
+            requests = {pattern: dict(stats) for pattern, stats in self.requests.items()}
+            phases = {
+                name: {**phase, "items_per_second": phase["items"] / phase["seconds"] if phase["seconds"] else 0.0}
+                for name, phase in self.phases.items()
+            }
+            waits = dict(self.waits)
+
+        totals = {key: sum(stats[key] for stats in requests.values()) for key in ["count", "hits", "stale", "misses", "seconds", "bytes"]}
+
+        return {
+            "seconds": monotonic() - self.started,
+            "requests": totals,
+            "patterns": requests,
+            "waits": waits,
+            "phases": phases,
+            **{name: section.serialize() for name, section in self.sections.items()},
+        }
+
+    def print(self, print: Callable[[str], None]):
+        from humanize import naturalsize
+
+        report = self.serialize()
+        totals = report["requests"]
+        print(f"Run time: {report['seconds']:.1f}s")
+        print(
+            f"Requests: {totals['count']} ({totals['hits']} cached, {totals['stale']} stale, {totals['misses']} sent), "
+            f"{naturalsize(totals['bytes'])} received in {totals['seconds']:.1f}s"
+        )
+        patterns = sorted(report["patterns"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for pattern, stats in patterns[: self.PRINT_PATTERNS]:
+            average = stats["seconds"] / stats["misses"] if stats["misses"] else 0.0
+            print(
+                f"  {pattern}: {stats['count']} requests ({stats['hits']} cached, {stats['stale']} stale, {stats['misses']} sent), "
+                f"average {average:.3f}s, {naturalsize(stats['bytes'])}"
+            )
+        if report["waits"]:
+            print("Waiting: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in sorted(report["waits"].items())))
+        for name, phase in report["phases"].items():
+            print(f"{name}: {phase['items']} items in {phase['seconds']:.1f}s ({phase['items_per_second']:.1f} items/s)")
+        for name, section in self.sections.items():
+            print(f"{name.capitalize()}:")
+            section.print(print=print)
+
+    def write(self, path: str):
+        with open(path, "w") as fh:
+            json.dump(self.serialize(), fh, indent=2)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from threading import Condition
+
+
+class PriorityLock:
+    """
+    Lock where waiting priority callers are served before the other waiting callers
+    """
+
+    def __init__(self):
+        self.condition = Condition()
+        self.locked = False
+        self.priority_waiting = 0
+
+    @contextmanager
+    def __call__(self, priority=False):
+        with self.condition:
+            if priority:
+                self.priority_waiting += 1
+            try:
+                while self.locked or (not priority and self.priority_waiting):
+                    self.condition.wait()
+            finally:
+                if priority:
+                    self.priority_waiting -= 1
+            self.locked = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.locked = False
+                self.condition.notify_all()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from threading import Lock
 from time import monotonic, sleep
 
 from plextraktsync.factory import logging
@@ -17,6 +18,7 @@ def __init__(self, delay: float):
             raise ValueError(f"Delay must be a positive number: {delay}")
         self.delay = delay
         self.last_time = None
+        self.lock = Lock()
 
     @property
     def time_remaining(self):
@@ -38,13 +40,20 @@ def start(self):
         if not self.last_time:
             self.update()
 
-    def wait_if_needed(self):
-        if not self.last_time:
+    def wait_if_needed(self) -> float:
+        """
+        Wait until delay has passed since previous call, return the time waited
+        """
+        # Calls from concurrent threads are spaced too
+        with self.lock:
+            if not self.last_time:
+                self.update()
+                return 0.0
+
+            wait = self.time_remaining
+            if wait:
+                self.logger.debug(f"Sleeping for {wait:.3f} seconds")
+                sleep(wait)
             self.update()
-            return
 
-        wait = self.time_remaining
-        if wait:
-            self.logger.debug(f"Sleeping for {wait:.3f} seconds")
-            sleep(wait)
-        self.update()
+            return wait
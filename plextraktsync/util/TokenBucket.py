@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    Token bucket allowing {limit} calls per {period} seconds, shared by threads.
+
+    A call that finds the bucket empty reserves its token ahead,
+    so concurrent callers are queued in order without holding the lock while sleeping.
+    """
+
+    def __init__(self, limit: int, period: float, clock=monotonic, sleep=sleep):
+        if limit <= 0 or period <= 0:
+            raise ValueError(f"Invalid bucket: {limit} per {period} seconds")
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = Lock()
+        self.limit = limit
+        self.period = period
+        self.tokens = float(limit)
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.throttled_time = 0.0
+        self.throttled_count = 0
+
+    def __str__(self):
+        return f"<TokenBucket:{self.limit}/{self.period}s>"
+
+    @property
+    def rate(self):
+        return self.limit / self.period
+
+    def refill(self, now: float):
+        self.tokens = min(float(self.limit), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, and return the number of seconds to wait before using it.
+        """
+        with self.lock:
+            now = self.clock()
+            self.refill(now)
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+            if wait:
+                self.throttled_time += wait
+                self.throttled_count += 1
+
+        return wait
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+
+        return wait
+
+    def update(self, limit: int = None, period: float = None, remaining: int = None):
+        """
+        Adjust the bucket to the budget reported by the server.
+        """
+        with self.lock:
+            self.refill(self.clock())
+            if limit and period and (limit != self.limit or period != self.period):
+                self.limit = limit
+                self.period = float(period)
+                self.tokens = min(self.tokens, float(limit))
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+
+    def block(self, seconds: float):
+        """
+        Make no calls in the next {seconds}.
+        """
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class Tracer:
+    """
+    Record spans of the run, and write them in Chrome trace event format.
+
+    The file can be opened in https://ui.perfetto.dev or chrome://tracing
+    - https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.pid = os.getpid()
+        self.origin = perf_counter()
+        self.events = []
+        self.threads = set()
+
+    def timestamp(self, t: float):
+        """
+        Convert perf_counter() value to microseconds since start of the trace
+        """
+        return round((t - self.origin) * 1_000_000)
+
+    def add(self, name: str, start: float, duration: float, cat: str = "phase", **args):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self.timestamp(start),
+            "dur": round(duration * 1_000_000),
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+
+        with self.lock:
+            if thread.ident not in self.threads:
+                self.threads.add(thread.ident)
+                self.events.append(
+                    {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread.ident, "args": {"name": thread.name}},
+                )
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "phase", **args):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, perf_counter() - start, cat=cat, **args)
+
+    def response_hook(self, response: Response, *args, **kwargs):
+        """
+        Hook for requests session, adds span for each response
+        """
+        from_cache = getattr(response, "from_cache", False)
+        duration = 0.0 if from_cache else response.elapsed.total_seconds()
+        method = getattr(response.request, "method", None) or "GET"
+        self.add(
+            f"{method} {response.url}",
+            perf_counter() - duration,
+            duration,
+            cat="http",
+            status=response.status_code,
+            from_cache=from_cache,
+        )
+
+        return response
+
+    def write(self, path: str):
+        with self.lock:
+            events = list(self.events)
+
+        with open(path, "w") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
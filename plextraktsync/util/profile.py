@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING
+
+from plextraktsync.factory import factory, logging
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+
+    from plextraktsync.config.RunConfig import RunConfig
+
+logger = logging.getLogger(__name__)
+
+
+def start_profiler(profilers: list[Profile]):
+    from cProfile import Profile
+
+    profiler = Profile()
+    profilers.append(profiler)
+    profiler.enable()
+
+
+def start_thread_profiler(profilers: list[Profile], frame, event, arg):
+    """
+    Profile hook of new threads, replaced by a profiler of the thread
+    """
+    sys.setprofile(None)
+    start_profiler(profilers)
+
+
+def write_profile(profilers: list[Profile], filename: str):
+    from pstats import Stats
+
+    main, *threads = profilers
+    main.disable()
+    stats = Stats(main)
+    # Threads that made no calls have no stats
+    stats.add(*(profiler for profiler in threads if profiler.getstats()))
+    stats.dump_stats(filename)
+
+
+@contextmanager
+def profile(run_config: RunConfig):
+    """
+    Run the command with cProfile if requested, and write the trace at the end.
+
+    Before Python 3.12, cProfile profiles only the thread where it was enabled,
+    so threads started by the command get their own profilers, merged at the end.
+
+    The profile stats can be viewed as a flame graph, for example:
+    - snakeviz plextraktsync.prof
+    - flameprof plextraktsync.prof > plextraktsync.svg
+    """
+    profilers: list[Profile] = []
+    if run_config.profile:
+        start_profiler(profilers)
+        if sys.version_info < (3, 12):
+            threading.setprofile(partial(start_thread_profiler, profilers))
+
+    try:
+        yield
+    finally:
+        if profilers:
+            from plextraktsync.path import profile_file
+
+            threading.setprofile(None)
+            write_profile(profilers, profile_file)
+            logger.info(f"Profile stats written to {profile_file}")
+        if run_config.trace:
+            factory.tracer.write(run_config.trace)
+            logger.info(f"Trace written to {run_config.trace}")
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+from time import monotonic
+from typing import TYPE_CHECKING
+
 from plextraktsync.factory import logging
 from plextraktsync.watch.EventFactory import EventFactory
 from plextraktsync.watch.events import Error, ServerStarted
 
+if TYPE_CHECKING:
+    from plextraktsync.util.Metrics import Metrics
+
 
 class EventDispatcher:
     logger = logging.getLogger(__name__)
 
-    def __init__(self):
+    def __init__(self, metrics: Metrics = None):
         self.event_listeners = []
         self.event_factory = EventFactory()
+        self.metrics = metrics
 
     def on(self, event_type, listener, **kwargs):
         self.event_listeners.append(
@@ -32,6 +39,16 @@ def event_handler(self, data):
             self.dispatch(event)
 
     def dispatch(self, event):
+        if self.metrics is None:
+            return self.notify(event)
+
+        event_type = type(event).__name__
+        self.metrics.inc("plextraktsync_events_total", type=event_type)
+        start = monotonic()
+        self.notify(event)
+        self.metrics.observe("plextraktsync_event_handling_seconds", monotonic() - start, type=event_type)
+
+    def notify(self, event):
         for listener in self.event_listeners:
             if not self.match_event(listener, event):
                 continue
@@ -10,15 +10,18 @@
 if TYPE_CHECKING:
     from plexapi.server import PlexServer
 
+    from plextraktsync.util.Metrics import Metrics
+
 
 class WebSocketListener:
     logger = logging.getLogger(__name__)
 
-    def __init__(self, plex: PlexServer, poll_interval=5, restart_interval=15):
+    def __init__(self, plex: PlexServer, poll_interval=5, restart_interval=15, metrics: Metrics = None):
         self.plex = plex
         self.poll_interval = poll_interval
         self.restart_interval = restart_interval
-        self.dispatcher = EventDispatcher()
+        self.metrics = metrics
+        self.dispatcher = EventDispatcher(metrics=metrics)
 
     def on(self, event_type, listener, **kwargs):
         self.dispatcher.on(event_type, listener, **kwargs)
@@ -35,3 +38,5 @@ def listen(self):
             self.dispatcher.event_handler(Error(msg="Server closed connection"))
             self.logger.error(f"Listener finished. Restarting in {self.restart_interval} seconds")
             sleep(self.restart_interval)
+            if self.metrics is not None:
+                self.metrics.inc("plextraktsync_websocket_reconnects_total")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare AllShowsProgress with the object graph of ShowProgress classes.
+
+Run with:
+
+    python -m tests.benchmark_all_shows_progress [shows] [seasons] [episodes]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+from plextraktsync.pytrakt_extensions import AllShowsProgress, ShowProgress
+
+
+def make_shows(shows: int, seasons: int, episodes: int, seed: int = 0):
+    """
+    Make "sync/watched/shows?extended=progress" like payload.
+    """
+    rnd = Random(seed)
+
+    def timestamp():
+        return f"20{rnd.randint(10, 23)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T12:{rnd.randint(0, 59):02d}:00.000Z"
+
+    return [
+        {
+            "show": {"ids": {"trakt": trakt_id, "slug": f"show-{trakt_id}"}},
+            "reset_at": timestamp() if rnd.random() < 0.2 else None,
+            "seasons": [
+                {
+                    "number": season,
+                    "completed": episodes if rnd.random() < 0.3 else episodes - 1,
+                    "episodes": [
+                        {
+                            "number": episode,
+                            "plays": rnd.randint(0, 2),
+                            "completed": rnd.random() < 0.8,
+                            "last_watched_at": timestamp(),
+                        }
+                        for episode in range(1, episodes + 1)
+                    ],
+                }
+                for season in range(1, seasons + 1)
+            ],
+        }
+        for trakt_id in range(1, shows + 1)
+    ]
+
+
+class ShowProgressGraph:
+    """
+    AllShowsProgress as implemented with ShowProgress object graph.
+    """
+
+    def __init__(self, shows):
+        self.shows = {}
+        for show in shows:
+            prog = ShowProgress(**show)
+            self.shows[prog.trakt] = prog
+
+    def get_completed(self, trakt_id, season, episode):
+        if trakt_id not in self.shows:
+            return False
+        return self.shows[trakt_id].get_completed(season, episode)
+
+
+def measure(name: str, cls, payload: list[dict], lookups: list[tuple[int, int, int]]):
+    start = perf_counter()
+    progress = cls(payload)
+    build_time = perf_counter() - start
+
+    start = perf_counter()
+    for key in lookups:
+        progress.get_completed(*key)
+    first_lookup_time = perf_counter() - start
+
+    start = perf_counter()
+    for key in lookups:
+        progress.get_completed(*key)
+    lookup_time = perf_counter() - start
+
+    # Measure memory in separate pass, as tracing slows down the code
+    del progress
+    tracemalloc.start()
+    progress = cls(payload)
+    for key in lookups:
+        progress.get_completed(*key)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:20s} build: {build_time:6.3f}s, first lookups: {first_lookup_time:6.3f}s, "
+        f"next lookups: {lookup_time:6.3f}s, memory: {memory / 1024 / 1024:7.1f} MiB"
+    )
+
+
+def main(shows=1000, seasons=5, episodes=20):
+    payload = make_shows(shows, seasons, episodes)
+    lookups = [(show, season, episode) for show in range(1, shows + 1) for season in range(1, seasons + 1) for episode in range(1, episodes + 1)]
+    print(f"{shows} shows, {len(lookups)} episodes")
+
+    # Memory of payload itself is not traced, as it is created before measure starts
+    measure("ShowProgress", ShowProgressGraph, payload, lookups)
+    measure("AllShowsProgress", AllShowsProgress, payload, lookups)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
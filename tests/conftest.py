@@ -6,9 +6,12 @@
 from os.path import dirname
 from os.path import join as join_path
 
+import pytest
 from trakt.tv import TVShow
 
+from plextraktsync.decorators import retry
 from plextraktsync.factory import Factory
+from plextraktsync.util.CircuitBreaker import CircuitBreaker
 
 TESTS_DIR = dirname(__file__)
 MOCK_DATA_DIR = join_path(TESTS_DIR, "mock_data")
@@ -25,6 +28,16 @@
         del environ[key]
 
 
+@pytest.fixture(autouse=True)
+def circuit_breaker(monkeypatch):
+    """
+    Requests failed by one test don't pause requests of other tests
+    """
+    circuit_breaker = CircuitBreaker(threshold=retry.circuit_breaker.threshold, reset_timeout=retry.circuit_breaker.reset_timeout)
+    monkeypatch.setattr(retry, "circuit_breaker", circuit_breaker)
+    monkeypatch.setattr(retry, "hosts", {})
+
+
 def load_mock(name: str):
     filename = join_path(MOCK_DATA_DIR, name)
     with open(filename, encoding="utf-8") as f:
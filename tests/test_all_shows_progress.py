@@ -0,0 +1,81 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from trakt.utils import airs_date
+
+from plextraktsync.pytrakt_extensions import AllShowsProgress, CompactShowProgress, ShowProgress
+from tests.benchmark_all_shows_progress import make_shows
+
+
+def test_all_shows_progress_matches_show_progress():
+    payload = make_shows(20, 3, 5)
+    progress = AllShowsProgress(payload)
+
+    for show in payload:
+        expected = ShowProgress(**show)
+        trakt_id = expected.trakt
+        assert progress.reset_at(trakt_id) == airs_date(expected.reset_at)
+        for season in range(0, 5):
+            for episode in range(0, 7):
+                completed = expected.get_completed(season, episode)
+                assert progress.get_completed(trakt_id, season, episode) is completed, (trakt_id, season, episode)
+                collected = season in expected.seasons and episode in expected.seasons[season].episodes
+                assert progress.is_collected(trakt_id, season, episode) is collected
+
+
+def test_all_shows_progress_add():
+    progress = AllShowsProgress(make_shows(1, 1, 2))
+
+    progress.add(1, 1, 10)
+    progress.add(1, 3, 1)
+    progress.add(2, 1, 1)
+
+    assert progress.get_completed(1, 1, 10) is True
+    assert progress.get_completed(1, 3, 1) is True
+    assert progress.get_completed(2, 1, 1) is True
+    assert progress.is_collected(2, 1, 1) is True
+    assert progress.get_completed(2, 1, 2) is False
+    assert progress.reset_at(3) is None
+    assert len(progress.shows) == 2
+
+
+def test_completed_of_matches_get_completed():
+    progress = AllShowsProgress(make_shows(20, 3, 5))
+
+    keys = [CompactShowProgress.key(season, episode) for season in range(0, 5) for episode in range(0, 7)]
+    for trakt_id, show in progress.shows.items():
+        completed = {key for key in keys if show.get_completed(key // CompactShowProgress.SEASON_KEY, key % CompactShowProgress.SEASON_KEY)}
+        collected = {key for key in keys if show.has_episode(key // CompactShowProgress.SEASON_KEY, key % CompactShowProgress.SEASON_KEY)}
+        assert show.completed_of(keys) == completed, trakt_id
+        assert show.collected_of(keys) == collected, trakt_id
+
+
+def test_all_shows_progress_concurrent_add():
+    progress = AllShowsProgress(make_shows(1, 1, 2))
+    episodes = [(season, episode) for season in range(1, 5) for episode in range(1, 50)]
+
+    def add(worker: int):
+        for season, episode in episodes[worker::4]:
+            progress.add(1, season, episode)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(add, range(4)))
+
+    show = progress.get(1)
+    assert list(show.keys) == sorted(show.keys)
+    assert len(show.keys) == len(show.flags) == len(show.watched_at)
+    assert all(progress.get_completed(1, season, episode) for season, episode in episodes)
+
+
+def test_all_shows_progress_pickle():
+    progress = AllShowsProgress(make_shows(2, 1, 2))
+    progress.add(1, 1, 10)
+
+    restored = pickle.loads(pickle.dumps(progress))
+
+    assert restored.get_completed(1, 1, 10) is True
+    restored.add(3, 1, 1)
+    assert restored.is_collected(3, 1, 1) is True
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import asyncio
+from threading import Lock
+from time import sleep
+
+from plextraktsync.trakt.AsyncTraktApi import AsyncTraktApi
+
+
+class FakeTraktApi:
+    def __init__(self):
+        self.lock = Lock()
+        self.running = 0
+        self.max_running = 0
+        self.ratings = {"movies": {1: 10}}
+        self.loaded = []
+        self.rated = []
+
+    def request(self, value):
+        with self.lock:
+            self.loaded.append(value)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        sleep(0.05)
+        with self.lock:
+            self.running -= 1
+
+        return value
+
+    @property
+    def me(self):
+        return self.request("me")
+
+    @property
+    def snapshot(self):
+        return self.request("snapshot")
+
+    @property
+    def watched_movies(self):
+        return self.request({1, 2})
+
+    @property
+    def watched_shows(self):
+        return self.request("shows")
+
+    @property
+    def watch_progress(self):
+        return self.request("progress")
+
+    def search_by_id(self, media_id: str, id_type: str, media_type: str):
+        return self.request((media_id, id_type, media_type))
+
+    def rate(self, m, rating: int, rate_date=None):
+        self.rated.append((m, rating, rate_date))
+
+
+def test_preload_concurrent():
+    trakt = FakeTraktApi()
+    aio = AsyncTraktApi(trakt, workers=3)
+
+    asyncio.run(aio.preload(["watched_movies", "watched_shows", "watch_progress"]))
+
+    assert trakt.max_running == 3
+    # Shared state is loaded before the concurrent requests
+    assert trakt.loaded[:2] == ["me", "snapshot"]
+
+
+def test_results():
+    trakt = FakeTraktApi()
+    aio = AsyncTraktApi(trakt)
+
+    async def run():
+        return await asyncio.gather(
+            aio.watched_movies(),
+            aio.ratings("movies"),
+            aio.search_by_id("tt0111161", "imdb", "movie"),
+            aio.rate("m", 10),
+        )
+
+    assert asyncio.run(run()) == [{1, 2}, {1: 10}, ("tt0111161", "imdb", "movie"), None]
+    assert trakt.rated == [("m", 10, None)]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from time import sleep
+
+import pytest
+
+from plextraktsync.queue.BackgroundTask import BackgroundTask
+from plextraktsync.queue.ChunkedWorker import ChunkedWorker
+from plextraktsync.queue.Queue import Queue
+from plextraktsync.util.Timer import Timer
+
+
+class Worker(ChunkedWorker):
+    CHUNK_SIZE = 3
+    QUEUE = "add_to_history"
+
+    def __init__(self, fail_chunk=None):
+        self.chunks = []
+        self.fail_chunk = fail_chunk
+
+    def __call__(self, queues):
+        items = queues[self.QUEUE]
+        if not len(items):
+            return
+        self.submit_chunks(self.submit, items)
+
+    def submit(self, items):
+        if items == self.fail_chunk:
+            raise ValueError("Boom")
+        self.chunks.append(items)
+
+
+def test_chunks():
+    worker = Worker()
+    worker.submit_chunks(worker.submit, list(range(8)))
+
+    assert sorted(worker.chunks) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+
+
+def test_chunk_failure(caplog):
+    worker = Worker(fail_chunk=[3, 4, 5])
+    items = list(range(8))
+    with pytest.raises(ValueError, match="Boom"):
+        worker.submit_chunks(worker.submit, items)
+
+    assert sorted(worker.chunks) == [[0, 1, 2], [6, 7]]
+    assert "chunk 2/3 (3 items): Boom" in caplog.text
+    # Items of the failed chunk are kept for next flush
+    assert items == [3, 4, 5]
+
+
+def test_chunk_failure_kept_in_queue():
+    worker = Worker(fail_chunk=[3, 4, 5])
+    task = BackgroundTask(None, worker)
+    for i in range(8):
+        task.process_message(("add_to_history", i))
+
+    task.timed_events()
+    assert task.queues["add_to_history"] == [3, 4, 5]
+    assert task.latency.count == 5
+
+    # Not flushed again until the pause after the failure has passed
+    worker.fail_chunk = None
+    task.timed_events()
+    assert task.queues["add_to_history"] == [3, 4, 5]
+    assert task.backoff_remaining > 0
+
+    task.retry_at = 0.0
+    task.timed_events()
+    assert sorted(x for chunk in worker.chunks for x in chunk) == list(range(8))
+    assert task.queues["add_to_history"] == []
+    assert task.latency.count == 8
+
+
+class FailingWorker:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, queues):
+        if queues["add_to_history"]:
+            self.calls += 1
+            raise ValueError("Boom")
+
+
+def test_failed_items_dont_trigger_flush():
+    worker = FailingWorker()
+    task = BackgroundTask(None, worker, flush_size=3)
+    for i in range(3):
+        task.process_message(("add_to_history", i))
+    assert worker.calls == 1
+
+    # Pause is over, but retained items don't count towards flush_size
+    task.retry_at = 0.0
+    task.process_message(("add_to_history", 3))
+    task.process_message(("add_to_history", 4))
+    assert worker.calls == 1
+    task.process_message(("add_to_history", 5))
+    assert worker.calls == 2
+
+
+def test_failed_items_dropped(caplog):
+    worker = FailingWorker()
+    task = BackgroundTask(None, worker)
+    task.process_message(("add_to_history", "a"))
+
+    for _ in range(3):
+        task.timed_events(force=True)
+
+    assert worker.calls == 3
+    assert task.queues["add_to_history"] == []
+    assert "Dropping 1 add_to_history updates that failed 3 times" in caplog.text
+    assert task.backoff_remaining == 0
+
+
+class SizeWorker:
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, queues):
+        self.sizes.append(sum(len(items) for items in queues.values()))
+        for items in queues.values():
+            items.clear()
+
+
+def test_max_size():
+    worker = SizeWorker()
+    # Timer would flush only at close
+    queue = Queue(BackgroundTask(Timer(3600), worker, max_size=3))
+    for i in range(10):
+        queue.add_to_history(i)
+    queue.close()
+
+    assert max(worker.sizes) <= 3
+    assert sum(worker.sizes) == 10
+
+
+def test_flush_size():
+    worker = Worker()
+    task = BackgroundTask(None, worker, flush_size=4)
+
+    for i in range(10):
+        task.process_message(("add_to_history", i))
+    assert sorted(worker.chunks) == [[0, 1, 2], [3], [4, 5, 6], [7]]
+
+    task.shutdown()
+    assert sorted(worker.chunks)[-1] == [8, 9]
+
+
+def test_bounded_queue():
+    worker = Worker()
+    queue = Queue(BackgroundTask(None, worker, flush_size=2), maxsize=1)
+    for i in range(5):
+        queue.add_to_history(i)
+    queue.close()
+
+    assert sorted(x for chunk in worker.chunks for x in chunk) == list(range(5))
+
+
+class ScrobbleWorker:
+    def __init__(self):
+        self.items = []
+
+    def __call__(self, queues):
+        for name in Queue.PRIORITY_QUEUES:
+            self.items.extend(queues[name])
+            queues[name].clear()
+
+
+def test_priority_lane():
+    worker = Worker()
+    scrobbles = ScrobbleWorker()
+    # Bulk lane flushes only at close
+    bulk = BackgroundTask(Timer(3600), worker)
+    priority = BackgroundTask(None, scrobbles, flush_size=1, name="scrobble")
+    queue = Queue(bulk, priority_runner=priority)
+
+    queue.add_to_history(1)
+    queue.scrobble_update(("scrobbler", 50))
+    for _ in range(100):
+        if scrobbles.items:
+            break
+        sleep(0.01)
+
+    assert scrobbles.items == [("scrobbler", 50)]
+    assert worker.chunks == []
+
+    assert sum(queue.depth().values()) == 1
+
+    latency = queue.latency
+    queue.close()
+    assert worker.chunks == [[1]]
+    assert latency["scrobble"].count == 1
+    assert latency["bulk"].count == 1
+    assert latency["scrobble"].max < latency["bulk"].max
+
+
+def test_depth_published():
+    task = BackgroundTask(None, Worker())
+    task.process_message(("add_to_history", 1))
+    task.process_message(("add_to_history", 2))
+    depth = task.depth
+    assert depth == {"add_to_history": 2}
+
+    task.timed_events()
+    # Published depths are replaced, not changed in place
+    assert depth == {"add_to_history": 2}
+    assert task.depth == {"add_to_history": 0}
+
+
+def test_flush():
+    worker = Worker(fail_chunk=[2])
+    # Flushes only on request
+    queue = Queue(BackgroundTask(Timer(3600), worker))
+    queue.add_to_history(1)
+    assert queue.flush()
+    assert worker.chunks == [[1]]
+
+    queue.add_to_history(2)
+    assert not queue.flush()
+    queue.close()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from plextraktsync.media.MediaFactory import MediaFactory
+from plextraktsync.trakt.LazyTraktEpisode import EpisodeNotFound, LazyTraktEpisode
+from plextraktsync.trakt.TraktLookup import TraktLookup
+
+
+def make_guid(season: int, number: int):
+    guid = MagicMock()
+    guid.syncable = True
+    guid.pm.season_number = season
+    guid.pm.episode_number = number
+    return guid
+
+
+def make_show():
+    tm = MagicMock()
+    tm.title = "Breaking Bad"
+    tm.trakt = 1388
+    show = MagicMock()
+    show.seasons = TraktLookup(tm)
+    return show
+
+
+def test_lazy_episode_resolves_on_ids():
+    trakt = MagicMock()
+    te = MagicMock()
+    te.ids = {"ids": {"trakt": 74}}
+    trakt.find_episode_guid.return_value = te
+    mf = MediaFactory(MagicMock(), trakt, server_config=MagicMock(), lazy_episodes=True)
+    show = make_show()
+
+    guid = make_guid(1, 2)
+    m = mf.resolve_guid(guid, show)
+    tm = m.trakt
+    assert isinstance(tm, LazyTraktEpisode)
+    assert (tm.media_type, tm.show_id, tm.season, tm.number) == ("episodes", 1388, 1, 2)
+    assert m.show_trakt_id == 1388
+    trakt.find_episode_guid.assert_not_called()
+
+    assert tm.ids == {"ids": {"trakt": 74}}
+    assert tm.is_resolved
+    trakt.find_episode_guid.assert_called_once_with(guid, show.seasons)
+
+
+def test_lazy_episode_not_found():
+    trakt = MagicMock()
+    trakt.find_episode_guid.return_value = None
+    tm = LazyTraktEpisode(make_guid(1, 2), make_show().seasons, trakt)
+
+    with pytest.raises(EpisodeNotFound):
+        assert tm.trakt
+
+
+def test_lazy_episodes_disabled_after_table_loaded():
+    trakt = MagicMock()
+    mf = MediaFactory(MagicMock(), trakt, server_config=MagicMock(), lazy_episodes=True)
+    show = make_show()
+    show.seasons.__dict__["table"] = {}
+
+    m = mf.resolve_guid(make_guid(1, 2), show)
+    assert m.trakt is trakt.find_episode_guid.return_value
+
+
+def test_episode_rating_by_number():
+    from plextraktsync.trakt.TraktRatingCollection import TraktRatingCollection
+
+    trakt = MagicMock()
+    trakt.get_ratings.return_value = [
+        {
+            "rating": 8,
+            "rated_at": "2024-01-01T00:00:00.000Z",
+            "show": {"ids": {"trakt": 1388}},
+            "episode": {"season": 1, "number": 2, "ids": {"trakt": 74}},
+        }
+    ]
+    ratings = TraktRatingCollection(trakt)
+
+    assert ratings.episode_by_number(1388, 1, 2).rating == 8
+    assert ratings.episode_by_number(1388, 1, 3) is None
+    assert ratings["episodes"][74].rating == 8
+    trakt.get_ratings.assert_called_once_with("episodes")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from urllib.request import urlopen
+
+from plextraktsync.util.Metrics import Metrics
+from plextraktsync.util.MetricsServer import MetricsServer
+from plextraktsync.watch.EventDispatcher import EventDispatcher
+from plextraktsync.watch.events import Error
+
+
+def test_render():
+    metrics = Metrics()
+    metrics.inc("plextraktsync_events_total", type="PlaySessionStateNotification")
+    metrics.inc("plextraktsync_events_total", type="PlaySessionStateNotification")
+    metrics.inc("plextraktsync_websocket_reconnects_total")
+    metrics.observe("plextraktsync_queue_wait_seconds", 0.2, lane="scrobble")
+    metrics.observe("plextraktsync_queue_wait_seconds", 3.0, lane="scrobble")
+    metrics.gauge("plextraktsync_queue_depth", lambda: {(("queue", "add_to_collection"),): 5})
+
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE plextraktsync_events_total counter" in lines
+    assert 'plextraktsync_events_total{type="PlaySessionStateNotification"} 2' in lines
+    assert "plextraktsync_websocket_reconnects_total 1" in lines
+    assert 'plextraktsync_queue_wait_seconds_bucket{lane="scrobble",le="0.1"} 0' in lines
+    assert 'plextraktsync_queue_wait_seconds_bucket{lane="scrobble",le="0.25"} 1' in lines
+    assert 'plextraktsync_queue_wait_seconds_bucket{lane="scrobble",le="+Inf"} 2' in lines
+    assert 'plextraktsync_queue_wait_seconds_sum{lane="scrobble"} 3.2' in lines
+    assert 'plextraktsync_queue_wait_seconds_count{lane="scrobble"} 2' in lines
+    assert 'plextraktsync_queue_depth{queue="add_to_collection"} 5' in lines
+
+
+def test_label_escape():
+    assert Metrics.format_labels((("type", 'a"b\\c'),)) == '{type="a\\"b\\\\c"}'
+
+
+def test_event_dispatcher():
+    metrics = Metrics()
+    events = []
+    dispatcher = EventDispatcher(metrics=metrics)
+    dispatcher.on(Error, events.append)
+
+    dispatcher.event_handler(Error(msg="Server closed connection"))
+
+    assert len(events) == 1
+    assert metrics.counters[("plextraktsync_events_total", (("type", "Error"),))] == 1
+    assert metrics.histograms[("plextraktsync_event_handling_seconds", (("type", "Error"),))]["count"] == 1
+
+
+def test_server():
+    metrics = Metrics()
+    metrics.inc("plextraktsync_http_errors_total", host="api.trakt.tv")
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    try:
+        host, port = server.server.server_address[:2]
+        with urlopen(f"http://{host}:{port}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.stop()
+
+    assert 'plextraktsync_http_errors_total{host="api.trakt.tv"} 1' in body
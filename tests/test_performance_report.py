@@ -0,0 +1,78 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+from requests import Response
+
+from plextraktsync.util.PerformanceReport import PerformanceReport
+
+PATTERNS = [
+    "api.trakt.tv/users/*/ratings/movies",
+    "api.trakt.tv/search/imdb/tt*?type=movie",
+]
+
+
+def make_response(url, seconds=0.5, size=100):
+    response = Response()
+    response.status_code = 200
+    response.url = url
+    response.elapsed = timedelta(seconds=seconds)
+    response._content = b"x" * size
+
+    return response
+
+
+def cached_response(url, is_expired=False):
+    return SimpleNamespace(url=url, from_cache=True, is_expired=is_expired, revalidated=False)
+
+
+def test_requests_by_pattern():
+    report = PerformanceReport(patterns=PATTERNS)
+
+    report.response_hook(make_response("https://api.trakt.tv/users/me/ratings/movies"))
+    report.response_hook(cached_response("https://api.trakt.tv/users/me/ratings/movies"))
+    report.response_hook(cached_response("https://api.trakt.tv/search/imdb/tt0111161?type=movie", is_expired=True))
+    report.response_hook(make_response("https://plex.example.org:32400/library/sections", seconds=0.25, size=50))
+
+    data = report.serialize()
+    assert data["patterns"]["api.trakt.tv/users/*/ratings/movies"] == {
+        "count": 2,
+        "hits": 1,
+        "stale": 0,
+        "misses": 1,
+        "seconds": 0.5,
+        "bytes": 100,
+    }
+    assert data["patterns"]["api.trakt.tv/search/imdb/tt*?type=movie"]["stale"] == 1
+    # Urls without pattern are grouped by host
+    assert data["patterns"]["plex.example.org:32400"]["bytes"] == 50
+    assert data["requests"]["count"] == 4
+    assert data["requests"]["misses"] == 2
+    assert data["requests"]["seconds"] == 0.75
+
+
+def test_waits_and_phases(tmp_path):
+    report = PerformanceReport()
+    report.add_wait("retry", 1.5)
+    report.add_wait("retry", 0.5)
+    report.add_phase("Processing Movies", 100, 4.0)
+
+    lines = []
+    report.print(print=lines.append)
+    assert "Waiting: retry 2.0s" in lines
+    assert "Processing Movies: 100 items in 4.0s (25.0 items/s)" in lines
+
+    path = tmp_path / "report.json"
+    report.write(str(path))
+    data = json.loads(path.read_text())
+    assert data["waits"] == {"retry": 2.0}
+    assert data["phases"]["Processing Movies"]["items_per_second"] == 25.0
+
+
+def test_url_match():
+    assert PerformanceReport.url_match("https://api.trakt.tv/sync/watched/shows", "api.trakt.tv/sync/watched")
+    assert PerformanceReport.url_match("https://api.trakt.tv/shows/1/seasons", "https://api.trakt.tv/shows/*/seasons")
+    assert not PerformanceReport.url_match("https://api.trakt.tv/movies/1/seasons", "api.trakt.tv/shows/*")
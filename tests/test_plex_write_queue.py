@@ -0,0 +1,70 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from threading import Event
+from time import sleep
+
+from plextraktsync.queue.PlexWriteQueue import PlexWriteQueue
+
+
+def test_write_queue_coalesce():
+    queue = PlexWriteQueue(workers=1)
+    started = Event()
+    release = Event()
+    calls = []
+
+    def block():
+        started.set()
+        release.wait()
+
+    queue.add("block", block, "block")
+    started.wait()
+    # These wait for the worker, later ones replace earlier
+    queue.add((1, "watched"), lambda: calls.append("played"), "played")
+    queue.add((1, "watched"), lambda: calls.append("unplayed"), "unplayed")
+    queue.add((1, "rating"), lambda: calls.append("rated"), "rated")
+    release.set()
+    queue.close()
+
+    assert calls == ["unplayed", "rated"]
+
+
+def test_write_queue_failures(caplog):
+    queue = PlexWriteQueue(workers=2)
+
+    def fail():
+        raise ValueError("Boom")
+
+    queue.add(1, fail, "markPlayed Movie")
+    queue.add(2, lambda: None, "markPlayed Other")
+    queue.close()
+
+    assert "1 Plex updates failed" in caplog.text
+    assert "markPlayed Movie: Boom" in caplog.text
+    assert queue.failures == []
+
+
+def test_write_queue_serializes_key():
+    queue = PlexWriteQueue(workers=4)
+    started = Event()
+    release = Event()
+    calls = []
+
+    def played():
+        started.set()
+        release.wait()
+        calls.append("played")
+
+    queue.add((1, "watched"), played, "played")
+    started.wait()
+    # Queued behind the running update of the same key
+    queue.add((1, "watched"), lambda: calls.append("unplayed"), "unplayed")
+    sleep(0.05)
+    assert calls == []
+    release.set()
+    queue.flush()
+
+    assert calls == ["played", "unplayed"]
+    assert queue.futures == set()
+    assert queue.running == set()
+    queue.close()
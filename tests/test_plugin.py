@@ -1,6 +1,9 @@
 #!/usr/bin/env python3 -m pytest
 from __future__ import annotations
 
+import asyncio
+
+from plextraktsync.plugin import hookimpl
 from plextraktsync.sync.plugin import SyncPluginManager
 
 
@@ -10,3 +13,84 @@ def test_plugin():
     """
     pm = SyncPluginManager()
     assert pm is not None
+
+
+def test_walk_batch():
+    calls = []
+
+    class ItemPlugin:
+        @hookimpl
+        async def walk_movie(self, movie):
+            calls.append(("item", movie))
+
+    class BatchPlugin:
+        @hookimpl
+        async def walk_movies_batch(self, movies):
+            calls.append(("batch", movies))
+
+        @hookimpl
+        async def walk_movie(self, movie):
+            calls.append(("unexpected", movie))
+
+    pm = SyncPluginManager()
+    pm.pm.register(ItemPlugin())
+    pm.pm.register(BatchPlugin())
+
+    asyncio.run(pm.walk_movies([1, 2], dry_run=False))
+
+    assert calls == [("batch", [1, 2]), ("item", 1), ("item", 2)]
+
+
+def test_hook_timings():
+    from plextraktsync.sync.plugin.HookTimings import HookTimings
+
+    class ItemPlugin:
+        @hookimpl
+        def init(self, pm):
+            pass
+
+        @hookimpl
+        async def walk_movie(self, movie):
+            await asyncio.sleep(0.01)
+
+    class BatchPlugin:
+        @hookimpl
+        async def walk_movies_batch(self, movies):
+            pass
+
+    timings = HookTimings()
+    pm = SyncPluginManager(timings=timings)
+    for plugin in [ItemPlugin(), BatchPlugin()]:
+        pm.pm.register(plugin)
+        timings.instrument(pm.pm, plugin)
+
+    pm.hook.init(pm=pm, sync=None, is_partial=False, dry_run=False)
+    asyncio.run(pm.walk_movies([1, 2, 3], dry_run=False))
+
+    stats = timings.serialize()
+    assert stats["ItemPlugin"]["init"]["calls"] == 1
+    assert stats["ItemPlugin"]["walk_movie"]["calls"] == 3
+    assert stats["ItemPlugin"]["walk_movie"]["seconds"] >= 0.03
+    assert stats["ItemPlugin"]["walk_movie"]["p50"] >= 0.01
+    assert stats["BatchPlugin"] == {"walk_movies_batch": stats["BatchPlugin"]["walk_movies_batch"]}
+    assert stats["BatchPlugin"]["walk_movies_batch"]["calls"] == 1
+
+    lines = []
+    timings.print(print=lines.append)
+    assert lines[0].startswith("  ItemPlugin.walk_movie: 3 calls")
+
+
+def test_percentile():
+    from plextraktsync.sync.plugin.HookTimings import HookStats
+
+    stats = HookStats()
+    for i in range(1, 101):
+        stats.add(i / 1000)
+    assert stats.calls == 100
+    assert 0.050 <= stats.percentile(50) < 0.050 * 1.1
+    assert 0.099 <= stats.percentile(99) <= 0.1
+    assert stats.percentile(100) == 0.1
+
+    stats = HookStats()
+    stats.add(1.0)
+    assert stats.percentile(95) == 1.0
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import sys
+import threading
+from functools import partial
+from pstats import Stats
+
+import pytest
+
+from plextraktsync.util.profile import start_profiler, start_thread_profiler, write_profile
+
+
+def work():
+    return sum(range(1000))
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 12), reason="Threads are profiled by the main profiler")
+def test_threads_profiled(tmp_path):
+    filename = str(tmp_path / "plextraktsync.prof")
+    profilers = []
+    start_profiler(profilers)
+    threading.setprofile(partial(start_thread_profiler, profilers))
+    try:
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    finally:
+        threading.setprofile(None)
+    write_profile(profilers, filename)
+
+    functions = {function for _, _, function in Stats(filename).stats}
+    assert "work" in functions
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import json
+from threading import Event, Thread
+from time import sleep
+
+from requests import Response
+
+from plextraktsync.trakt.TraktRateLimiter import TraktRateLimiter
+from plextraktsync.util.TokenBucket import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_response(status_code=200, headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+
+    return response
+
+
+def test_token_bucket_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(3, 3, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.0, 1.0, 1.0]
+    assert clock.now == 2.0
+    assert bucket.throttled_time == 2.0
+    assert bucket.throttled_count == 2
+
+
+def test_token_bucket_concurrent_reservations():
+    bucket = TokenBucket(1, 1, clock=lambda: 0.0, sleep=lambda s: None)
+    waits = []
+
+    threads = [Thread(target=lambda: waits.append(bucket.reserve())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every caller got its own slot
+    assert sorted(waits) == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_token_bucket_update_and_block():
+    clock = FakeClock()
+    bucket = TokenBucket(10, 10, clock=clock, sleep=clock.sleep)
+
+    bucket.update(limit=10, period=10, remaining=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 1.0
+
+    bucket.block(5)
+    assert bucket.acquire() == 5.0
+
+
+def test_rate_limiter_separate_budgets():
+    clock = FakeClock()
+    limiter = TraktRateLimiter(get_limit=(10, 10), post_limit=(1, 1), clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire("POST") == 0.0
+    assert limiter.acquire("GET") == 0.0
+    assert limiter.acquire("DELETE") == 1.0
+    assert limiter.acquire("GET") == 0.0
+    assert limiter.stats["GET"]["throttled_count"] == 0
+    assert limiter.stats["POST"]["throttled_count"] == 1
+    assert limiter.throttled_time == 1.0
+
+
+def test_rate_limiter_headers():
+    clock = FakeClock()
+    limiter = TraktRateLimiter(get_limit=(1000, 300), clock=clock, sleep=clock.sleep)
+    header = {"name": "AUTHED_API_GET_LIMIT", "period": 300, "limit": 1000, "remaining": 0, "until": "2000-01-01T00:00:00Z"}
+
+    limiter.update("GET", make_response(headers={"X-Ratelimit": json.dumps(header)}))
+
+    assert limiter.acquire("GET") == 0.3
+
+
+def test_rate_limiter_retry_after():
+    clock = FakeClock()
+    limiter = TraktRateLimiter(clock=clock, sleep=clock.sleep)
+
+    limiter.update("POST", make_response(429, {"Retry-After": "10", "X-Ratelimit": "invalid"}))
+
+    assert limiter.acquire("POST") > 10
+    assert limiter.acquire("GET") == 0.0
+
+
+def test_rate_limiter_scrobble_shares_post_budget():
+    clock = FakeClock()
+    limiter = TraktRateLimiter(post_limit=(1, 1), clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire("POST", "https://api.trakt.tv/sync/collection") == 0.0
+    assert limiter.acquire("POST", "https://api.trakt.tv/scrobble/start") == 1.0
+
+    limiter.update("POST", make_response(429, {"Retry-After": "10"}))
+    assert limiter.acquire("POST", "https://api.trakt.tv/scrobble/stop") > 10
+
+
+def test_rate_limiter_scrobble_served_first():
+    clock = FakeClock()
+    waiting = Event()
+    release = Event()
+
+    def blocking_sleep(seconds):
+        if not release.is_set():
+            waiting.set()
+            release.wait()
+        clock.sleep(seconds)
+
+    limiter = TraktRateLimiter(post_limit=(1, 1), clock=clock, sleep=blocking_sleep)
+    limiter.acquire("POST", "https://api.trakt.tv/sync/history")
+    order = []
+
+    def post(url):
+        limiter.acquire("POST", url)
+        order.append(url)
+
+    # First bulk request waits for the budget, the others queue up behind it
+    threads = [Thread(target=post, args=("https://api.trakt.tv/sync/collection",))]
+    threads[0].start()
+    waiting.wait()
+    for url in ["https://api.trakt.tv/sync/ratings", "https://api.trakt.tv/scrobble/stop"]:
+        threads.append(Thread(target=post, args=(url,)))
+        threads[-1].start()
+        sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert order == [
+        "https://api.trakt.tv/sync/collection",
+        "https://api.trakt.tv/scrobble/stop",
+        "https://api.trakt.tv/sync/ratings",
+    ]
+    assert clock.now == 3.0
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import pytest
+from click import ClickException
+from requests import Response
+from trakt.errors import TraktUnavailable
+
+from plextraktsync.decorators import retry as retry_module
+from plextraktsync.decorators.retry import backoff, retry
+from plextraktsync.util.CircuitBreaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry_module, "sleep", clock.sleep)
+    # Without jitter, waiting for the circuit ends exactly when it reopens
+    monkeypatch.setattr(retry_module, "uniform", lambda a, b: b)
+    monkeypatch.setattr(retry_module, "circuit_breaker", CircuitBreaker(threshold=3, reset_timeout=30, max_trips=2, clock=clock))
+    monkeypatch.setattr(retry_module, "hosts", {})
+
+    return clock
+
+
+def unavailable(retry_after=None):
+    response = Response()
+    response.status_code = 503
+    response.url = "https://api.trakt.tv/sync/history"
+    if retry_after:
+        response.headers["Retry-After"] = str(retry_after)
+
+    return TraktUnavailable(response)
+
+
+def failing(errors):
+    calls = []
+
+    @retry()
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return fn, calls
+
+
+def test_backoff_exponential_with_jitter():
+    for count in range(10):
+        delay = backoff(count)
+        limit = min(retry_module.RETRY_BACKOFF_MAX, retry_module.RETRY_BACKOFF_BASE * 2**count)
+        assert limit / 2 <= delay <= limit
+
+
+def test_retry_after_header(clock):
+    fn, calls = failing([unavailable(retry_after=20)])
+
+    assert fn() == "ok"
+    assert len(calls) == 2
+    assert clock.now >= 20
+
+
+def test_circuit_pauses_and_recovers(clock):
+    fn, calls = failing([unavailable() for _ in range(3)])
+
+    assert fn() == "ok"
+    assert len(calls) == 4
+    # Third failure opened the circuit, fourth call waited for it
+    assert clock.now >= 30
+    assert not retry_module.circuit_breaker.is_down("api.trakt.tv")
+
+
+def test_circuit_fails_fast(clock):
+    fn, calls = failing([unavailable() for _ in range(10)])
+
+    with pytest.raises(ClickException):
+        fn()
+    # Second trip of the circuit aborts without using all retries
+    assert len(calls) == 4
+    assert retry_module.circuit_breaker.is_down("api.trakt.tv")
+
+    # Other functions calling the same host fail fast too
+    other, other_calls = failing([])
+    with pytest.raises(ClickException):
+        other()
+    assert other_calls == []
+
+
+def test_circuit_shared_by_service(clock):
+    errors = [unavailable() for _ in range(3)]
+
+    @retry(retries=2)
+    def fn():
+        raise errors.pop(0)
+
+    with pytest.raises(ClickException):
+        fn()
+    remaining = retry_module.circuit_breaker.remaining("api.trakt.tv")
+    assert remaining > 0
+
+    # Function that didn't fail waits for the circuit of the host too
+    other, other_calls = failing([])
+    started = clock.now
+    assert other() == "ok"
+    assert other_calls == [1]
+    assert clock.now - started == remaining
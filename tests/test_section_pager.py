@@ -0,0 +1,106 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+
+import pytest
+
+from plextraktsync.plex.AsyncPlexApi import AsyncPlexApi
+from plextraktsync.plex.PlexSectionPager import PlexSectionPager
+
+
+class SectionMock:
+    TYPE = "movie"
+    title = "Movies"
+
+    def __init__(self, total: int):
+        self.items = list(range(total))
+        self.requests = []
+
+    def totalViewSize(self, libtype=None, includeCollections=False):
+        return len(self.items)
+
+    def search(self, libtype=None, container_start=0, container_size=0, maxresults=0, filters=None):
+        self.requests.append((container_start, container_size))
+        return self.items[container_start : container_start + container_size]
+
+
+def test_pager():
+    section = SectionMock(250)
+    pager = PlexSectionPager(section, plex=None)
+
+    assert [pm.item for pm in pager] == section.items
+    assert section.requests == [(0, 100), (100, 100), (200, 100)]
+
+
+def test_pager_filtered_size():
+    section = SectionMock(250)
+    section._buildSearchKey = MagicMock(return_value="/library/sections/1/all?type=1")
+    section._server = MagicMock()
+    section._server.query.return_value = ElementTree.fromstring('<MediaContainer size="0" totalSize="42"/>')
+    assert len(PlexSectionPager(section, plex=None, filters={"updatedAt>>": 0})) == 42
+
+    # Without totalSize, the size of the section is used
+    section._server.query.return_value = ElementTree.fromstring('<MediaContainer size="0"/>')
+    assert len(PlexSectionPager(section, plex=None, filters={"updatedAt>>": 0})) == 250
+
+
+def test_pager_read_ahead():
+    section = SectionMock(2500)
+    pager = PlexSectionPager(section, plex=None, read_ahead=2)
+
+    assert [pm.item for pm in pager] == section.items
+    # Fast responses grow the page size
+    sizes = [size for _, size in section.requests]
+    assert sizes[:4] == [100, 200, 400, 800]
+    assert max(sizes) == PlexSectionPager.MAX_PAGE_SIZE
+
+
+def test_pager_read_ahead_error():
+    section = SectionMock(300)
+    pager = PlexSectionPager(section, plex=None, read_ahead=1)
+
+    def fail(**kwargs):
+        raise ValueError("Boom")
+
+    pager.fetch_items = fail
+    with pytest.raises(ValueError, match="Boom"):
+        list(pager)
+
+
+def test_next_page_size():
+    pager = PlexSectionPager(SectionMock(0), plex=None)
+
+    assert pager.next_page_size(100, 0.1) == 200
+    assert pager.next_page_size(100, 2.0) == 100
+    assert pager.next_page_size(100, 10.0) == 50
+    assert pager.next_page_size(50, 10.0) == 50
+
+
+def test_pager_async():
+    section = SectionMock(1050)
+    pager = PlexSectionPager(section, plex=None, aio=AsyncPlexApi(None, workers=4))
+
+    async def collect():
+        return [pm.item async for pm in pager]
+
+    assert asyncio.run(collect()) == section.items
+    assert sorted(section.requests) == [(start, 100) for start in range(0, 1050, 100)]
+
+
+def test_pager_async_error():
+    section = SectionMock(300)
+    pager = PlexSectionPager(section, plex=None, aio=AsyncPlexApi(None, workers=2))
+
+    def fail(**kwargs):
+        raise ValueError("Boom")
+
+    pager.fetch_items = fail
+
+    async def collect():
+        return [pm async for pm in pager]
+
+    with pytest.raises(ValueError, match="Boom"):
+        asyncio.run(collect())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from plextraktsync.pytrakt_extensions import AllShowsProgress
+from plextraktsync.sync.Sync import Sync
+from plextraktsync.sync.SyncDiff import SyncDiff
+from tests.conftest import make
+
+
+class ConfigMock(dict):
+    sync_watched_status = True
+    sync_ratings = True
+    plex_to_trakt = {"watched_status": True, "collection": True, "ratings": True}
+    trakt_to_plex = {"watched_status": True, "ratings": True}
+
+    def __init__(self):
+        super().__init__(rating_priority="plex")
+
+
+class MediaMock:
+    show = None
+    show_reset_at = None
+    watched_before_reset = False
+
+    def __init__(self, trakt_id, watched=False, plex_rating=None, trakt_rating=None, show_id=None, season=None, number=None):
+        self.trakt_id = trakt_id
+        self.watched_on_plex = watched
+        self.plex_rating = plex_rating
+        self.trakt_rating = trakt_rating
+        self.show_trakt_id = show_id
+        self.season_number = season
+        self.episode_number = number
+        self.is_episode = show_id is not None
+        self.is_movie = not self.is_episode
+
+
+class TraktMock:
+    def __init__(self, watched_movies=(), collected_movies=(), watched_shows=None, collected_shows=None):
+        self.watched_movies = set(watched_movies)
+        self.movie_collection_set = set(collected_movies)
+        self.watched_shows = AllShowsProgress(watched_shows)
+        self.collected_shows = AllShowsProgress(collected_shows)
+
+
+def show_progress(trakt_id: int, episodes: list[int]):
+    return {
+        "show": {"ids": {"trakt": trakt_id}},
+        "seasons": [
+            {
+                "number": 1,
+                "episodes": [{"number": number, "completed": True, "last_watched_at": "2024-01-01T00:00:00.000Z"} for number in episodes],
+            }
+        ],
+    }
+
+
+def test_sync_diff_movies():
+    trakt = TraktMock(watched_movies=[1, 2], collected_movies=[1, 3])
+    diff = SyncDiff(ConfigMock(), trakt)
+    watched_plex = MediaMock(1, watched=True)
+    watched_trakt = MediaMock(2, watched=False)
+    watched_both_copies = [MediaMock(3, watched=True), MediaMock(3, watched=True)]
+    rated = MediaMock(4, plex_rating=5, trakt_rating=None)
+    for m in [watched_plex, watched_trakt, *watched_both_copies, rated]:
+        diff.add(m)
+
+    plan = diff.plan()
+
+    assert plan.watched_plex == [watched_trakt]
+    assert plan.watched_trakt == [watched_both_copies[0]]
+    assert sorted(m.trakt_id for m in plan.collection) == [2, 4]
+    assert plan.ratings == [(rated, "trakt")]
+    assert len(plan) == 5
+
+
+def test_sync_diff_episodes():
+    trakt = TraktMock(
+        watched_shows=[show_progress(10, [1, 2])],
+        collected_shows=[show_progress(10, [1, 2, 3])],
+    )
+    diff = SyncDiff(ConfigMock(), trakt)
+    episodes = [MediaMock(100 + number, watched=number in [2, 3], show_id=10, season=1, number=number) for number in [1, 2, 3, 4]]
+    for m in episodes:
+        diff.add(m)
+
+    plan = diff.plan()
+
+    assert plan.watched_plex == [episodes[0]]
+    assert plan.watched_trakt == [episodes[2]]
+    assert plan.collection == [episodes[3]]
+    assert plan.ratings == []
+
+
+def test_plex_ratings_preload_plan_sections():
+    movies = make(type="movie", title="Movies")
+    shows = make(type="show", title="TV Shows")
+    other = make(type="movie", title="Other")
+    sync = Sync(ConfigMock(), plex=make(library_sections={1: movies, 2: shows, 3: other}), trakt=None)
+    sync.walker = make(sections=[movies, shows])
+
+    assert sync.plex_ratings_preload == [(movies, "movies"), (shows, "shows"), (shows, "episodes")]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import asyncio
+from threading import Lock, get_ident
+from time import sleep
+
+import pytest
+
+from plextraktsync.sync.SyncItemWindow import SyncItemWindow
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = Lock()
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def walk(self, item: int):
+        # Two "plugins" processing the same item
+        for plugin in ["first", "second"]:
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            sleep(0.01)
+            with self.lock:
+                self.running -= 1
+                self.calls.append((item, plugin, get_ident()))
+
+
+def run_items(workers: int, items: list[int], window: SyncItemWindow = None):
+    recorder = Recorder()
+    window = window or SyncItemWindow(workers)
+
+    async def run():
+        try:
+            for item in items:
+                await window.submit(lambda item=item: recorder.walk(item))
+            await window.drain()
+        finally:
+            window.close()
+
+    asyncio.run(run())
+
+    return recorder
+
+
+def test_window_sequential():
+    recorder = run_items(1, list(range(5)))
+
+    assert recorder.max_running == 1
+    assert [(item, plugin) for item, plugin, _ in recorder.calls] == [(i, p) for i in range(5) for p in ["first", "second"]]
+
+
+def test_window_concurrent():
+    recorder = run_items(4, list(range(20)))
+
+    assert recorder.max_running > 1
+    assert len(recorder.calls) == 40
+    for item in range(20):
+        calls = [(plugin, thread) for i, plugin, thread in recorder.calls if i == item]
+        # Plugins run in order, in the same thread
+        assert [plugin for plugin, _ in calls] == ["first", "second"]
+        assert len({thread for _, thread in calls}) == 1
+
+
+def test_window_closes_loops():
+    window = SyncItemWindow(4)
+    run_items(4, list(range(8)), window)
+
+    assert window.loops == []
+    assert "executor" not in window.__dict__
+
+
+def test_window_error():
+    window = SyncItemWindow(2)
+
+    async def fail():
+        raise ValueError("Boom")
+
+    async def run():
+        try:
+            for _ in range(5):
+                await window.submit(fail)
+            await window.drain()
+        finally:
+            window.close()
+
+    with pytest.raises(ValueError, match="Boom"):
+        asyncio.run(run())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from threading import Thread
+from time import sleep
+from types import SimpleNamespace
+
+from requests import PreparedRequest, Response
+
+from plextraktsync.util.Tracer import Tracer
+
+
+def test_spans(tmp_path):
+    tracer = Tracer()
+
+    with tracer.span("Walk", items=2):
+        sleep(0.01)
+    thread = Thread(target=lambda: tracer.add("Worker", 0.0, 0.5), name="Worker-1")
+    thread.start()
+    thread.join()
+
+    path = tmp_path / "trace.json"
+    tracer.write(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+
+    spans = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in spans] == ["Walk", "Worker"]
+    assert spans[0]["dur"] >= 10_000
+    assert spans[0]["args"] == {"items": 2}
+    assert spans[0]["tid"] != spans[1]["tid"]
+
+    names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert "Worker-1" in names
+
+
+def test_response_hook():
+    tracer = Tracer()
+
+    request = PreparedRequest()
+    request.prepare(method="POST", url="https://api.trakt.tv/sync/history")
+    response = Response()
+    response.status_code = 201
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(seconds=0.25)
+    tracer.response_hook(response)
+
+    cached = SimpleNamespace(url="https://api.trakt.tv/users/me", status_code=200, from_cache=True, request=None)
+    tracer.response_hook(cached)
+
+    sent, hit = [e for e in tracer.events if e["ph"] == "X"]
+    assert sent["name"] == "POST https://api.trakt.tv/sync/history"
+    assert sent["cat"] == "http"
+    assert sent["dur"] == 250_000
+    assert sent["args"] == {"status": 201, "from_cache": False}
+    assert hit["name"] == "GET https://api.trakt.tv/users/me"
+    assert hit["args"]["from_cache"] is True
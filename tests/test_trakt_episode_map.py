@@ -0,0 +1,76 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, PropertyMock
+
+from trakt.tv import TVEpisode
+
+from plextraktsync.trakt.TraktEpisodeMap import TraktEpisodeMap
+from plextraktsync.trakt.TraktLookup import TraktLookup
+
+
+def make_show(trakt_id: int):
+    tm = MagicMock()
+    tm.title = "Breaking Bad"
+    tm.trakt = trakt_id
+    season = MagicMock()
+    season.season = 1
+    season.episodes = [
+        TVEpisode("Breaking Bad", 1, 1, title="Pilot", ids={"trakt": 73, "tvdb": 349232}),
+        TVEpisode("Breaking Bad", 1, 2, title="Cat's in the Bag...", ids={"trakt": 74, "tvdb": 349233, "imdb": "tt1054724"}),
+    ]
+    seasons = PropertyMock(return_value=[season])
+    type(tm).seasons = seasons
+    tm.seasons_mock = seasons
+    return tm
+
+
+def test_lookup_uses_stored_episodes(tmp_path):
+    path = str(tmp_path / "episodes.sqlite")
+    tm = make_show(1388)
+    lookup = TraktLookup(tm, TraktEpisodeMap(path))
+    assert lookup.from_number(1, 2).trakt == 74
+
+    tm = make_show(1388)
+    lookup = TraktLookup(tm, TraktEpisodeMap(path))
+    te = lookup.from_number(1, 2)
+    assert (te.show, te.season, te.number, te.title) == ("Breaking Bad", 1, 2, "Cat's in the Bag...")
+    assert te.ids == {"ids": {"trakt": 74, "tvdb": 349233, "imdb": "tt1054724"}}
+    assert lookup.from_id("tvdb", "349232").trakt == 73
+    tm.seasons_mock.assert_not_called()
+
+
+def test_refresh_invalidates_updated_shows(tmp_path):
+    episode_map = TraktEpisodeMap(str(tmp_path / "episodes.sqlite"))
+    for trakt_id in [1, 2]:
+        TraktLookup(make_show(trakt_id), episode_map).from_number(1, 1)
+
+    # First refresh has nothing to compare with
+    updated_since = MagicMock(return_value=[2])
+    episode_map.refresh(updated_since)
+    updated_since.assert_not_called()
+    assert episode_map.get(make_show(1)) is None
+
+    for trakt_id in [1, 2]:
+        TraktLookup(make_show(trakt_id), episode_map).from_number(1, 1)
+    episode_map.refresh(updated_since)
+    updated_since.assert_called_once()
+    assert episode_map.get(make_show(1)) is not None
+    assert episode_map.get(make_show(2)) is None
+
+    # Trakt does not provide older updates
+    episode_map.checked_at = datetime.now(timezone.utc) - timedelta(days=31)
+    episode_map.refresh(updated_since)
+    assert episode_map.get(make_show(1)) is None
+
+
+def test_lookup_expires_http_cache(tmp_path):
+    http_cache = MagicMock()
+    episode_map = TraktEpisodeMap(str(tmp_path / "episodes.sqlite"), http_cache)
+    TraktLookup(make_show(1388), episode_map).from_number(1, 1)
+    http_cache.delete.assert_called_once_with(urls=["https://api.trakt.tv/shows/1388/seasons?extended=episodes"])
+
+    # Stored episodes don't need the http cache
+    TraktLookup(make_show(1388), episode_map).from_number(1, 1)
+    http_cache.delete.assert_called_once()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from trakt.movies import Movie
+from trakt.users import ListEntry
+
+from plextraktsync.media.MediaFactory import MediaFactory
+from plextraktsync.trakt.TraktIdIndex import TraktIdIndex
+
+
+def make_guid(provider: str, id: str, type: str):
+    guid = MagicMock()
+    guid.provider = provider
+    guid.id = id
+    guid.type = type
+    guid.is_episode = False
+    guid.syncable = True
+    return guid
+
+
+def test_id_index_items():
+    index = TraktIdIndex()
+    index.add_items(
+        [
+            Movie("The Shawshank Redemption", year=1994, ids={"trakt": 234, "imdb": "tt0111161", "tmdb": 278}),
+            {
+                "rating": 10,
+                "type": "episode",
+                "show": {"title": "Breaking Bad", "year": 2008, "ids": {"trakt": 1388, "tvdb": 81189}},
+                "episode": {"season": 1, "number": 2, "title": "Cat's in the Bag...", "ids": {"trakt": 74, "tvdb": 349233}},
+            },
+            ListEntry(id=1, rank=1, listed_at="", type="movie", data={"title": "Heat", "year": 1995, "ids": {"trakt": 2, "imdb": "tt0113277"}}),
+        ]
+    )
+
+    m = index.find_by_guid(make_guid("tmdb", "278", "movie"))
+    assert (m.media_type, m.title, m.trakt) == ("movies", "The Shawshank Redemption", 234)
+    assert index.find_by_guid(make_guid("imdb", "tt0113277", "movie")).trakt == 2
+    assert index.find_by_guid(make_guid("tvdb", "81189", "show")).trakt == 1388
+    te = index.get("tvdb", "349233", "episode")
+    assert (te.show_id, te.season, te.number, te.trakt) == (1388, 1, 2, 74)
+    assert index.find_by_guid(make_guid("tmdb", "278", "show")) is None
+    assert index.find_by_guid(make_guid("imdb", "tt0000001", "movie")) is None
+
+
+def test_resolve_guid_uses_id_index():
+    trakt = MagicMock()
+    trakt.id_index = TraktIdIndex()
+    trakt.id_index.add_items([Movie("Heat", year=1995, ids={"trakt": 2, "imdb": "tt0113277"})])
+    mf = MediaFactory(MagicMock(), trakt, server_config=MagicMock())
+
+    m = mf.resolve_guid(make_guid("imdb", "tt0113277", "movie"))
+    assert m.trakt.trakt == 2
+    trakt.find_by_guid.assert_not_called()
+
+    mf.resolve_guid(make_guid("imdb", "tt0000001", "movie"))
+    trakt.find_by_guid.assert_called_once()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from threading import Thread
+from time import sleep
+
+from plextraktsync.queue.BackgroundTask import BackgroundTask
+from plextraktsync.queue.ChunkedWorker import ChunkedWorker
+from plextraktsync.queue.Queue import Queue
+from plextraktsync.queue.TraktQueueJournal import TraktQueueJournal
+from plextraktsync.trakt.PartialTraktMedia import PartialTraktMedia
+
+
+class Worker:
+    def __init__(self, fail=False):
+        self.submitted = []
+        self.fail = fail
+
+    def __call__(self, queues):
+        items = queues["add_to_history"]
+        if not len(items):
+            return
+        if self.fail:
+            raise ValueError("Boom")
+        self.submitted.extend(items)
+        queues["add_to_history"].clear()
+
+
+class ChunkWorker(ChunkedWorker):
+    CHUNK_SIZE = 2
+
+    def __init__(self, fail_id: int):
+        self.fail_id = fail_id
+
+    def __call__(self, queues):
+        self.submit_chunks(self.submit, queues["add_to_history"])
+
+    def submit(self, items):
+        if any(m.ids["ids"]["trakt"] == self.fail_id for m in items):
+            raise ValueError("Boom")
+
+
+class SlowJournal(TraktQueueJournal):
+    def append(self, queue, data):
+        seq = super().append(queue, data)
+        if seq == 1:
+            # Let other producers run between journal write and queueing
+            sleep(0.2)
+        return seq
+
+
+def history(trakt_id: int):
+    return PartialTraktMedia(ids={"ids": {"trakt": trakt_id}}, media_type="movies", watched_at=datetime(2024, 1, trakt_id, tzinfo=timezone.utc))
+
+
+def test_journal_roundtrip(tmp_path):
+    journal = TraktQueueJournal(str(tmp_path / "journal.jsonl"))
+    journal.append("add_to_history", history(1))
+    journal.append("add_to_collection", ("movies", {"ids": {"trakt": 2}}))
+    journal.append("scrobble_stop", object())
+    journal.close()
+    with open(journal.path, "a") as fh:
+        fh.write('{"seq": 3, "queue"')
+
+    entries = TraktQueueJournal(journal.path).replay()
+
+    assert entries == [
+        (1, "add_to_history", PartialTraktMedia(ids={"ids": {"trakt": 1}}, media_type="movies", watched_at="2024-01-01T00:00:00.000Z")),
+        (2, "add_to_collection", ("movies", {"ids": {"trakt": 2}})),
+    ]
+
+
+def test_journal_replayed_after_failure(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+
+    # First run: submitting fails, updates stay in journal
+    journal = TraktQueueJournal(path)
+    queue = Queue(BackgroundTask(None, Worker(fail=True), journal=journal), journal=journal)
+    queue.add_to_history(history(1))
+    queue.add_to_history(history(2))
+    queue.close()
+    assert [seq for seq, _, _ in TraktQueueJournal(path).read()] == [2, 2]
+
+    # Second run: leftover updates are submitted, and journal is emptied
+    journal = TraktQueueJournal(path)
+    worker = Worker()
+    queue = Queue(BackgroundTask(None, worker, journal=journal), journal=journal)
+    queue.add_to_history(history(3))
+    queue.close()
+
+    assert [m.ids["ids"]["trakt"] for m in worker.submitted] == [1, 2, 3]
+    assert TraktQueueJournal(path).read() == []
+
+
+def test_journal_keeps_failed_chunk(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = TraktQueueJournal(path)
+    queue = Queue(BackgroundTask(None, ChunkWorker(fail_id=3), journal=journal), journal=journal)
+    for trakt_id in range(1, 6):
+        queue.add_to_history(history(trakt_id))
+    queue.close()
+
+    # Only the chunk with the failed update is kept
+    assert [m.ids["ids"]["trakt"] for _, _, m in TraktQueueJournal(path).read()] == [3, 4]
+
+
+def test_journal_seq_queued_in_order(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = SlowJournal(path)
+    worker = Worker()
+    queue = Queue(BackgroundTask(None, worker, journal=journal), journal=journal)
+    producers = [Thread(target=queue.add_to_history, args=(history(1),))]
+    producers[0].start()
+    sleep(0.05)
+    producers.append(Thread(target=queue.add_to_history, args=(history(2),)))
+    producers[1].start()
+    for producer in producers:
+        producer.join()
+    queue.close()
+
+    assert [m.ids["ids"]["trakt"] for m in worker.submitted] == [1, 2]
+    assert TraktQueueJournal(path).read() == []
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from plextraktsync.queue.TraktRatingsWorker import TraktRatingsWorker
+from plextraktsync.trakt.PartialTraktMedia import PartialTraktMedia
+from plextraktsync.trakt.TraktApi import TraktApi
+
+
+def test_ratings_worker_normalize():
+    items = [
+        PartialTraktMedia(ids={"ids": {"trakt": 1}}, media_type="movies", rating=8, rated_at="2024-01-01T00:00:00.000Z"),
+        PartialTraktMedia(ids={"ids": {"trakt": 2}}, media_type="episodes", rating=5, rated_at="2024-01-02T00:00:00.000Z"),
+        PartialTraktMedia(ids={"ids": {"trakt": 3}}, media_type="movies", rating=10, rated_at="2024-01-03T00:00:00.000Z"),
+    ]
+
+    assert TraktRatingsWorker.normalize(items) == {
+        "movies": [
+            {"ids": {"trakt": 1}, "rating": 8, "rated_at": "2024-01-01T00:00:00.000Z"},
+            {"ids": {"trakt": 3}, "rating": 10, "rated_at": "2024-01-03T00:00:00.000Z"},
+        ],
+        "episodes": [
+            {"ids": {"trakt": 2}, "rating": 5, "rated_at": "2024-01-02T00:00:00.000Z"},
+        ],
+    }
+
+
+def test_ratings_worker_submits_queue():
+    submitted = []
+
+    class Worker(TraktRatingsWorker):
+        def add_to_ratings(self, items: dict):
+            submitted.append(items)
+            return {"added": {"movies": len(items["movies"])}, "not_found": {"movies": []}}
+
+    queues = {"add_to_ratings": [PartialTraktMedia(ids={"ids": {"trakt": 1}}, media_type="movies", rating=8, rated_at="now")]}
+    Worker()(queues)
+
+    assert submitted == [{"movies": [{"ids": {"trakt": 1}, "rating": 8, "rated_at": "now"}]}]
+    assert queues["add_to_ratings"] == []
+
+
+def test_rate_queues_string_date():
+    class Queue:
+        def __init__(self):
+            self.items = []
+
+        def add_to_ratings(self, item):
+            self.items.append(item)
+
+    api = TraktApi.__new__(TraktApi)
+    api.queue = Queue()
+    m = SimpleNamespace(ids={"ids": {"imdb": "tt0111161"}}, media_type="movies")
+
+    api.rate(m, 9, "2024-01-01")
+    api.rate(m, 8, datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    assert [item.rated_at for item in api.queue.items] == ["2024-01-01", "2024-01-02T00:00:00.000Z"]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from trakt.movies import Movie
+from trakt.tv import TVEpisode
+
+from plextraktsync.trakt.TraktApi import TraktApi
+from plextraktsync.trakt.TraktResolveIndex import TraktResolveIndex
+
+
+def make_index(tmp_path, ttl=timedelta(days=30), negative_ttl=timedelta(days=1)):
+    return TraktResolveIndex(str(tmp_path / "index.sqlite"), ttl=ttl, negative_ttl=negative_ttl)
+
+
+def test_resolve_index_persists_items(tmp_path):
+    index = make_index(tmp_path)
+    movie = Movie("The Shawshank Redemption", year=1994, ids={"trakt": 234, "imdb": "tt0111161", "tmdb": 278})
+    episode = TVEpisode("Breaking Bad", show_id=1388, season=1, number=2, title="Cat's in the Bag...", ids={"trakt": 74, "tvdb": 349233})
+    index.set("imdb", "tt0111161", "movie", movie)
+    index.set("tvdb", "349233", "episode", episode)
+    index.set("tmdb", "1", "movie", None)
+    index.close()
+
+    index = make_index(tmp_path)
+    assert index.get("imdb", "tt0111161", "show") == (False, None)
+    assert index.get("tmdb", "1", "movie") == (True, None)
+
+    found, m = index.get("imdb", "tt0111161", "movie")
+    assert found
+    assert m.media_type == "movies"
+    assert (m.title, m.year, m.trakt, m.tmdb) == ("The Shawshank Redemption", 1994, 234, 278)
+
+    found, te = index.get("tvdb", "349233", "episode")
+    assert found
+    assert (te.show, te.show_id, te.season, te.number, te.trakt) == ("Breaking Bad", 1388, 1, 2, 74)
+
+    assert index.stats() == {"matched": 2, "unmatched": 1, "expired": 0}
+    assert (index.hits, index.misses) == (3, 1)
+    assert index.invalidate("imdb", "tt0111161") == 1
+    assert index.get("imdb", "tt0111161", "movie") == (False, None)
+
+
+def test_resolve_index_expires_entries(tmp_path):
+    index = make_index(tmp_path, negative_ttl=timedelta(seconds=-1))
+    index.set("imdb", "tt0111161", "movie", Movie("The Shawshank Redemption", year=1994, ids={"trakt": 234}))
+    index.set("tmdb", "1", "movie", None)
+    index.memo.clear()
+
+    assert index.get("tmdb", "1", "movie") == (False, None)
+    assert index.stats()["expired"] == 1
+    assert index.prune() == 1
+    assert index.get("imdb", "tt0111161", "movie")[0]
+
+
+def test_search_by_id_uses_resolve_index(tmp_path):
+    item = MagicMock()
+    item.media_type = "movies"
+    item.title = "The Shawshank Redemption"
+    item.year = 1994
+    item.ids = {"ids": {"imdb": "tt0111161", "trakt": 234}}
+
+    with patch("plextraktsync.trakt.TraktApi.factory") as mock_factory:
+        mock_factory.session = MagicMock()
+        trakt_api = TraktApi(resolve_index=make_index(tmp_path))
+
+    with patch("trakt.sync.search_by_id", return_value=[item]) as search:
+        assert trakt_api.search_by_id("tt0111161", id_type="imdb", media_type="movie") is item
+        assert trakt_api.search_by_id("tt0111161", id_type="imdb", media_type="movie") is item
+    with patch("trakt.sync.search_by_id", return_value=[]) as search_none:
+        assert trakt_api.search_by_id("tt0000001", id_type="imdb", media_type="movie") is None
+        assert trakt_api.search_by_id("tt0000001", id_type="imdb", media_type="movie") is None
+
+    assert search.call_count == 1
+    assert search_none.call_count == 1
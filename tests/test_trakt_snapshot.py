@@ -0,0 +1,66 @@
+#!/usr/bin/env python3 -m pytest
+from __future__ import annotations
+
+from plextraktsync.decorators.trakt_snapshot import trakt_snapshot
+from plextraktsync.trakt.TraktStateSnapshot import TraktStateSnapshot
+
+last_activities = {
+    "movies": {"watched_at": "2024-01-01T00:00:00.000Z", "rated_at": "2024-01-02T00:00:00.000Z"},
+    "episodes": {"rated_at": "2024-01-03T00:00:00.000Z"},
+}
+
+
+class TraktMock:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.calls = []
+
+    @trakt_snapshot(activities="movies.watched_at")
+    def watched_movies(self):
+        self.calls.append("watched_movies")
+        return {1, 2, 3}
+
+    @trakt_snapshot(activities="{0}.rated_at")
+    def get_ratings(self, media_type: str):
+        self.calls.append(media_type)
+        return [{"rating": 10}]
+
+
+def test_snapshot_reuse(tmp_path):
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), last_activities))
+    assert trakt.watched_movies() == {1, 2, 3}
+    assert trakt.get_ratings("movies") == [{"rating": 10}]
+    assert trakt.calls == ["watched_movies", "movies"]
+
+    # Next run with unchanged activities loads from snapshot
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), last_activities))
+    assert trakt.watched_movies() == {1, 2, 3}
+    assert trakt.get_ratings("movies") == [{"rating": 10}]
+    assert trakt.get_ratings("episodes") == [{"rating": 10}]
+    assert trakt.calls == ["episodes"]
+
+
+def test_snapshot_changed_activity(tmp_path):
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), last_activities))
+    trakt.watched_movies()
+
+    changed = {**last_activities, "movies": {"watched_at": "2024-02-01T00:00:00.000Z"}}
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), changed))
+    trakt.watched_movies()
+    assert trakt.calls == ["watched_movies"]
+
+
+def test_snapshot_missing_activity(tmp_path):
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), {}))
+    trakt.watched_movies()
+    trakt = TraktMock(TraktStateSnapshot(str(tmp_path), {}))
+    trakt.watched_movies()
+    assert trakt.calls == ["watched_movies"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_snapshot_disabled():
+    trakt = TraktMock(None)
+    trakt.watched_movies()
+    trakt.watched_movies()
+    assert trakt.calls == ["watched_movies", "watched_movies"]
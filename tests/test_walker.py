@@ -1,10 +1,20 @@
 #!/usr/bin/env python3 -m pytest
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta
+from threading import Lock
+from time import sleep
+from types import SimpleNamespace
+
+from plextraktsync.plan.SectionWatermarks import SectionWatermarks
 from plextraktsync.plan.WalkConfig import WalkConfig
+from plextraktsync.plan.Walker import Walker
+from plextraktsync.plan.WalkPlan import WalkPlan
 from plextraktsync.plan.WalkPlanner import WalkPlanner
 from plextraktsync.plex.PlexApi import PlexApi
 from plextraktsync.plex.PlexLibrarySection import PlexLibrarySection
+from tests.conftest import make
 
 
 class PlexLibrarySectionMock(PlexLibrarySection):
@@ -71,3 +81,154 @@ def test_walker():
     assert len(plan.show_sections) == 0
     assert len(plan.movies) == 1
     assert len(plan.shows) == 1
+
+
+class MediaFactoryMock:
+    def resolve_any(self, pm, show=None):
+        # Make later items finish first
+        sleep(0.01 * (10 - pm))
+        return None if pm % 3 == 0 else f"media-{pm}"
+
+
+def test_walker_resolve_items_ordered():
+    async def items():
+        for i in range(10):
+            yield i
+
+    async def resolve(walker: Walker):
+        return [x async for x in walker.resolve_items(items())]
+
+    wc = WalkConfig()
+    expected = [(i, None if i % 3 == 0 else f"media-{i}") for i in range(10)]
+    for workers in (1, 4):
+        walker = Walker(plex=None, trakt=None, mf=MediaFactoryMock(), config=wc, resolve_workers=workers)
+        assert asyncio.run(resolve(walker)) == expected
+
+
+def test_walker_incremental(tmp_path):
+    section = make(key=1, title="Movies", title_link="Movies")
+    plex = make(server=make(machineIdentifier="abc"))
+    path = str(tmp_path / "watermarks.json")
+
+    def walker(**kwargs):
+        wc = WalkConfig().update(**kwargs)
+        w = Walker(plex=plex, trakt=None, mf=None, config=wc, watermarks=SectionWatermarks(path))
+        w.plan = WalkPlan([section], [], [], [], [])
+        return w
+
+    # No previous walk
+    w = walker(incremental=True)
+    assert not w.is_incremental
+    assert not w.is_partial
+    assert w.changed_since(section) is None
+    w.update_watermarks()
+
+    w = walker(incremental=True, full_walk_interval=timedelta(days=1))
+    assert w.is_incremental
+    assert w.is_partial
+    assert w.changed_since(section) < w.started_at
+    w.update_watermarks()
+
+    # Full walk is due
+    w = walker(incremental=True, full_walk_interval=timedelta(days=1))
+    w.started_at = datetime.now() + timedelta(days=2)
+    assert not w.is_incremental
+
+    # Incremental mode not requested
+    w = walker()
+    assert not w.is_incremental
+
+
+class SeasonsMock:
+    def __init__(self):
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+
+
+class EpisodeFactoryMock:
+    lazy_episodes = False
+
+    def __init__(self):
+        self.lock = Lock()
+        self.events = []
+        self.shows = 0
+
+    def resolve_any(self, ep, show=None):
+        with self.lock:
+            self.events.append(("start", ep.key, show))
+        sleep(0.02 if ep.key == 1 else 0.01)
+        with self.lock:
+            self.events.append(("end", ep.key, show))
+        if show is None:
+            # Show of unmatched show is resolved from the episode
+            with self.lock:
+                self.shows += 1
+            show = SimpleNamespace(seasons=SeasonsMock())
+
+        return SimpleNamespace(show=show)
+
+
+def test_walker_episode_resolver():
+    mf = EpisodeFactoryMock()
+    walker = Walker(plex=None, trakt=None, mf=mf, config=WalkConfig(), resolve_workers=4)
+    plex_shows = {10: "show-10"}
+    show_cache = {}
+    resolve = walker.episode_resolver(plex_shows, show_cache)
+    episodes = [SimpleNamespace(key=i, show_id=10) for i in range(1, 7)]
+
+    async def run():
+        return [m async for _, m in walker.resolve_items(episodes, resolve)]
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        walker.close()
+
+    # First episode completed before the others started, and resolved the show once
+    assert mf.events[:2] == [("start", 1, None), ("end", 1, None)]
+    assert mf.shows == 1
+    show = show_cache[10]
+    assert show.seasons.loads == 1
+    assert all(show is m.show for m in results)
+    assert all(ep.show == "show-10" for ep in episodes)
+    assert "executor" not in walker.__dict__
+
+
+class PagerMock(list):
+    aio = None
+
+
+def test_walker_progress_counts_resolved_items():
+    seen = []
+
+    class ProgressBarMock:
+        def __init__(self, iterable, total=None, desc=""):
+            self.iterable = iterable
+            self.total = total
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        async def __aiter__(self):
+            async for m in self.iterable:
+                seen.append((self.total, m))
+                yield m
+
+    walker = Walker(plex=None, trakt=None, mf=MediaFactoryMock(), config=WalkConfig(), progressbar=ProgressBarMock, resolve_workers=2)
+    pager = PagerMock([1, 2, 4])
+
+    async def run():
+        return [x async for x in walker.section_items(pager, "Movies", resolve=walker.resolve_items)]
+
+    try:
+        assert asyncio.run(run()) == [(1, "media-1"), (2, "media-2"), (4, "media-4")]
+    finally:
+        walker.close()
+
+    # Progress advances with resolved items
+    assert seen == [(3, (1, "media-1")), (3, (2, "media-2")), (3, (4, "media-4"))]